@@ -0,0 +1,219 @@
+"""
+Micro-benchmarks of the data layer at scale.
+
+The projects database is filled with 10^2 to 10^5 projects, then the project queries and
+the full low frequency update of the main window are timed. Gardens are loaded and saved
+for several map sizes. The results are written as json (stable: sorted keys, fixed units)
+and compared against a stored baseline, a benchmark slower than its baseline by more than
+the tolerance is reported as regression (exit code 1).
+
+Examples:
+    python -m benchmarks.data_layer
+    python -m benchmarks.data_layer --sizes 100 1000 --output results.json
+    python -m benchmarks.data_layer --save-baseline
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")  # the main window is never shown
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from PyQt6.QtWidgets import QApplication
+from src.database import connect, migrate
+from src.garden import Garden
+from src.profiles import Profile
+from src.projectmanagement import ProjectManagement
+from src.projectrepository import ProjectRepository
+from src.session import MainSession
+
+FORMAT_VERSION = 1
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+PROJECT_COUNTS = (100, 1000, 10000, 100000)
+MAP_SIZES = ((14, 25), (50, 100), (200, 400))  # (rows, cols), the first is the size of the game window
+MAP_DENSITY = 0.3  # share of the cells with an object
+DEFAULT_REPEAT = 10
+DEFAULT_TOLERANCE = 0.5  # 50% slower than the baseline is a regression
+MIN_DIFFERENCE_US = 250  # smaller slowdowns are timer noise, not regressions
+
+
+class MapObject:
+    """Garden object without image, loading and saving a garden never draws."""
+    def __init__(self, name):
+        self.name = name
+        self.cost = 1
+        self.image = None
+
+
+def measure(function, repeat=DEFAULT_REPEAT):
+    """Call `function` `repeat` times, return the median and the fastest run in microseconds."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return {"median_us": round(statistics.median(durations) * 1e6, 1), "min_us": round(min(durations) * 1e6, 1)}
+
+
+def fill_projects(connection: sqlite3.Connection, count: int):
+    """Insert `count` projects with one time entry each, in a single transaction."""
+    connection.executemany('''
+        INSERT INTO projects (name, description, type, time_tracked, start_date, end_date, status)
+        VALUES (?, '', 'study', 10, '2024-01-01', '2024-01-01', 'active')
+    ''', ((f"Project {i:06d}",) for i in range(count)))
+    connection.executemany('''
+        INSERT INTO time_entries (project_id, minutes, recorded_at) VALUES (?, 10, '2024-01-01 10:00:00')
+    ''', ((i,) for i in range(1, count + 1)))
+    connection.commit()
+
+
+def benchmark_projects(count: int, directory: str, repeat=DEFAULT_REPEAT):
+    """Return the timings of the project queries and the session update on a database with `count` projects."""
+    profile = Profile(f"benchmark-{count}", os.path.join(directory, str(count)))
+    os.makedirs(profile.map_folder)
+    connection = connect(profile.db_file)
+    migrate(connection)
+    fill_projects(connection, count)
+    results = {}
+    results["project_management_init"] = measure(lambda: ProjectManagement(connection), repeat)
+    project = ProjectManagement(connection, ProjectRepository(connection))
+    project.id = ProjectManagement.get_id_by_name(f"Project {count // 2:06d}", connection)
+    project.load_data_from_sql()
+
+    def update():
+        project.description = "odd" if project.description != "odd" else "even"
+        project.add_time(1)
+        project.update_data_in_sql()
+
+    results["update_data_in_sql"] = measure(update, repeat)
+    results["load_data_from_sql"] = measure(project.load_data_from_sql, repeat)
+    results["get_projects_name_list"] = measure(lambda: ProjectManagement.get_projects_name_list(connection), repeat)
+    results["get_id_by_name"] = measure(
+        lambda: ProjectManagement.get_id_by_name(f"Project {count - 1:06d}", connection), repeat)
+    session = MainSession(connection, profile=profile)
+    results["update_low_frequency"] = measure(session.update_low_frequency, repeat)
+    session.ipc_server.close()
+    session.json_store.flush()
+    results["add_project"] = measure(project.add_project, repeat)  # last, it changes the database
+    connection.close()
+    return results
+
+
+def benchmark_garden(rows: int, cols: int, directory: str, repeat=DEFAULT_REPEAT):
+    """Return the timings of loading and saving a garden map of `rows` x `cols` cells."""
+    rng = random.Random(rows * cols)  # the same map in every run
+    map_file = os.path.join(directory, f"garden_{rows}x{cols}.map")
+    with open(map_file, "w") as file:
+        for _ in range(rows):
+            file.write("".join(str(rng.randint(1, 9)) if rng.random() < MAP_DENSITY else "0"
+                               for _ in range(cols)) + "\n")
+    garden_objects = [MapObject(str(i)) for i in range(10)]
+    garden = Garden(map_file, garden_objects)
+    return {
+        "garden_load": measure(lambda: Garden(map_file, garden_objects), repeat),
+        "garden_save": measure(garden.save_garden_map, repeat),
+    }
+
+
+def run(project_counts=PROJECT_COUNTS, map_sizes=MAP_SIZES, repeat=DEFAULT_REPEAT):
+    """Run all benchmarks, return the results as {"<benchmark>[<size>]": timings}."""
+    app = QApplication.instance() or QApplication([])  # the session needs it
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for count in project_counts:
+            for name, timings in benchmark_projects(count, directory, repeat).items():
+                results[f"{name}[{count}]"] = timings
+            print(f"{count} projects done")  # Debug message
+        for rows, cols in map_sizes:
+            for name, timings in benchmark_garden(rows, cols, directory, repeat).items():
+                results[f"{name}[{rows}x{cols}]"] = timings
+    return results
+
+
+def make_report(results: dict, repeat=DEFAULT_REPEAT):
+    """Return the results together with the environment they were measured in."""
+    return {
+        "format_version": FORMAT_VERSION,
+        "environment": {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+        },
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def write_report(report: dict, path: str):
+    """Write a report as json, with sorted keys so that reports can be diffed."""
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def load_report(path: str):
+    """Read a report, raise ValueError if it has another format version."""
+    with open(path, "r", encoding="utf-8") as file:
+        report = json.load(file)
+    if report.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"{path} has format version {report.get('format_version')}, expected {FORMAT_VERSION}")
+    return report
+
+
+def compare(results: dict, baseline: dict, tolerance=DEFAULT_TOLERANCE):
+    """
+    Return the regressions: (benchmark, baseline time, time, ratio) of every benchmark whose
+    fastest run is more than `tolerance` (and MIN_DIFFERENCE_US) slower than in the baseline,
+    the worst first. The fastest run is compared because it is the least disturbed by the
+    rest of the system. Benchmarks that are missing in one of both are ignored.
+    """
+    regressions = []
+    for name, timings in results.items():
+        if name not in baseline:
+            continue
+        baseline_time = baseline[name]["min_us"]
+        ratio = timings["min_us"] / baseline_time if baseline_time > 0 else 1.0
+        if ratio > 1 + tolerance and timings["min_us"] - baseline_time > MIN_DIFFERENCE_US:
+            regressions.append((name, baseline_time, timings["min_us"], round(ratio, 2)))
+    return sorted(regressions, key=lambda regression: regression[3], reverse=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks of the ProductivityGarden data layer.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(PROJECT_COUNTS),
+                        help="numbers of projects in the database")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="runs per benchmark")
+    parser.add_argument("--output", help="write the results to this json file")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown against the baseline (0.5 = 50%%)")
+    args = parser.parse_args(argv)
+
+    report = make_report(run(args.sizes, repeat=args.repeat), args.repeat)
+    for name, timings in sorted(report["results"].items()):
+        print(f"{name:45} {timings['median_us']:>12.1f} us")
+    if args.output:
+        write_report(report, args.output)
+    if args.save_baseline:
+        write_report(report, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline {args.baseline}, run with --save-baseline first")
+        return 0
+    regressions = compare(report["results"], load_report(args.baseline)["results"], args.tolerance)
+    for name, baseline_time, time_us, ratio in regressions:
+        print(f"REGRESSION {name}: {baseline_time:.1f} us -> {time_us:.1f} us ({ratio}x)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""
+Command line tools for the ProductivityGarden database.
+
+Examples:
+    python cli.py export projects projects.csv
+    python cli.py --profile work export projects work.csv
+    python cli.py export time-entries history.jsonl
+    python cli.py import projects projects.csv --on-conflict update
+    python cli.py import time-entries history.jsonl
+    python cli.py report projects --from 2024-01-01 --to 2024-12-31
+    python cli.py report streaks --project Physics --format csv --output streaks.csv
+    python cli.py archive --status completed
+    python cli.py restore 42
+    python cli.py generate --profile loadtest --seed 42 --projects 5000 --years 5
+"""
+import argparse
+import datetime
+import sqlite3
+import sys
+from src.constants import DEFAULT_PROFILE
+from src.database import connect, migrate
+from src import dataexchange, reporting, workload
+from src.profiles import get_profile, list_profiles, create_profile, get_active_profile
+from src.projectmanagement import ProjectManagement
+
+
+def command_export(args):
+    export = {
+        "projects": dataexchange.export_projects,
+        "time-entries": dataexchange.export_time_entries,
+    }[args.table]
+    file_format = args.format or dataexchange.get_file_format(args.file)
+    with open(args.file, "w", newline="", encoding="utf-8") as file:
+        count = export(args.connection, file, file_format)
+    print(f"Exported {count} rows to {args.file}")
+
+
+def command_import(args):
+    file_format = args.format or dataexchange.get_file_format(args.file)
+    with open(args.file, newline="", encoding="utf-8") as file:
+        if args.table == "projects":
+            count = dataexchange.import_projects(args.connection, file, file_format, args.on_conflict)
+        else:
+            count = dataexchange.import_time_entries(args.connection, file, file_format, args.on_conflict)
+    print(f"Imported {count} rows from {args.file}")
+
+
+def command_report(args):
+    project_id = None
+    if args.project is not None:
+        project_id = ProjectManagement.get_id_by_name(args.project, args.connection)
+        if project_id is None:
+            raise ValueError(f"Unknown project '{args.project}'")
+    if args.report in ("projects", "types") and project_id is not None:
+        raise ValueError(f"The {args.report} report covers all projects, --project is not supported")
+    if args.report == "summary":
+        rows = [reporting.get_summary(args.connection, args.start_date, args.end_date, project_id)]
+    elif args.report == "projects":
+        rows = reporting.get_project_report(args.connection, args.start_date, args.end_date, args.limit)
+    elif args.report == "types":
+        rows = reporting.get_type_report(args.connection, args.start_date, args.end_date)
+    elif args.report == "weekdays":
+        rows = reporting.get_weekday_distribution(args.connection, args.start_date, args.end_date, project_id)
+    else:
+        rows = reporting.get_streaks(args.connection, args.start_date, args.end_date, project_id, args.limit)
+    columns = reporting.REPORT_COLUMNS[args.report]
+    if args.output is None:
+        reporting.write_report(columns, rows, sys.stdout, args.format)
+    else:
+        with open(args.output, "w", newline="", encoding="utf-8") as file:
+            reporting.write_report(columns, rows, file, args.format)
+
+
+def command_archive(args):
+    if args.list:
+        columns = ("id", "name", "type", "time_tracked", "first_day", "last_day", "active_days", "archived_at")
+        reporting.write_report(columns, ProjectManagement.get_archived_projects(args.connection), sys.stdout)
+        return
+    count = ProjectManagement.archive_projects(args.connection, args.status or ProjectManagement.ARCHIVE_STATUSES)
+    print(f"Archived {count} projects")
+
+
+def command_restore(args):
+    if not ProjectManagement.restore_project(args.project_id, args.connection):
+        raise ValueError(f"No archived project with ID {args.project_id}")
+    print(f"Restored project {args.project_id}")
+
+
+def command_generate(args):
+    if args.profile == DEFAULT_PROFILE:
+        raise ValueError("Synthetic data is not written to the default profile, choose another --profile")
+    profile = get_profile(args.profile)
+    if args.profile not in list_profiles():
+        create_profile(args.profile)
+    end_date = datetime.date.fromisoformat(args.end_date) if args.end_date else None
+    counts = workload.generate(profile, args.seed, args.projects, args.years, args.gardens, args.points_events,
+                               end_date)
+    print(f"Generated {', '.join(f'{count} {name}' for name, count in counts.items())} in profile {profile.name}")
+
+
+def get_database_file(args):
+    """Return the database to work on: --db, else the database of --profile, else of the active profile."""
+    if args.db is not None:
+        return args.db
+    if args.data_profile is not None:
+        if args.data_profile not in list_profiles():
+            raise ValueError(f"Unknown profile '{args.data_profile}'")
+        return get_profile(args.data_profile).db_file
+    return get_active_profile().db_file
+
+
+def iso_date(text: str):
+    """argparse type of dates, they are passed on to SQLite as ISO strings."""
+    try:
+        return datetime.date.fromisoformat(text).isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{text}' is no date, use YYYY-MM-DD")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="ProductivityGarden command line tools")
+    parser.add_argument("--db", help="database file (default: the database of the profile)")
+    parser.add_argument("--profile", dest="data_profile",
+                        help="profile whose database is used (default: the profile active in the app)")
+    parser.set_defaults(uses_database=True)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="export projects or time entries (csv, jsonl)")
+    export_parser.add_argument("table", choices=["projects", "time-entries"])
+    export_parser.add_argument("file", help="target file, the format is taken from the extension")
+    export_parser.add_argument("--format", choices=dataexchange.FILE_FORMATS)
+    export_parser.set_defaults(handler=command_export)
+
+    import_parser = subparsers.add_parser("import", help="import projects or time entries (csv, jsonl)")
+    import_parser.add_argument("table", choices=["projects", "time-entries"])
+    import_parser.add_argument("file", help="source file, the format is taken from the extension")
+    import_parser.add_argument("--format", choices=dataexchange.FILE_FORMATS)
+    import_parser.add_argument("--on-conflict", choices=dataexchange.CONFLICT_MODES, default="skip",
+                               help="projects whose name exists already: skip, update (all but time_tracked) or fail, "
+                                    "duplicate time entries: skip or fail (default: skip)")
+    import_parser.set_defaults(handler=command_import)
+
+    report_parser = subparsers.add_parser("report", help="statistics of the tracked time (text, csv)")
+    report_parser.add_argument("report", choices=list(reporting.REPORT_COLUMNS))
+    report_parser.add_argument("--from", dest="start_date", type=iso_date, help="first day (YYYY-MM-DD)")
+    report_parser.add_argument("--to", dest="end_date", type=iso_date, help="last day (YYYY-MM-DD)")
+    report_parser.add_argument("--project", help="only this project (summary, weekdays, streaks)")
+    report_parser.add_argument("--limit", type=int, help="maximum number of rows (projects, streaks)")
+    report_parser.add_argument("--format", choices=reporting.OUTPUT_FORMATS, default="text")
+    report_parser.add_argument("--output", help="target file (default: standard output)")
+    report_parser.set_defaults(handler=command_report)
+
+    archive_parser = subparsers.add_parser("archive", help="move finished projects to the archive table")
+    archive_parser.add_argument("--status", action="append",
+                                help="archive projects with this status, can be repeated "
+                                     f"(default: {', '.join(ProjectManagement.ARCHIVE_STATUSES)})")
+    archive_parser.add_argument("--list", action="store_true", help="only list the archived projects")
+    archive_parser.set_defaults(handler=command_archive)
+
+    restore_parser = subparsers.add_parser("restore", help="move an archived project back to the projects")
+    restore_parser.add_argument("project_id", type=int)
+    restore_parser.set_defaults(handler=command_restore)
+
+    generate_parser = subparsers.add_parser("generate", help="fill a profile with synthetic data for load tests")
+    generate_parser.add_argument("--profile", default="loadtest", help="target profile, created if needed")
+    generate_parser.add_argument("--seed", type=int, default=0, help="the same seed generates the same data")
+    generate_parser.add_argument("--projects", type=int, default=1000)
+    generate_parser.add_argument("--years", type=int, default=3, help="years of tracked time")
+    generate_parser.add_argument("--gardens", type=int, default=100, help="gardens per vegetation")
+    generate_parser.add_argument("--points-events", type=int, default=100000)
+    generate_parser.add_argument("--end", dest="end_date", type=iso_date, help="last day (default: today)")
+    generate_parser.set_defaults(handler=command_generate, uses_database=False)  # writes its own profile only
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.connection = None
+    try:
+        if args.uses_database:
+            args.connection = connect(get_database_file(args))
+            migrate(args.connection)
+        args.handler(args)
+    except (OSError, ValueError, KeyError, sqlite3.Error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if args.connection is not None:
+            args.connection.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,10 @@
 import sys
-import sqlite3
 from PyQt6.QtWidgets import QApplication
 from src.session import MainSession
-from src.constants import DB_FILE
+from src.database import connect
+from src.dbwriter import DatabaseWriter
+from src.profiles import get_active_profile
+from src.profiling import get_profiler, profiled_section
 
 
 if __name__ == "__main__":
@@ -10,15 +12,30 @@ if __name__ == "__main__":
     # This is the main application object required for any PyQt application.
     app = QApplication(sys.argv)
     
+    # opt-in profiling of the startup and the timer callbacks (--profiling or PRODUCTIVITYGARDEN_PROFILING=1),
+    # None if disabled
+    profiler = get_profiler("session")
+    if profiler is not None:
+        profiler.start()
+    
     # Create an instance of MainSession
     # This object represents the primary functionality of the application.
     # It includes features like time management, a points system, and project management.
-    db_conn = sqlite3.connect(DB_FILE)
-    session = MainSession(db_conn)
+    # every profile (user) has its own database, settings and gardens
+    with profiled_section(profiler):
+        profile = get_active_profile()
+        db_conn = connect(profile.db_file)  # WAL mode, tuned pragmas, statement cache
+        # updates are written on a background thread, so a slow disk doesn't freeze the GUI
+        db_writer = DatabaseWriter(profile.db_file)
+        session = MainSession(db_conn, writer=db_writer, profile=profile, profiler=profiler)
     #  Display the main window (application's GUI)
     session.show()
     
     # Start the application event loop
     # This keeps the application running and responsive to user input until the window is closed.
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    session.writer.close()  # write everything that is still queued (the writer changes with the profile)
+    if profiler is not None:
+        profiler.stop()  # last snapshot
+    sys.exit(exit_code)
     
\ No newline at end of file
@@ -0,0 +1,138 @@
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtWidgets import QLineEdit, QDateEdit
+
+
+class FieldBinding:
+    """
+    Connection of one form widget to one field of a model object.
+
+    Parameters:
+        widget (QWidget): The input widget.
+        field (str): Name of the model attribute.
+        get_value (callable): Returns the value of the widget.
+        set_value (callable): Shows a value in the widget.
+        validator (callable, optional): Returns True if a value may be written to the model. Defaults to None.
+    """
+    def __init__(self, widget, field: str, get_value, set_value, validator=None):
+        self.widget = widget
+        self.field = field
+        self.get_value = get_value
+        self.set_value = set_value
+        self.validator = validator
+        self.valid = True
+
+
+class FormBinding(QObject):
+    """
+    Two-way binding between form widgets and the fields of a model object.
+
+    The change signal of a widget writes its value to the model field (the model
+    marks the field as changed, e.g. ProjectManagement.__setattr__), nothing is polled.
+    Fields with a validator are validated once the input paused for `validation_delay_ms`,
+    only valid values reach the model. load() shows the model in the widgets.
+
+    Signals:
+        field_changed (str): A model field got a new value from its widget.
+        validity_changed (str, bool): A field became valid or invalid.
+
+    Parameters:
+        model (object): Object whose attributes are bound.
+        validation_delay_ms (int, optional): Pause in typing before validating. Defaults to 150.
+        parent (QObject, optional): The parent object. Defaults to None.
+
+    Example:
+        form = FormBinding(project, parent=self)
+        form.bind_line_edit(name_input, "name", validator=is_valid_name)
+        form.bind_date_edit(start_date_edit, "start_date")
+        form.validity_changed.connect(handle_validity_changed)
+        form.load()  # after another project was loaded into the model
+    """
+    field_changed = pyqtSignal(str)
+    validity_changed = pyqtSignal(str, bool)
+
+    def __init__(self, model, validation_delay_ms=150, parent=None):
+        super().__init__(parent)
+        self.model = model
+        self._bindings = {}  # field -> FieldBinding
+        self._unvalidated = set()  # fields edited since the last validation
+        self._loading = False
+        self._validation_timer = QTimer(self)
+        self._validation_timer.setSingleShot(True)
+        self._validation_timer.setInterval(validation_delay_ms)
+        self._validation_timer.timeout.connect(self.validate)
+
+    def bind(self, widget, field: str, signal, get_value, set_value, validator=None):
+        """Bind a widget with a change signal to a model field and show the field's value."""
+        binding = FieldBinding(widget, field, get_value, set_value, validator)
+        self._bindings[field] = binding
+        self._show(binding)
+        signal.connect(lambda *_: self._widget_changed(binding))
+        return binding
+
+    def bind_line_edit(self, widget: QLineEdit, field: str, validator=None):
+        """Bind the text of a QLineEdit."""
+        return self.bind(widget, field, widget.textChanged, widget.text, widget.setText, validator)
+
+    def bind_date_edit(self, widget: QDateEdit, field: str, validator=None):
+        """Bind the date (QDate) of a QDateEdit."""
+        return self.bind(widget, field, widget.dateChanged, widget.date, widget.setDate, validator)
+
+    def set_model(self, model):
+        """Bind the widgets to another model object and show its values."""
+        self.model = model
+        self.load()
+
+    def load(self):
+        """Show the model's values in all widgets, e.g. after another record was loaded."""
+        self._validation_timer.stop()
+        self._unvalidated.clear()
+        for binding in self._bindings.values():
+            self._show(binding)
+            self._set_valid(binding, True)  # stored values are valid
+
+    def is_valid(self, field: str):
+        """Return True if the last input of a field was valid."""
+        return self._bindings[field].valid
+
+    def has_pending(self):
+        """Return True if edited fields wait for their validation."""
+        return bool(self._unvalidated)
+
+    def validate(self):
+        """Validate the edited fields now and write the valid values to the model."""
+        self._validation_timer.stop()
+        fields, self._unvalidated = self._unvalidated, set()
+        for field in fields:
+            binding = self._bindings[field]
+            value = binding.get_value()
+            valid = binding.validator(value)
+            if valid:
+                self._write(binding, value)
+            self._set_valid(binding, valid)
+
+    def _show(self, binding: FieldBinding):
+        self._loading = True
+        try:
+            if binding.get_value() != getattr(self.model, binding.field):
+                binding.set_value(getattr(self.model, binding.field))
+        finally:
+            self._loading = False
+
+    def _widget_changed(self, binding: FieldBinding):
+        if self._loading:
+            return
+        if binding.validator is None:
+            self._write(binding, binding.get_value())
+        else:
+            self._unvalidated.add(binding.field)
+            self._validation_timer.start()
+
+    def _write(self, binding: FieldBinding, value):
+        if getattr(self.model, binding.field) != value:
+            setattr(self.model, binding.field, value)
+            self.field_changed.emit(binding.field)
+
+    def _set_valid(self, binding: FieldBinding, valid: bool):
+        if binding.valid != valid:
+            binding.valid = valid
+            self.validity_changed.emit(binding.field, valid)
@@ -13,6 +13,29 @@ GAME_WIDTH, GAME_HEIGHT = 1250, 700  # 1875, 1050
 SQUARE_SIZE = 50  # 75
 ROWS, COLS = HEIGHT // SQUARE_SIZE, WIDTH // SQUARE_SIZE  # 25, 14
 
+# number of projects shown in the pie chart, the remaining ones are combined to "Other"
+PIE_CHART_TOP_N = 8
+
+# project notes: saved after the user stopped typing for this long, saves within a few minutes
+# update the same revision, older revisions are dropped
+NOTE_AUTOSAVE_DELAY_MS = 1500
+NOTE_REVISION_MINUTES = 5
+NOTE_REVISIONS_KEPT = 20
+
+# name of the local channel between the main window and the garden (one per profile, see ipc.py)
+IPC_SERVER_NAME = "ProductivityGarden"
+
+# a snapshot of the points balance is stored after this many point events
+POINTS_SNAPSHOT_INTERVAL = 100
+
+# opt-in profiling (see profiling.py): environment variables, the same as the flags
+# --profiling, --profiling-interval and --profiling-dir of main.py and virtualgardens.py
+PROFILING_ENV = "PRODUCTIVITYGARDEN_PROFILING"  # "1" enables profiling
+PROFILING_INTERVAL_ENV = "PRODUCTIVITYGARDEN_PROFILING_INTERVAL"  # seconds between snapshots
+PROFILING_DIR_ENV = "PRODUCTIVITYGARDEN_PROFILING_DIR"  # folder of the snapshots
+PROFILING_INTERVAL = 60
+PROFILING_TRACEMALLOC_FRAMES = 10  # frames stored per allocation
+
 # colors
 COLOR_BEIGE_HEX = '#f7ede3'
 COLOR_BEIGE_RGB = (247, 237, 227)
@@ -35,6 +58,9 @@ RESOURCES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__
 ASSETS_PATH = os.path.join(RESOURCES_PATH, "assets\\")
 JSON_FILE = os.path.join(RESOURCES_PATH, "data.json")
 DB_FILE = os.path.join(RESOURCES_PATH, "projects.db")
+TIMER_CHECKPOINT_FILE = os.path.join(RESOURCES_PATH, "timer_checkpoint.json")
 MAP_FOLDER_PATH = os.path.join(RESOURCES_PATH, "gardens\\")
 MAPDATA_FILE_PATH = os.path.join(MAP_FOLDER_PATH, "gardens_data.json")
+# the files above belong to the default profile, other profiles have their own (see profiles.py)
+DEFAULT_PROFILE = "default"
 IMGDIR_GUI_FLOWER_MEADOW = str(os.path.join(ASSETS_PATH, "Gemini_flower_meadow.jpg"))
\ No newline at end of file
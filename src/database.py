@@ -0,0 +1,346 @@
+import pathlib
+import sqlite3
+from src.constants import DB_FILE
+
+# Seconds a connection waits for a lock held by another connection before "database is locked"
+BUSY_TIMEOUT = 5.0
+# Number of prepared statements kept per connection (sqlite3 reuses them by SQL text)
+STATEMENT_CACHE_SIZE = 256
+# Page cache per connection in KiB (negative values are KiB for PRAGMA cache_size)
+CACHE_SIZE_KIB = 8192
+
+
+def _migration_1_projects_table(cursor: sqlite3.Cursor):
+    """
+    Create the projects table with auto-assigned IDs and a unique, indexed name.
+    Databases of older versions (random IDs, no indexes) are rebuilt in place.
+    Existing IDs are kept, duplicate or empty names get a unique suffix.
+    """
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'projects'")
+    legacy_table = cursor.fetchone() is not None
+    if legacy_table:
+        cursor.execute("ALTER TABLE projects RENAME TO projects_legacy")
+    cursor.execute('''
+        CREATE TABLE projects (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL DEFAULT '',
+            description TEXT NOT NULL DEFAULT '',
+            type TEXT NOT NULL DEFAULT '',
+            time_tracked INTEGER NOT NULL DEFAULT 0,
+            start_date TEXT,
+            end_date TEXT,
+            status TEXT NOT NULL DEFAULT 'active'
+        )
+    ''')
+    cursor.execute("CREATE UNIQUE INDEX idx_projects_name ON projects (name)")
+    if legacy_table:
+        cursor.execute('''
+            SELECT id, name, description, type, time_tracked, start_date, end_date, status
+            FROM projects_legacy ORDER BY id
+        ''')
+        used_names = set()
+        rows = []
+        for project_id, name, description, project_type, time_tracked, start_date, end_date, status in cursor:
+            if not (name or "").strip():
+                name = "Project"
+            while name in used_names:
+                name = f"{name} ({project_id})"
+            used_names.add(name)
+            rows.append((project_id, name, description or "", project_type or "", time_tracked or 0,
+                         start_date, end_date, status or "active"))
+        cursor.executemany('''
+            INSERT INTO projects (id, name, description, type, time_tracked, start_date, end_date, status)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+        cursor.execute("DROP TABLE projects_legacy")
+
+
+def _migration_2_time_entries(cursor: sqlite3.Cursor):
+    """
+    Store tracked time as timestamped entries and keep per day and per week sums
+    of every project in rollup tables. The rollups are updated by a trigger on every
+    new entry, so range queries never have to scan the (ever growing) entries.
+    The time tracked so far becomes one entry per project, dated on its start date.
+    """
+    cursor.execute('''
+        CREATE TABLE time_entries (
+            id INTEGER PRIMARY KEY,
+            project_id INTEGER NOT NULL,
+            minutes INTEGER NOT NULL,
+            recorded_at TEXT NOT NULL DEFAULT (datetime('now', 'localtime'))
+        )
+    ''')
+    cursor.execute("CREATE INDEX idx_time_entries_project ON time_entries (project_id, recorded_at)")
+    # day: "yyyy-MM-dd", week: date of the monday the week starts with
+    cursor.execute('''
+        CREATE TABLE time_rollup_daily (
+            project_id INTEGER NOT NULL,
+            day TEXT NOT NULL,
+            minutes INTEGER NOT NULL,
+            PRIMARY KEY (project_id, day)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute("CREATE INDEX idx_time_rollup_daily_day ON time_rollup_daily (day)")
+    cursor.execute('''
+        CREATE TABLE time_rollup_weekly (
+            project_id INTEGER NOT NULL,
+            week TEXT NOT NULL,
+            minutes INTEGER NOT NULL,
+            PRIMARY KEY (project_id, week)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute("CREATE INDEX idx_time_rollup_weekly_week ON time_rollup_weekly (week)")
+    cursor.execute('''
+        CREATE TRIGGER time_entries_rollup AFTER INSERT ON time_entries
+        BEGIN
+            INSERT INTO time_rollup_daily (project_id, day, minutes)
+            VALUES (NEW.project_id, date(NEW.recorded_at), NEW.minutes)
+            ON CONFLICT (project_id, day) DO UPDATE SET minutes = minutes + excluded.minutes;
+            INSERT INTO time_rollup_weekly (project_id, week, minutes)
+            VALUES (NEW.project_id, date(NEW.recorded_at, '-6 days', 'weekday 1'), NEW.minutes)
+            ON CONFLICT (project_id, week) DO UPDATE SET minutes = minutes + excluded.minutes;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER projects_delete_time AFTER DELETE ON projects
+        BEGIN
+            DELETE FROM time_entries WHERE project_id = OLD.id;
+            DELETE FROM time_rollup_daily WHERE project_id = OLD.id;
+            DELETE FROM time_rollup_weekly WHERE project_id = OLD.id;
+        END
+    ''')
+    cursor.execute('''
+        INSERT INTO time_entries (project_id, minutes, recorded_at)
+        SELECT id, time_tracked,
+               CASE WHEN start_date GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'
+                    THEN start_date ELSE date('now', 'localtime') END || ' 00:00:00'
+        FROM projects WHERE time_tracked != 0 ORDER BY id
+    ''')
+
+
+def _migration_3_projects_search(cursor: sqlite3.Cursor):
+    """
+    Full-text index (FTS5) over name, description and type of all projects.
+    The index stores no copy of the text (external content table), triggers keep it
+    in sync with the projects table. Prefix indexes make as-you-type queries cheap.
+    """
+    cursor.execute('''
+        CREATE VIRTUAL TABLE projects_fts USING fts5(
+            name, description, type,
+            content = 'projects', content_rowid = 'id',
+            tokenize = 'unicode61 remove_diacritics 2', prefix = '1 2 3'
+        )
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER projects_fts_insert AFTER INSERT ON projects
+        BEGIN
+            INSERT INTO projects_fts (rowid, name, description, type)
+            VALUES (NEW.id, NEW.name, NEW.description, NEW.type);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER projects_fts_delete AFTER DELETE ON projects
+        BEGIN
+            INSERT INTO projects_fts (projects_fts, rowid, name, description, type)
+            VALUES ('delete', OLD.id, OLD.name, OLD.description, OLD.type);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER projects_fts_update AFTER UPDATE OF name, description, type ON projects
+        BEGIN
+            INSERT INTO projects_fts (projects_fts, rowid, name, description, type)
+            VALUES ('delete', OLD.id, OLD.name, OLD.description, OLD.type);
+            INSERT INTO projects_fts (rowid, name, description, type)
+            VALUES (NEW.id, NEW.name, NEW.description, NEW.type);
+        END
+    ''')
+    cursor.execute("INSERT INTO projects_fts (projects_fts) VALUES ('rebuild')")  # index existing projects
+
+
+def _migration_4_projects_archive(cursor: sqlite3.Cursor):
+    """
+    Cold table for archived projects, so the (hot) projects table that the GUI reads
+    periodically only holds the projects still worked on. An archived row keeps its ID
+    and a precomputed summary of its time (first and last day, active days), its time
+    entries and rollups stay in place, so reports over all time are unchanged.
+    Deleting a project only deletes its time if the project was not moved to the archive.
+    """
+    cursor.execute('''
+        CREATE TABLE projects_archive (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL DEFAULT '',
+            description TEXT NOT NULL DEFAULT '',
+            type TEXT NOT NULL DEFAULT '',
+            time_tracked INTEGER NOT NULL DEFAULT 0,
+            start_date TEXT,
+            end_date TEXT,
+            status TEXT NOT NULL DEFAULT 'archived',
+            archived_at TEXT NOT NULL DEFAULT (datetime('now', 'localtime')),
+            first_day TEXT,
+            last_day TEXT,
+            active_days INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute("DROP TRIGGER projects_delete_time")
+    cursor.execute('''
+        CREATE TRIGGER projects_delete_time AFTER DELETE ON projects
+        WHEN NOT EXISTS (SELECT 1 FROM projects_archive WHERE id = OLD.id)
+        BEGIN
+            DELETE FROM time_entries WHERE project_id = OLD.id;
+            DELETE FROM time_rollup_daily WHERE project_id = OLD.id;
+            DELETE FROM time_rollup_weekly WHERE project_id = OLD.id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER projects_archive_delete_time AFTER DELETE ON projects_archive
+        WHEN NOT EXISTS (SELECT 1 FROM projects WHERE id = OLD.id)
+        BEGIN
+            DELETE FROM time_entries WHERE project_id = OLD.id;
+            DELETE FROM time_rollup_daily WHERE project_id = OLD.id;
+            DELETE FROM time_rollup_weekly WHERE project_id = OLD.id;
+        END
+    ''')
+    # active and archived projects, for reports over all time
+    cursor.execute('''
+        CREATE VIEW projects_all AS
+            SELECT id, name, description, type, time_tracked, start_date, end_date, status FROM projects
+            UNION ALL
+            SELECT id, name, description, type, time_tracked, start_date, end_date, status FROM projects_archive
+    ''')
+
+
+def _migration_5_project_notes(cursor: sqlite3.Cursor):
+    """
+    Notes of every project, stored as revisions (the newest one is the current note).
+    Notes are deleted with their project, archived projects keep them.
+    """
+    cursor.execute('''
+        CREATE TABLE project_notes (
+            id INTEGER PRIMARY KEY,
+            project_id INTEGER NOT NULL,
+            text TEXT NOT NULL,
+            saved_at TEXT NOT NULL DEFAULT (datetime('now', 'localtime'))
+        )
+    ''')
+    cursor.execute("CREATE INDEX idx_project_notes_project ON project_notes (project_id, id)")
+    cursor.execute('''
+        CREATE TRIGGER projects_delete_notes AFTER DELETE ON projects
+        WHEN NOT EXISTS (SELECT 1 FROM projects_archive WHERE id = OLD.id)
+        BEGIN
+            DELETE FROM project_notes WHERE project_id = OLD.id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER projects_archive_delete_notes AFTER DELETE ON projects_archive
+        WHEN NOT EXISTS (SELECT 1 FROM projects WHERE id = OLD.id)
+        BEGIN
+            DELETE FROM project_notes WHERE project_id = OLD.id;
+        END
+    ''')
+
+
+def _migration_6_points_events(cursor: sqlite3.Cursor):
+    """
+    Points as an append-only stream of events (earned on a project, spent on a garden object,
+    adjusted e.g. by the import of older versions), each with its change of the total and the
+    available points. A snapshot of the balance is stored every few events, so a balance
+    is computed from the nearest snapshot instead of the whole stream.
+    """
+    cursor.execute('''
+        CREATE TABLE points_events (
+            id INTEGER PRIMARY KEY,
+            kind TEXT NOT NULL CHECK (kind IN ('earned', 'spent', 'adjusted')),
+            total_delta INTEGER NOT NULL,
+            available_delta INTEGER NOT NULL,
+            project_id INTEGER,
+            object_name TEXT,
+            garden TEXT,
+            recorded_at TEXT NOT NULL DEFAULT (datetime('now', 'localtime'))
+        )
+    ''')
+    cursor.execute("CREATE INDEX idx_points_events_recorded ON points_events (recorded_at)")
+    # balance after the event `event_id`
+    cursor.execute('''
+        CREATE TABLE points_snapshots (
+            event_id INTEGER PRIMARY KEY,
+            total_points INTEGER NOT NULL,
+            available_points INTEGER NOT NULL
+        )
+    ''')
+
+
+# Ordered list of all schema migrations. Index + 1 is the schema version a migration leads to.
+# Never change or reorder existing entries, only append new ones.
+MIGRATIONS = [
+    _migration_1_projects_table,
+    _migration_2_time_entries,
+    _migration_3_projects_search,
+    _migration_4_projects_archive,
+    _migration_5_project_notes,
+    _migration_6_points_events,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def connect(db_file=DB_FILE, readonly=False):
+    """
+    Open the projects database with settings suited to a desktop app.
+
+    - WAL journaling: readers (e.g. the garden process or a reporting CLI) never block
+      the writer and the writer never blocks readers.
+    - synchronous=NORMAL: with WAL a commit no longer waits for an fsync,
+      the database stays consistent even after a power loss.
+    - a larger page cache, temporary tables in memory and a busy timeout.
+    - a larger prepared statement cache, so repeated statements are compiled only once.
+
+    Parameters:
+        db_file (str, optional): Path of the database file. Defaults to DB_FILE.
+        readonly (bool, optional): Open a read-only connection, e.g. for reports. Defaults to False.
+
+    Example:
+        connection = connect(DB_FILE)
+    """
+    if readonly:
+        uri = pathlib.Path(db_file).absolute().as_uri() + "?mode=ro"
+        connection = sqlite3.connect(uri, uri=True, timeout=BUSY_TIMEOUT, cached_statements=STATEMENT_CACHE_SIZE)
+    else:
+        connection = sqlite3.connect(db_file, timeout=BUSY_TIMEOUT, cached_statements=STATEMENT_CACHE_SIZE)
+        if connection.execute("PRAGMA journal_mode").fetchone()[0] != "wal":
+            try:
+                connection.execute("PRAGMA journal_mode = WAL")  # stored in the file, also applies to readers
+            except sqlite3.OperationalError as e:
+                # another connection is writing, the next connection will switch
+                print(f"Could not enable WAL journaling: {e}")  # Debug message
+        connection.execute("PRAGMA synchronous = NORMAL")
+    connection.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB}")
+    connection.execute("PRAGMA temp_store = MEMORY")
+    return connection
+
+
+def get_schema_version(connection: sqlite3.Connection):
+    """Return the schema version stored in the database file (PRAGMA user_version)."""
+    return connection.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(connection: sqlite3.Connection):
+    """
+    Upgrade the database schema to the latest version.
+    Each migration runs in its own transaction together with the version update,
+    so an interrupted upgrade never leaves a half-migrated database behind.
+    """
+    version = get_schema_version(connection)
+    if version > SCHEMA_VERSION:
+        raise RuntimeError(f"Database schema version {version} is newer than this app ({SCHEMA_VERSION})")
+    connection.commit()  # migrations must not be mixed with pending changes
+    for new_version in range(version + 1, SCHEMA_VERSION + 1):
+        cursor = connection.cursor()
+        cursor.execute("BEGIN")
+        try:
+            MIGRATIONS[new_version - 1](cursor)
+            cursor.execute(f"PRAGMA user_version = {new_version}")
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        print(f"Database migrated to schema version {new_version}")  # Debug message
@@ -0,0 +1,168 @@
+import csv
+import json
+import sqlite3
+
+# columns of the exchange files, projects are identified by name (IDs differ between databases)
+PROJECT_COLUMNS = ("name", "description", "type", "time_tracked", "start_date", "end_date", "status")
+TIME_ENTRY_COLUMNS = ("project", "minutes", "recorded_at")
+
+FILE_FORMATS = ("csv", "jsonl")
+CONFLICT_MODES = ("skip", "update", "fail")
+DUPLICATE_ENTRY_SQL = '''
+    SELECT 1 FROM time_entries JOIN projects ON projects.id = time_entries.project_id
+    WHERE projects.name = ? AND time_entries.recorded_at = ? AND time_entries.minutes = ?
+'''
+
+
+def get_file_format(path: str):
+    """Return the exchange format for a file name ("csv" or "jsonl")."""
+    if path.lower().endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return "csv"
+
+
+def _write_rows(rows, columns, file, file_format: str):
+    """Write rows (tuples in the order of `columns`) one by one, returns the number of rows."""
+    count = 0
+    if file_format == "csv":
+        writer = csv.writer(file)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    elif file_format == "jsonl":
+        for row in rows:
+            file.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n")
+            count += 1
+    else:
+        raise ValueError(f"Unknown file format '{file_format}', use one of {FILE_FORMATS}")
+    return count
+
+
+def _read_rows(file, file_format: str):
+    """Yield the rows of an exchange file as dicts, one by one."""
+    if file_format == "csv":
+        yield from csv.DictReader(file)
+    elif file_format == "jsonl":
+        for line_number, line in enumerate(file, 1):
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Line {line_number} is no valid JSON: {e}") from e
+    else:
+        raise ValueError(f"Unknown file format '{file_format}', use one of {FILE_FORMATS}")
+
+
+def export_projects(connection: sqlite3.Connection, file, file_format="csv"):
+    """
+    Write all projects to an open text file. Rows are streamed from the database cursor,
+    so the export never holds all projects in memory.
+    Returns the number of exported projects.
+    """
+    cursor = connection.execute(f'''
+        SELECT {", ".join(PROJECT_COLUMNS)} FROM projects ORDER BY id
+    ''')
+    return _write_rows(cursor, PROJECT_COLUMNS, file, file_format)
+
+
+def export_time_entries(connection: sqlite3.Connection, file, file_format="csv"):
+    """Write the time history of all projects to an open text file (streamed like export_projects)."""
+    cursor = connection.execute('''
+        SELECT projects.name, time_entries.minutes, time_entries.recorded_at
+        FROM time_entries JOIN projects ON projects.id = time_entries.project_id
+        ORDER BY time_entries.id
+    ''')
+    return _write_rows(cursor, TIME_ENTRY_COLUMNS, file, file_format)
+
+
+def _project_parameters(rows):
+    """Convert exchange rows to insert parameters, rows of csv files only contain strings."""
+    for row in rows:
+        name = (row.get("name") or "").strip()
+        if not name:
+            raise ValueError(f"Project without name: {row}")
+        yield (name, row.get("description") or "", row.get("type") or "", int(row.get("time_tracked") or 0),
+               row.get("start_date") or None, row.get("end_date") or None, row.get("status") or "active")
+
+
+def import_projects(connection: sqlite3.Connection, file, file_format="csv", on_conflict="skip"):
+    """
+    Import projects from an open text file with one executemany in a single transaction.
+    Either all rows are imported or, on an error, none.
+
+    Parameters:
+        connection (sqlite3.Connection): Connection to the projects database.
+        file: Open text file (csv with header row or JSON Lines).
+        file_format (str, optional): "csv" or "jsonl". Defaults to "csv".
+        on_conflict (str, optional): What to do with a project whose name already exists:
+            "skip" keeps the existing project, "update" overwrites it with the imported data
+            (except time_tracked, which is the sum of the project's time entries, see
+            import_time_entries), "fail" aborts the whole import. Defaults to "skip".
+
+    Returns the number of inserted or updated projects.
+
+    Example:
+        with open("projects.csv", newline="", encoding="utf-8") as file:
+            import_projects(connection, file, "csv", on_conflict="update")
+    """
+    if on_conflict not in CONFLICT_MODES:
+        raise ValueError(f"Unknown conflict mode '{on_conflict}', use one of {CONFLICT_MODES}")
+    conflict_clause = {
+        "skip": "ON CONFLICT (name) DO NOTHING",
+        "update": '''ON CONFLICT (name) DO UPDATE SET
+            description = excluded.description, type = excluded.type,
+            start_date = excluded.start_date, end_date = excluded.end_date, status = excluded.status''',
+        "fail": "",
+    }[on_conflict]
+    sql = f'''
+        INSERT INTO projects ({", ".join(PROJECT_COLUMNS)})
+        VALUES ({", ".join("?" for _ in PROJECT_COLUMNS)}) {conflict_clause}
+    '''
+    return _execute_import(connection, sql, _project_parameters(_read_rows(file, file_format)))
+
+
+def import_time_entries(connection: sqlite3.Connection, file, file_format="csv", on_conflict="skip"):
+    """
+    Import time history from an open text file in a single transaction.
+    Entries are assigned to projects by name, entries of unknown projects are skipped.
+    An entry with the same project, recorded_at and minutes as a stored (or earlier imported)
+    entry is a duplicate, e.g. of the same export imported twice: "skip" and "update" leave it
+    out, "fail" aborts the whole import. The rollup tables are updated by the database trigger.
+    Returns the number of imported entries.
+    """
+    if on_conflict not in CONFLICT_MODES:
+        raise ValueError(f"Unknown conflict mode '{on_conflict}', use one of {CONFLICT_MODES}")
+
+    def parameters(rows):
+        for row in rows:
+            minutes, recorded_at, project = int(row["minutes"]), row["recorded_at"], row["project"]
+            if on_conflict == "fail" and connection.execute(DUPLICATE_ENTRY_SQL,
+                                                            (project, recorded_at, minutes)).fetchone():
+                raise sqlite3.IntegrityError(f"Time entry exists already: {project}, {recorded_at}, {minutes} min")
+            yield minutes, recorded_at, project, recorded_at, minutes
+
+    # duplicates are looked up by idx_time_entries_project (project_id, recorded_at)
+    sql = '''
+        INSERT INTO time_entries (project_id, minutes, recorded_at)
+        SELECT id, ?, ? FROM projects WHERE name = ? AND NOT EXISTS (
+            SELECT 1 FROM time_entries
+            WHERE project_id = projects.id AND recorded_at = ? AND minutes = ?
+        )
+    '''
+    return _execute_import(connection, sql, parameters(_read_rows(file, file_format)))
+
+
+def _execute_import(connection: sqlite3.Connection, sql: str, parameters):
+    """Run executemany over a generator of parameters inside one transaction."""
+    connection.commit()  # the import must not be mixed with pending changes
+    cursor = connection.cursor()
+    cursor.execute("BEGIN")
+    try:
+        cursor.executemany(sql, parameters)
+        count = cursor.rowcount
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    return count
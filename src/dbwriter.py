@@ -0,0 +1,103 @@
+import queue
+import sqlite3
+import threading
+from PyQt6.QtCore import QObject, pyqtSignal
+from src.database import connect
+
+_STOP = object()  # queue item that ends the writer thread
+
+
+class DatabaseWriter(QObject):
+    """
+    Execute database writes on a dedicated thread, off the Qt GUI thread.
+
+    The thread owns its own write connection. Statements are queued with execute(),
+    everything that is waiting when the thread wakes up is committed in one transaction.
+    The result of each transaction is reported back to the GUI thread with signals.
+
+    Signals:
+        writes_committed (int): Ticket of the last statement of a committed transaction.
+        write_failed (str): Error message of a transaction that was rolled back.
+
+    Example:
+        writer = DatabaseWriter(DB_FILE)
+        writer.write_failed.connect(print)
+        writer.execute("UPDATE projects SET time_tracked = ? WHERE id = ?", (30, 1))
+        writer.close()
+    """
+    writes_committed = pyqtSignal(int)
+    write_failed = pyqtSignal(str)
+
+    def __init__(self, db_file, parent=None):
+        super().__init__(parent)
+        self.db_file = db_file
+        self.last_ticket = 0  # ticket of the last queued statement (GUI thread)
+        self.committed_ticket = 0  # ticket of the last committed statement (writer thread)
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="DatabaseWriter", daemon=True)
+        self._thread.start()
+
+    def execute(self, sql: str, parameters=()):
+        """Queue a statement and return its ticket (increasing number)."""
+        self.last_ticket += 1
+        self._queue.put((self.last_ticket, sql, parameters))
+        return self.last_ticket
+
+    def has_pending(self):
+        """Return True if queued statements are not committed yet."""
+        return self.committed_ticket < self.last_ticket
+
+    def flush(self):
+        """Block until all queued statements are written."""
+        self._queue.join()
+
+    def close(self):
+        """Write all queued statements and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def _run(self):
+        connection = None
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            while True:  # take everything that is already waiting
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if any(item is _STOP for item in batch):
+                running = False
+            writes = [item for item in batch if item is not _STOP]
+            try:
+                if writes:
+                    if connection is None:  # opened on first use, retried if it failed
+                        connection = connect(self.db_file)
+                    self._write_batch(connection, writes)
+            except sqlite3.Error as e:
+                # never let the thread die, flush() would wait forever
+                print(f"Database write failed: {e}")  # Debug message
+                self.write_failed.emit(str(e))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        if connection is not None:
+            connection.close()
+
+    def _write_batch(self, connection: sqlite3.Connection, writes):
+        try:
+            with connection:  # one transaction for the whole batch
+                for _, sql, parameters in writes:
+                    connection.execute(sql, parameters)
+        except sqlite3.Error:
+            # one statement failed: write the others one by one, so only the failing one is lost
+            for _, sql, parameters in writes:
+                try:
+                    with connection:
+                        connection.execute(sql, parameters)
+                except sqlite3.Error as e:
+                    print(f"Database write failed: {e}")  # Debug message
+                    self.write_failed.emit(str(e))
+        self.committed_ticket = writes[-1][0]
+        self.writes_committed.emit(self.committed_ticket)
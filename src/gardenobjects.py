@@ -1,3 +1,96 @@
+import os
+from src.constants import ASSETS_PATH
+
+# vegetation data with all relevant paths
+VEGETATION_DATA = {
+    "City Park": {
+        "ground": os.path.join(ASSETS_PATH, "park_grass.png"),
+        "objects": [
+            {
+                "name": "path",
+                "image": os.path.join(ASSETS_PATH, "park_path.png"),
+                "cost": 2
+            },
+            {
+                "name": "path_horizontal",
+                "image": os.path.join(ASSETS_PATH, "park_path_horizontal.png"),
+                "cost": 2
+            },
+            {
+                "name": "path_cross",
+                "image": os.path.join(ASSETS_PATH, "park_path_cross.png"),
+                "cost": 2
+            },
+            {
+                "name": "flowers",
+                "image": os.path.join(ASSETS_PATH, "park_flowers.png"),
+                "cost": 2
+            },
+            {
+                "name": "bench",
+                "image": os.path.join(ASSETS_PATH, "park_bench.png"),
+                "cost": 4
+            },
+            {
+                "name": "tree",
+                "image": os.path.join(ASSETS_PATH, "park_tree.png"),
+                "cost": 8
+            },
+        ]
+    },
+    "Desert": {
+        "ground": os.path.join(ASSETS_PATH, "desert_sand.png"),
+        "objects": [
+            {
+                "name": "bush",
+                "image": os.path.join(ASSETS_PATH, "desert_bush.png"),
+                "cost": 2
+            },
+            {
+                "name": "bush2",
+                "image": os.path.join(ASSETS_PATH, "desert_bush2.png"),
+                "cost": 2
+            },
+            {
+                "name": "cactus",
+                "image": os.path.join(ASSETS_PATH, "desert_cactus.png"),
+                "cost": 4
+            },
+            {
+                "name": "cactus2",
+                "image": os.path.join(ASSETS_PATH, "desert_cactus2.png"),
+                "cost": 4
+            },
+            {
+                "name": "skeleton",
+                "image": os.path.join(ASSETS_PATH, "desert_skeleton.png"),
+                "cost": 8
+            },
+        ]
+    },
+    "Rainforest": {
+        "ground": os.path.join(ASSETS_PATH, "rainforest_ground.png"),
+        "objects": [
+            {
+                "name": "flowers",
+                "image": os.path.join(ASSETS_PATH, "rainforest_flowers.png"),
+                "cost": 2
+            },
+            {
+                "name": "tree",
+                "image": os.path.join(ASSETS_PATH, "rainforest_tree.png"),
+                "cost": 8
+            },
+            {
+                "name": "trees",
+                "image": os.path.join(ASSETS_PATH, "rainforest_trees.png"),
+                "cost": 10
+            },
+        ]
+    }
+}
+
+
 
 
 class GardenObject:
@@ -0,0 +1,169 @@
+import json
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtNetwork import QLocalServer, QLocalSocket
+from src.constants import IPC_SERVER_NAME
+
+# Live channel between the main window and the garden (separate processes) over a local
+# socket (a Unix domain socket or a named pipe on Windows). The main window is the server,
+# the garden connects as client. Messages are small json objects, one per line, e.g.
+#     {"type": "points", "total_delta": 2, "available_delta": 2}
+#     {"type": "timer", "selected_timer": "pomodoro", "mode": "running", "project_id": 1}
+# A message of one client is also forwarded to all other clients.
+
+
+def get_server_name(profile_name: str):
+    """Return the name of the channel of a profile, every profile has its own channel."""
+    return f"{IPC_SERVER_NAME}-{profile_name}"
+
+
+def encode_message(message: dict):
+    """Return a message as one line of json."""
+    return json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+class MessageBuffer:
+    """Split the received bytes into messages, a message may arrive in several parts."""
+    def __init__(self):
+        self._data = b""
+
+    def feed(self, data: bytes):
+        """Add received bytes and return the complete messages (lines that are no json object are skipped)."""
+        self._data += data
+        *lines, self._data = self._data.split(b"\n")
+        messages = []
+        for line in lines:
+            try:
+                message = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                print(f"Invalid message: {line[:80]!r}")  # Debug message
+                continue
+            if isinstance(message, dict):
+                messages.append(message)
+        return messages
+
+
+class IpcServer(QObject):
+    """
+    Server side of the channel, runs in the Qt event loop of the main window.
+
+    Signals:
+        message_received (dict): A client published a message.
+
+    Parameters:
+        parent (QObject, optional): The parent object. Defaults to None.
+
+    Example:
+        server = IpcServer(parent=self)
+        server.message_received.connect(handle_message)
+        server.listen(get_server_name(profile.name))
+        server.publish({"type": "points", "total_delta": 1, "available_delta": 1})
+    """
+    message_received = pyqtSignal(dict)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._server = QLocalServer(self)
+        self._server.newConnection.connect(self._accept)
+        self._clients = {}  # socket -> MessageBuffer
+
+    def listen(self, name: str):
+        """
+        Start listening on the channel `name`. Returns False if another window already serves it.
+        A channel left behind by a crashed window is removed first.
+        """
+        self.close()
+        probe = QLocalSocket()
+        probe.connectToServer(name)
+        if probe.waitForConnected(100):
+            probe.disconnectFromServer()
+            return False
+        QLocalServer.removeServer(name)
+        if not self._server.listen(name):
+            print(f"Could not listen on {name}: {self._server.errorString()}")  # Debug message
+            return False
+        return True
+
+    def is_listening(self):
+        """Return True if the server accepts clients."""
+        return self._server.isListening()
+
+    def client_count(self):
+        """Return the number of connected clients."""
+        return len(self._clients)
+
+    def publish(self, message: dict, sender: QLocalSocket | None = None):
+        """Send a message to all clients (except its sender)."""
+        data = encode_message(message)
+        for client in self._clients:
+            if client is not sender:
+                client.write(data)
+                client.flush()
+
+    def close(self):
+        """Disconnect all clients and stop listening."""
+        for client in list(self._clients):
+            client.disconnectFromServer()
+        self._clients = {}
+        self._server.close()
+
+    def _accept(self):
+        while self._server.hasPendingConnections():
+            client = self._server.nextPendingConnection()
+            self._clients[client] = MessageBuffer()
+            client.readyRead.connect(lambda client=client: self._read(client))
+            client.disconnected.connect(lambda client=client: self._remove(client))
+
+    def _read(self, client: QLocalSocket):
+        buffer = self._clients.get(client)
+        if buffer is None:
+            return
+        for message in buffer.feed(bytes(client.readAll())):
+            self.publish(message, sender=client)
+            self.message_received.emit(message)
+
+    def _remove(self, client: QLocalSocket):
+        if self._clients.pop(client, None) is not None:
+            client.deleteLater()
+
+
+class IpcClient:
+    """
+    Client side of the channel for a process without Qt event loop (the pygame garden).
+    poll() reads the received messages without blocking, e.g. once per frame.
+
+    Example:
+        client = IpcClient()
+        client.connect_to_server(get_server_name(profile.name))
+        for message in client.poll():
+            ...
+        client.publish({"type": "points", "total_delta": 0, "available_delta": -2})
+    """
+    def __init__(self):
+        self._socket = QLocalSocket()
+        self._buffer = MessageBuffer()
+
+    def connect_to_server(self, name: str, timeout_ms=100):
+        """Connect to the channel `name`, returns False if no main window serves it."""
+        self._socket.connectToServer(name)
+        return self._socket.waitForConnected(timeout_ms)
+
+    def is_connected(self):
+        """Return True while the connection to the main window is open."""
+        return self._socket.state() == QLocalSocket.LocalSocketState.ConnectedState
+
+    def publish(self, message: dict):
+        """Send a message to the main window (and the other clients)."""
+        if self.is_connected():
+            self._socket.write(encode_message(message))
+            self._socket.waitForBytesWritten(100)
+
+    def poll(self):
+        """Return the messages received since the last call, never blocks."""
+        if not self.is_connected():
+            return []
+        self._socket.waitForReadyRead(0)  # moves received data into the read buffer
+        return self._buffer.feed(bytes(self._socket.readAll()))
+
+    def close(self):
+        """Close the connection."""
+        self._socket.disconnectFromServer()
@@ -0,0 +1,144 @@
+import sqlite3
+import time
+from PyQt6.QtCore import QObject, QTimer
+from src.constants import NOTE_AUTOSAVE_DELAY_MS, NOTE_REVISIONS_KEPT, NOTE_REVISION_MINUTES
+
+
+class ProjectNotes(QObject):
+    """
+    Note of the selected project, stored as revisions in the project_notes table.
+
+    Editing only restarts a timer, the text is read and saved once the user stopped
+    typing for `delay_ms` (and only if it differs from the saved text). Saves within
+    NOTE_REVISION_MINUTES of a new revision update that revision, later saves start a
+    new one. Only the newest NOTE_REVISIONS_KEPT revisions of a project are kept.
+    The note of a project is read when the project is selected (load), a save that is
+    still queued in the writer is taken from memory instead of waiting for the writer.
+
+    Parameters:
+        connection (sqlite3.Connection): Connection to the projects database.
+        get_text (callable): Returns the current text of the note editor.
+        writer (DatabaseWriter, optional): Writer thread the saves are sent to. Defaults to None.
+        delay_ms (int, optional): Pause in typing before the note is saved. Defaults to NOTE_AUTOSAVE_DELAY_MS.
+        parent (QObject, optional): The parent object. Defaults to None.
+
+    Example:
+        notes = ProjectNotes(connection, text_box.toPlainText, parent=self)
+        text_box.textChanged.connect(notes.text_edited)
+        text_box.setPlainText(notes.load(project_id))
+    """
+    INSERT_SQL = '''
+        INSERT INTO project_notes (project_id, text, saved_at) VALUES (?, ?, datetime('now', 'localtime'))
+    '''
+    UPDATE_SQL = '''
+        UPDATE project_notes SET text = ?, saved_at = datetime('now', 'localtime')
+        WHERE id = (SELECT MAX(id) FROM project_notes WHERE project_id = ?)
+    '''
+    # delete everything older than the newest `revisions kept` revisions
+    PRUNE_SQL = '''
+        DELETE FROM project_notes WHERE project_id = ? AND id <= (
+            SELECT id FROM project_notes WHERE project_id = ? ORDER BY id DESC LIMIT 1 OFFSET ?
+        )
+    '''
+
+    def __init__(self, connection: sqlite3.Connection, get_text, writer=None,
+                 delay_ms=NOTE_AUTOSAVE_DELAY_MS, parent=None):
+        super().__init__(parent)
+        self.conn = connection
+        self.get_text = get_text
+        self.writer = writer
+        self.project_id = None
+        self.write_count = 0
+        self._saved_text = ""
+        self._revision_started = None  # time.monotonic() of the revision started in this session
+        self._queued_texts = {}  # project id -> (writer ticket, text) of saves not yet committed
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self.flush)
+
+    def load(self, project_id: int):
+        """Save the note of the previous project and return the note of `project_id`."""
+        self.flush()
+        self.project_id = project_id
+        self._saved_text = ProjectNotes.get_note(project_id, self.conn)
+        if self.writer is not None and self.writer.has_pending():
+            ticket, text = self._queued_texts.get(project_id, (0, None))
+            if ticket > self.writer.committed_ticket:  # a save of this project is still queued
+                self._saved_text = text
+        else:
+            self._queued_texts.clear()
+        self._revision_started = None
+        return self._saved_text
+
+    def set_connection(self, connection: sqlite3.Connection, writer=None):
+        """Save a pending edit and use another database (e.g. of another profile), load() follows."""
+        self.flush()
+        self.conn = connection
+        self.writer = writer
+        self._queued_texts = {}
+        self.project_id = None
+        self._saved_text = ""
+        self._revision_started = None
+
+    def text_edited(self):
+        """Is called on every change of the editor, (re)starts the autosave delay."""
+        if self.project_id is not None:
+            self._timer.start()
+
+    def has_pending(self):
+        """Return True if an edit waits for the autosave."""
+        return self._timer.isActive()
+
+    def discard(self):
+        """Forget an unsaved edit and the project, e.g. because the project is deleted (nothing is saved until load)."""
+        self._timer.stop()
+        self.project_id = None
+        self._saved_text = ""
+        self._revision_started = None
+
+    def flush(self):
+        """Save the note now if it was edited. Returns True if something was written."""
+        self._timer.stop()
+        if self.project_id is None:
+            return False
+        text = self.get_text()
+        if text == self._saved_text:
+            return False
+        now = time.monotonic()
+        if self._revision_started is not None and now - self._revision_started < NOTE_REVISION_MINUTES * 60:
+            statements = [(ProjectNotes.UPDATE_SQL, (text, self.project_id))]
+        else:
+            statements = [(ProjectNotes.INSERT_SQL, (self.project_id, text)),
+                          (ProjectNotes.PRUNE_SQL, (self.project_id, self.project_id, NOTE_REVISIONS_KEPT))]
+            self._revision_started = now
+        if self.writer is not None:
+            for sql, parameters in statements:
+                self.writer.execute(sql, parameters)
+            self._queued_texts[self.project_id] = (self.writer.last_ticket, text)
+        else:
+            for sql, parameters in statements:
+                self.conn.execute(sql, parameters)
+            self.conn.commit()
+        self._saved_text = text
+        self.write_count += 1
+        return True
+
+    @staticmethod
+    def get_note(project_id: int, connection: sqlite3.Connection):
+        """Return the current (newest) note of a project, an empty string if there is none."""
+        cursor = connection.cursor()
+        cursor.execute('''
+            SELECT text FROM project_notes WHERE project_id = ? ORDER BY id DESC LIMIT 1
+        ''', (project_id,))
+        row = cursor.fetchone()
+        return row[0] if row else ""
+
+    @staticmethod
+    def get_revisions(project_id: int, connection: sqlite3.Connection):
+        """Return all kept revisions of a project's note as (id, text, saved_at), the newest first."""
+        cursor = connection.cursor()
+        cursor.execute('''
+            SELECT id, text, saved_at FROM project_notes WHERE project_id = ? ORDER BY id DESC
+        ''', (project_id,))
+        return cursor.fetchall()
@@ -0,0 +1,158 @@
+import hashlib
+import json
+import os
+import time
+from PyQt6.QtCore import QObject, QTimer
+
+
+def write_json_atomic(path, data):
+    """
+    Write `data` as json to `path` without ever leaving a half-written file.
+    The data is written to a temporary file next to the target, flushed to disk
+    and then renamed over the target in one step.
+    """
+    write_text_atomic(path, json.dumps(data))
+
+
+def write_text_atomic(path, text: str):
+    """Write `text` to `path` like write_json_atomic."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        file.write(text)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+class TimerCheckpoint:
+    """
+    Small durable record of the running timer, so it can be restored after a crash or restart.
+
+    The record is only written on state transitions (start, pause, phase switch, ...)
+    and when tracked minutes were written to the database, never on every tick.
+
+    Parameters:
+        path (str): Path of the json file holding the checkpoint.
+
+    Example:
+        checkpoint = TimerCheckpoint(TIMER_CHECKPOINT_FILE)
+        checkpoint.save(time_manager.get_state())
+        state = checkpoint.load()
+    """
+    def __init__(self, path):
+        self.path = path
+
+    def save(self, state: dict):
+        """Write the timer state to disk."""
+        write_json_atomic(self.path, state)
+
+    def load(self):
+        """Return the last saved timer state or None if there is no (readable) checkpoint."""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (json.JSONDecodeError, OSError):
+            return None
+
+    def clear(self):
+        """Remove the checkpoint."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class JsonStore(QObject):
+    """
+    Json file that is only written when its content changed, debounced and atomically.
+
+    save() is cheap and may be called as often as the state is polled: the data is
+    compared (by hash) with what was written last, unchanged data is never written.
+    Changed data is written `delay_ms` after the last change, but at the latest
+    `max_delay_ms` after the first unwritten change, so continuous typing is saved too.
+    flush() writes pending data at once, e.g. when the window closes.
+
+    Parameters:
+        path (str): Path of the json file.
+        delay_ms (int, optional): Quiet time before a change is written. Defaults to 1000.
+        max_delay_ms (int, optional): Longest time a change stays unwritten. Defaults to 5000.
+        parent (QObject, optional): The parent object. Defaults to None.
+
+    Example:
+        store = JsonStore(JSON_FILE, parent=self)
+        data = store.load() or default_data
+        store.save(data)  # written a second later, if it changed
+        store.flush()
+    """
+    def __init__(self, path, delay_ms=1000, max_delay_ms=5000, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.delay_ms = delay_ms
+        self.max_delay_ms = max_delay_ms
+        self.write_count = 0
+        self._written_hash = None  # hash of the content of the file
+        self._pending = None  # (serialized data, hash) waiting to be written
+        self._pending_since = None  # time.monotonic() of the first unwritten change
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+
+    def load(self):
+        """Return the stored data or None if there is no (readable) file."""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (json.JSONDecodeError, OSError):
+            return None
+        self._written_hash = self._hash(self._serialize(data))  # don't write the loaded data back
+        return data
+
+    def save(self, data):
+        """Schedule writing `data` if it differs from the written content."""
+        text = self._serialize(data)
+        data_hash = self._hash(text)
+        if data_hash == self._written_hash:
+            self._cancel()  # changed back before it was written
+            return
+        if self._pending is not None and self._pending[1] == data_hash:
+            return  # already scheduled
+        self._pending = (text, data_hash)
+        now = time.monotonic()
+        if self._pending_since is None:
+            self._pending_since = now
+        remaining_ms = self.max_delay_ms - int((now - self._pending_since) * 1000)
+        self._timer.start(max(0, min(self.delay_ms, remaining_ms)))
+
+    def has_pending(self):
+        """Return True if changed data is waiting to be written."""
+        return self._pending is not None
+
+    def flush(self):
+        """Write pending data now."""
+        if self._pending is None:
+            return
+        text, data_hash = self._pending
+        try:
+            write_text_atomic(self.path, text)
+        except OSError as e:
+            print(f"Could not write {self.path}: {e}")  # Debug message
+            self._timer.start(self.delay_ms)  # try again
+            return
+        self._written_hash = data_hash
+        self.write_count += 1
+        self._cancel()
+
+    def _cancel(self):
+        self._pending = None
+        self._pending_since = None
+        self._timer.stop()
+
+    @staticmethod
+    def _serialize(data):
+        return json.dumps(data, sort_keys=True)
+
+    @staticmethod
+    def _hash(text: str):
+        return hashlib.sha1(text.encode("utf-8")).digest()
@@ -1,21 +1,166 @@
+import sqlite3
+from src.constants import POINTS_SNAPSHOT_INTERVAL
+
+
 class PointsSystem:
-    def __init__(self):
+    """
+    Points of the user, stored as an append-only stream of events in the points_events table.
+
+    Every change is an event: points earned on a project, spent on an object in a garden or
+    adjusted (set_points). The current balance is kept in memory and read in O(1). After every
+    POINTS_SNAPSHOT_INTERVAL events a snapshot of the balance is stored, so loading the balance
+    and history queries (get_balance_at) only replay the events after the nearest snapshot.
+    Without a connection the points are only kept in memory.
+
+    Parameters:
+        connection (sqlite3.Connection, optional): Connection to the migrated projects database. Defaults to None.
+        writer (DatabaseWriter, optional): Writer thread the events are sent to. Defaults to None.
+
+    Example:
+        point_system = PointsSystem(connection)
+        point_system.add_points(3, project_id=project.id)
+        point_system.remove_points(2, object_name="tree", garden="garden_1")
+        total_points, available_points = point_system.get_points()
+    """
+    EVENT_SQL = '''
+        INSERT INTO points_events (kind, total_delta, available_delta, project_id, object_name, garden)
+        VALUES (?, ?, ?, ?, ?, ?)
+    '''
+    # computed from the stored events, the garden process records events as well
+    SNAPSHOT_SQL = '''
+        INSERT OR REPLACE INTO points_snapshots (event_id, total_points, available_points)
+        SELECT MAX(id),
+               COALESCE((SELECT total_points FROM points_snapshots ORDER BY event_id DESC LIMIT 1), 0)
+               + SUM(total_delta),
+               COALESCE((SELECT available_points FROM points_snapshots ORDER BY event_id DESC LIMIT 1), 0)
+               + SUM(available_delta)
+        FROM points_events
+        WHERE id > COALESCE((SELECT MAX(event_id) FROM points_snapshots), 0)
+        HAVING COUNT(*) > 0
+    '''
+
+    def __init__(self, connection: sqlite3.Connection | None = None, writer=None):
+        self.conn = connection
+        self.writer = writer
         self.total_points = 0
         self.available_points = 0
+        self.events_since_snapshot = 0
+        self.on_points_changed = None  # callback(total_delta, available_delta) after every own change
+        if self.conn is not None:
+            self.load()
+
+    def load(self):
+        """Read the balance from the latest snapshot and the events recorded after it."""
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            WITH snapshot AS (
+                SELECT event_id, total_points, available_points FROM points_snapshots
+                ORDER BY event_id DESC LIMIT 1
+            )
+            SELECT COALESCE((SELECT total_points FROM snapshot), 0) + COALESCE(SUM(total_delta), 0),
+                   COALESCE((SELECT available_points FROM snapshot), 0) + COALESCE(SUM(available_delta), 0),
+                   COUNT(*)
+            FROM points_events WHERE id > COALESCE((SELECT event_id FROM snapshot), 0)
+        ''')
+        self.total_points, self.available_points, self.events_since_snapshot = cursor.fetchone()
 
-    def add_points(self, points: int):
-        """Add points to the total and available points."""
-        self.total_points += points
-        self.available_points += points
-    
-    def remove_points(self, points: int):
-        """Remove points from the available points."""
-        self.available_points -= points
+    def add_points(self, points: int, project_id=None):
+        """Add points to the total and available points, earned on the project `project_id`."""
+        self._record("earned", points, points, project_id=project_id)
+
+    def remove_points(self, points: int, object_name=None, garden=None):
+        """Remove points from the available points, spent on `object_name` in `garden`."""
+        self._record("spent", 0, -points, object_name=object_name, garden=garden)
 
     def set_points(self, total_points, available_points):
-        self.total_points = total_points
-        self.available_points = available_points
+        """Set the points, the difference is recorded as an adjustment."""
+        if (total_points, available_points) != (self.total_points, self.available_points):
+            self._record("adjusted", total_points - self.total_points, available_points - self.available_points)
+
+    def apply_points_changed(self, total_delta: int, available_delta: int):
+        """Take over a change another process recorded (e.g. points spent in the garden)."""
+        self.total_points += total_delta
+        self.available_points += available_delta
 
     def get_points(self):
         """Return the current points."""
-        return self.total_points, self.available_points
\ No newline at end of file
+        return self.total_points, self.available_points
+
+    def has_history(self):
+        """Return True if a points event was ever recorded."""
+        if self.conn is None:
+            return False
+        return self.conn.execute("SELECT EXISTS (SELECT 1 FROM points_events)").fetchone()[0] == 1
+
+    def _record(self, kind: str, total_delta: int, available_delta: int,
+                project_id=None, object_name=None, garden=None):
+        self.total_points += total_delta
+        self.available_points += available_delta
+        if self.on_points_changed is not None:
+            self.on_points_changed(total_delta, available_delta)
+        if self.conn is None:
+            return
+        statements = [(PointsSystem.EVENT_SQL,
+                       (kind, total_delta, available_delta, project_id, object_name, garden))]
+        self.events_since_snapshot += 1
+        if self.events_since_snapshot >= POINTS_SNAPSHOT_INTERVAL:
+            statements.append((PointsSystem.SNAPSHOT_SQL, ()))
+            self.events_since_snapshot = 0
+        if self.writer is not None:
+            for sql, parameters in statements:
+                self.writer.execute(sql, parameters)
+        else:
+            for sql, parameters in statements:
+                self.conn.execute(sql, parameters)
+            self.conn.commit()
+
+    @staticmethod
+    def get_balance_at(timestamp: str, connection: sqlite3.Connection):
+        """
+        Return the points (total, available) after the last event recorded up to
+        `timestamp` ("yyyy-MM-dd HH:mm:ss" or "yyyy-MM-dd"), replayed from the nearest snapshot.
+        """
+        cursor = connection.cursor()
+        cursor.execute('''
+            WITH target AS (
+                SELECT COALESCE(MAX(id), 0) AS id FROM points_events WHERE recorded_at <= ?
+            ),
+            snapshot AS (
+                SELECT event_id, total_points, available_points FROM points_snapshots
+                WHERE event_id <= (SELECT id FROM target)
+                ORDER BY event_id DESC LIMIT 1
+            )
+            SELECT COALESCE((SELECT total_points FROM snapshot), 0) + COALESCE(SUM(total_delta), 0),
+                   COALESCE((SELECT available_points FROM snapshot), 0) + COALESCE(SUM(available_delta), 0)
+            FROM points_events
+            WHERE id > COALESCE((SELECT event_id FROM snapshot), 0) AND id <= (SELECT id FROM target)
+        ''', (timestamp,))
+        return cursor.fetchone()
+
+    @staticmethod
+    def get_events(connection: sqlite3.Connection, kind=None, limit=None):
+        """
+        Return the recorded events, the newest first:
+        (id, kind, total delta, available delta, project id, object name, garden, recorded at).
+        """
+        cursor = connection.cursor()
+        cursor.execute('''
+            SELECT id, kind, total_delta, available_delta, project_id, object_name, garden, recorded_at
+            FROM points_events
+            WHERE ? IS NULL OR kind = ?
+            ORDER BY id DESC
+            LIMIT ?
+        ''', (kind, kind, -1 if limit is None else limit))
+        return cursor.fetchall()
+
+    @staticmethod
+    def get_spending(connection: sqlite3.Connection):
+        """Return the points spent per garden object, the most spent first: (object name, times, points)."""
+        cursor = connection.cursor()
+        cursor.execute('''
+            SELECT object_name, COUNT(*), -SUM(available_delta) FROM points_events
+            WHERE kind = 'spent'
+            GROUP BY object_name
+            ORDER BY -SUM(available_delta) DESC, object_name
+        ''')
+        return cursor.fetchall()
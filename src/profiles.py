@@ -0,0 +1,91 @@
+import json
+import os
+import re
+from src.constants import RESOURCES_PATH, DEFAULT_PROFILE
+from src.persistence import write_json_atomic
+
+# Every profile (user) has its own database, settings and gardens. The default profile uses
+# the files directly in the resources folder (the layout of older versions), every other
+# profile a folder in resources/profiles. The active profile is stored in resources/profiles.json.
+
+PROFILE_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,32}$")
+
+
+class Profile:
+    """
+    Paths of the data files of one profile.
+
+    Parameters:
+        name (str): Name of the profile.
+        path (str): Folder of the profile's files.
+    """
+    def __init__(self, name: str, path: str):
+        self.name = name
+        self.path = path
+        self.db_file = os.path.join(path, "projects.db")
+        self.json_file = os.path.join(path, "data.json")
+        self.checkpoint_file = os.path.join(path, "timer_checkpoint.json")
+        self.map_folder = os.path.join(path, "gardens\\")
+        self.mapdata_file = os.path.join(self.map_folder, "gardens_data.json")
+
+    def __eq__(self, other):
+        return isinstance(other, Profile) and (self.name, self.path) == (other.name, other.path)
+
+    def __repr__(self):
+        return f"Profile({self.name!r}, {self.path!r})"
+
+
+def _profiles_path(resources_path):
+    return os.path.join(resources_path, "profiles")
+
+
+def _profiles_file(resources_path):
+    return os.path.join(resources_path, "profiles.json")
+
+
+def get_profile(name: str, resources_path=RESOURCES_PATH):
+    """Return the profile `name` (it does not have to exist yet), raise ValueError for invalid names."""
+    if not PROFILE_NAME_PATTERN.match(name):
+        raise ValueError(f"Invalid profile name '{name}', use up to 32 letters, digits, '-' or '_'")
+    if name == DEFAULT_PROFILE:
+        return Profile(name, resources_path)
+    return Profile(name, os.path.join(_profiles_path(resources_path), name))
+
+
+def list_profiles(resources_path=RESOURCES_PATH):
+    """Return the names of all profiles, the default profile first."""
+    profiles_path = _profiles_path(resources_path)
+    names = []
+    if os.path.isdir(profiles_path):
+        names = sorted(name for name in os.listdir(profiles_path)
+                       if os.path.isdir(os.path.join(profiles_path, name)) and PROFILE_NAME_PATTERN.match(name)
+                       and name != DEFAULT_PROFILE)
+    return [DEFAULT_PROFILE] + names
+
+
+def create_profile(name: str, resources_path=RESOURCES_PATH):
+    """Create the folders of a new profile and return it. Its database is created on first use."""
+    profile = get_profile(name, resources_path)
+    if name in list_profiles(resources_path):
+        raise ValueError(f"Profile '{name}' already exists")
+    os.makedirs(profile.map_folder)
+    return profile
+
+
+def get_active_profile(resources_path=RESOURCES_PATH):
+    """Return the active profile, the default profile if none was chosen or it no longer exists."""
+    try:
+        with open(_profiles_file(resources_path), "r", encoding="utf-8") as file:
+            name = json.load(file)["active"]
+    except (OSError, json.JSONDecodeError, KeyError, TypeError):
+        name = DEFAULT_PROFILE
+    if name not in list_profiles(resources_path):
+        name = DEFAULT_PROFILE
+    return get_profile(name, resources_path)
+
+
+def set_active_profile(name: str, resources_path=RESOURCES_PATH):
+    """Remember `name` as the active profile, e.g. for the next start and the garden."""
+    if name not in list_profiles(resources_path):
+        raise ValueError(f"Unknown profile '{name}'")
+    write_json_atomic(_profiles_file(resources_path), {"active": name})
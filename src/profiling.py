@@ -0,0 +1,220 @@
+import argparse
+import contextlib
+import cProfile
+import functools
+import io
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+from src.constants import (RESOURCES_PATH, PROFILING_ENV, PROFILING_INTERVAL_ENV, PROFILING_DIR_ENV,
+                           PROFILING_INTERVAL, PROFILING_TRACEMALLOC_FRAMES)
+
+# Opt-in profiling to find out what the app was doing when it was slow. Enabled with the flag
+# --profiling or the environment variable PRODUCTIVITYGARDEN_PROFILING=1, otherwise get_profiler()
+# returns None and profiled()/profiled_section() hand back the plain function or a no-op context,
+# so nothing is measured and nothing is paid. While enabled, the profiled code runs under cProfile
+# and tracemalloc and every interval a snapshot is written to the profiling folder:
+#     <name>-<n>.prof        cProfile stats since the start (python -m pstats, snakeviz, ...)
+#     <name>-<n>.tracemalloc allocations (tracemalloc.Snapshot.load, compare two with compare_to)
+# Writing a snapshot takes about 0.1 s. Summarizing is slower, so it is done once when profiling
+# stops (<name>-<n>.txt next to the last snapshot) or afterwards:
+#     python -m src.profiling resources/profiling/session-0003 --previous resources/profiling/session-0002
+
+SUMMARY_LIMIT = 25  # lines per section of the summary
+TRUE_VALUES = ("1", "true", "yes", "on")
+
+
+class Profiler:
+    """
+    cProfile and tracemalloc for the profiled parts of a process, with periodic snapshots.
+
+    Only the code between enable() and disable() (or in section() and wrapped functions) is
+    profiled, tracemalloc traces all allocations from start() on. Snapshots are written when
+    maybe_snapshot() is called after the interval has passed, wrapped functions call it.
+    stop() writes the summary of the last snapshot.
+
+    Parameters:
+        name (str): Name of the process, prefix of the snapshot files (e.g. "session", "garden").
+        output_dir (str): Folder the snapshots are written to, created if necessary.
+        interval (float, optional): Seconds between two snapshots. Defaults to PROFILING_INTERVAL.
+        clock (callable, optional): Monotonic clock returning seconds. Defaults to time.monotonic.
+
+    Example:
+        profiler = Profiler("session", "profiling", interval=30)
+        profiler.start()
+        with profiler.section():
+            startup()
+        update = profiler.wrap(update)
+        ...
+        profiler.stop()
+    """
+    def __init__(self, name: str, output_dir: str, interval: float = PROFILING_INTERVAL, clock=time.monotonic):
+        self.name = name
+        self.output_dir = output_dir
+        self.interval = interval
+        self.clock = clock
+        self.snapshot_count = 0
+        self._profile = cProfile.Profile()
+        self._depth = 0  # nested sections, the profile is enabled while > 0
+        self._next_snapshot = None
+        self._started_tracemalloc = False
+
+    def start(self):
+        """Start tracing allocations and the interval of the first snapshot."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(PROFILING_TRACEMALLOC_FRAMES)
+            self._started_tracemalloc = True
+        self._next_snapshot = self.clock() + self.interval
+        print(f"Profiling {self.name}, snapshots every {self.interval:g} s in {self.output_dir}")  # Debug message
+
+    def enable(self):
+        """Profile the code from now on (until the matching disable)."""
+        self._depth += 1
+        if self._depth == 1:
+            self._profile.enable()
+
+    def disable(self):
+        """End the profiling started by the matching enable."""
+        self._depth -= 1
+        if self._depth == 0:
+            self._profile.disable()
+
+    @contextlib.contextmanager
+    def section(self):
+        """Profile the code in the with block."""
+        self.enable()
+        try:
+            yield self
+        finally:
+            self.disable()
+
+    def wrap(self, function):
+        """Return `function` profiled, a snapshot is taken after a call once the interval has passed."""
+        @functools.wraps(function)
+        def profiled_function(*args, **kwargs):
+            self.enable()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.disable()
+                self.maybe_snapshot()
+        return profiled_function
+
+    def maybe_snapshot(self):
+        """Write a snapshot if the interval has passed since the last one, return True if it did."""
+        if self._next_snapshot is None or self.clock() < self._next_snapshot:
+            return False
+        self.snapshot()
+        return True
+
+    def snapshot(self):
+        """Write the profile and the allocations, return the paths of both files."""
+        self.snapshot_count += 1
+        base = os.path.join(self.output_dir, f"{self.name}-{self.snapshot_count:04d}")
+        self._profile.dump_stats(base + ".prof")  # disables the profile, the snapshot itself isn't profiled
+        if tracemalloc.is_tracing():
+            tracemalloc.take_snapshot().dump(base + ".tracemalloc")
+        self._next_snapshot = self.clock() + self.interval
+        if self._depth > 0:
+            self._profile.enable()
+        return base + ".prof", base + ".tracemalloc"
+
+    def stop(self):
+        """Write a last snapshot and its summary (compared to the snapshot before), stop profiling and tracing."""
+        self._depth = 0
+        self._profile.disable()
+        profile_file, allocations_file = self.snapshot()
+        if self._started_tracemalloc:
+            tracemalloc.stop()  # before the summary, grouping the allocations is much slower while tracing
+            self._started_tracemalloc = False
+        self._next_snapshot = None
+        previous_allocations_file = None
+        if self.snapshot_count > 1:
+            previous_allocations_file = os.path.join(self.output_dir,
+                                                     f"{self.name}-{self.snapshot_count - 1:04d}.tracemalloc")
+        summary_file = os.path.splitext(profile_file)[0] + ".txt"
+        with open(summary_file, "w", encoding="utf-8") as file:
+            file.write(summarize(profile_file, allocations_file, previous_allocations_file))
+        return summary_file
+
+
+def summarize(profile_file: str, allocations_file=None, previous_allocations_file=None):
+    """
+    Return a readable summary of a snapshot: the slowest functions, the largest allocations
+    and, with a previous snapshot, the allocations that grew the most since then.
+    Missing allocation files are skipped.
+    """
+    output = io.StringIO()
+    output.write(f"Slowest functions (cumulative time) in {profile_file}:\n")
+    try:
+        pstats.Stats(profile_file, stream=output).sort_stats("cumulative").print_stats(SUMMARY_LIMIT)
+    except TypeError:  # nothing was profiled
+        output.write("  nothing profiled\n")
+    if allocations_file is None or not os.path.exists(allocations_file):
+        return output.getvalue()
+    allocations = tracemalloc.Snapshot.load(allocations_file)
+    statistics = allocations.statistics("lineno")
+    output.write(f"\nLargest allocations ({sum(statistic.size for statistic in statistics) / 1024:.0f} KiB traced):\n")
+    for statistic in statistics[:SUMMARY_LIMIT]:
+        output.write(f"  {statistic}\n")
+    if previous_allocations_file is not None and os.path.exists(previous_allocations_file):
+        output.write(f"\nGrowth since {previous_allocations_file}:\n")
+        previous_allocations = tracemalloc.Snapshot.load(previous_allocations_file)
+        for statistic in allocations.compare_to(previous_allocations, "lineno")[:SUMMARY_LIMIT]:
+            output.write(f"  {statistic}\n")
+    return output.getvalue()
+
+
+def get_profiler(name: str, argv=None, environ=None):
+    """
+    Return a Profiler if profiling is enabled by the flags in `argv` or the environment, else None.
+    Unknown arguments are ignored (e.g. the arguments of Qt).
+
+    Example:
+        profiler = get_profiler("session")  # python main.py --profiling --profiling-interval 30
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    environ = os.environ if environ is None else environ
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--profiling", action="store_true")
+    parser.add_argument("--profiling-interval", type=float)
+    parser.add_argument("--profiling-dir")
+    args, _ = parser.parse_known_args(argv)
+    if not args.profiling and environ.get(PROFILING_ENV, "").strip().lower() not in TRUE_VALUES:
+        return None
+    interval = args.profiling_interval
+    if interval is None:
+        try:
+            interval = float(environ.get(PROFILING_INTERVAL_ENV, PROFILING_INTERVAL))
+        except ValueError:
+            print(f"Invalid {PROFILING_INTERVAL_ENV}, using {PROFILING_INTERVAL} s")  # Debug message
+            interval = PROFILING_INTERVAL
+    output_dir = args.profiling_dir or environ.get(PROFILING_DIR_ENV) or os.path.join(RESOURCES_PATH, "profiling")
+    return Profiler(name, output_dir, max(interval, 0.0))
+
+
+def profiled(function, profiler: Profiler | None):
+    """Return `function` wrapped by `profiler`, or `function` itself if profiling is disabled."""
+    return function if profiler is None else profiler.wrap(function)
+
+
+def profiled_section(profiler: Profiler | None):
+    """Return a context that profiles its block, a no-op if profiling is disabled."""
+    return contextlib.nullcontext() if profiler is None else profiler.section()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize a profiling snapshot of ProductivityGarden.")
+    parser.add_argument("snapshot", help="snapshot without extension, e.g. resources/profiling/session-0003")
+    parser.add_argument("--previous", help="earlier snapshot to compute the allocation growth against")
+    args = parser.parse_args(argv)
+    previous_allocations_file = args.previous + ".tracemalloc" if args.previous else None
+    print(summarize(args.snapshot + ".prof", args.snapshot + ".tracemalloc", previous_allocations_file))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+import sqlite3
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+from src.projectmanagement import ProjectManagement
+
+
+class ProjectListModel(QAbstractListModel):
+    """
+    List model of all projects for the projects dropdown, keyed by project ID.
+
+    Rows are loaded lazily from the database in batches (canFetchMore/fetchMore),
+    so the dropdown only holds the projects that were actually scrolled to.
+    Without a filter the projects are listed by ID, with a filter the results of the
+    full-text search (name, description, type) are listed, best matches first.
+    The display role is the project name, Qt.ItemDataRole.UserRole the project ID.
+
+    Parameters:
+        connection (sqlite3.Connection): Connection to the projects database.
+        batch_size (int, optional): Number of rows loaded per fetch. Defaults to BATCH_SIZE.
+        parent (QObject, optional): The parent object. Defaults to None.
+
+    Example:
+        model = ProjectListModel(connection)
+        combo_box.setModel(model)
+        model.set_filter("phy")
+        project_id = combo_box.currentData()
+    """
+    BATCH_SIZE = 200
+
+    def __init__(self, connection: sqlite3.Connection, batch_size=BATCH_SIZE, parent=None):
+        super().__init__(parent)
+        self.conn = connection
+        self.batch_size = batch_size
+        self._rows = []  # (id, name) tuples that match the filter: loaded ones, then the pinned ones
+        self._row_by_id = {}  # project ID -> row
+        self._pinned = set()  # IDs beyond the loaded range that were looked up directly (see row_of_id)
+        self._filter = ""
+        self._last_id = 0  # without filter: highest project ID that was already scanned
+        self._search_offset = 0  # with filter: number of search results that were already scanned
+        self._all_fetched = False
+        self.fetchMore(QModelIndex())  # first batch
+
+    def rowCount(self, parent=QModelIndex()):  # type: ignore
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):  # type: ignore
+        if not index.isValid() or not 0 <= index.row() < len(self._rows):
+            return None
+        project_id, name = self._rows[index.row()]
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return name
+        if role == Qt.ItemDataRole.UserRole:
+            return project_id
+        return None
+
+    def canFetchMore(self, parent: QModelIndex):  # type: ignore
+        return not parent.isValid() and not self._all_fetched
+
+    def fetchMore(self, parent: QModelIndex):  # type: ignore
+        """Load the next batch of matching projects (in front of the pinned ones)."""
+        if parent.isValid() or self._all_fetched:
+            return
+        if self._filter:
+            rows = ProjectManagement.search_projects(self._filter, self.conn, self.batch_size, self._search_offset)
+            self._search_offset += len(rows)
+        else:
+            rows = self.conn.execute('''
+                SELECT id, name FROM projects WHERE id > ? ORDER BY id LIMIT ?
+            ''', (self._last_id, self.batch_size)).fetchall()
+            if rows:
+                self._last_id = rows[-1][0]
+        if len(rows) < self.batch_size:
+            self._all_fetched = True
+        rows = [row for row in rows if row[0] not in self._pinned]
+        if rows:
+            first = len(self._rows) - len(self._pinned)
+            self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+            self._rows[first:first] = rows
+            self._update_row_index(first)
+            self.endInsertRows()
+
+    def set_filter(self, text: str):
+        """Only show the projects found by a full-text search for `text` (every word is a prefix)."""
+        text = text.strip()
+        if text == self._filter:
+            return
+        self._reset(text)
+
+    def set_connection(self, connection: sqlite3.Connection):
+        """List the projects of another database (e.g. of another profile)."""
+        self.conn = connection
+        self._reset(self._filter)
+
+    def row_of_id(self, project_id: int):
+        """
+        Return the row of a project or -1 if it does not exist or does not match the filter.
+        A project beyond the loaded rows is looked up directly and pinned to the end of the list,
+        instead of loading all rows up to it.
+        """
+        row = self._row_by_id.get(project_id)
+        if row is not None:
+            return row
+        if self._all_fetched or (not self._filter and project_id <= self._last_id):
+            return -1
+        name = ProjectManagement.get_name_by_id(project_id, self.conn)
+        if name is None or not self._matches(project_id):
+            return -1
+        row = len(self._rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.append((project_id, name))
+        self._row_by_id[project_id] = row
+        self._pinned.add(project_id)
+        self.endInsertRows()
+        return row
+
+    def project_added(self, project_id: int, name: str):
+        """Show a new project (if all rows are loaded, otherwise it will be fetched later)."""
+        if self._all_fetched and self._matches(project_id):
+            row = len(self._rows)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._rows.append((project_id, name))
+            self._row_by_id[project_id] = row
+            self._last_id = max(self._last_id, project_id)
+            self.endInsertRows()
+
+    def project_renamed(self, project_id: int, name: str):
+        """Update the name of a loaded project."""
+        row = self._row_by_id.get(project_id)
+        if row is not None:
+            self._rows[row] = (project_id, name)
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+
+    def project_deleted(self, project_id: int):
+        """Remove a loaded project."""
+        row = self._row_by_id.get(project_id)
+        if row is not None:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._rows[row]
+            del self._row_by_id[project_id]
+            self._pinned.discard(project_id)
+            self._update_row_index(row)
+            self.endRemoveRows()
+
+    def _reset(self, text: str):
+        """Forget all loaded rows and load the first batch matching `text`."""
+        self.beginResetModel()
+        self._rows = []
+        self._row_by_id = {}
+        self._pinned = set()
+        self._last_id = 0
+        self._search_offset = 0
+        self._all_fetched = False
+        self._filter = text
+        self.endResetModel()
+        self.fetchMore(QModelIndex())
+
+    def _update_row_index(self, first: int):
+        """Update the row numbers from row `first` on."""
+        for row in range(first, len(self._rows)):
+            self._row_by_id[self._rows[row][0]] = row
+
+    def _matches(self, project_id: int):
+        return not self._filter or ProjectManagement.matches_search(project_id, self._filter, self.conn)
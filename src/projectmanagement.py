@@ -1,68 +1,131 @@
-import random
+import re
 import sqlite3
-from PyQt6.QtCore import QDate
+from PyQt6.QtCore import QDate, QDateTime
 from src.constants import DB_FILE
+from src.database import connect, migrate
 
 
 class ProjectManagement:
-    def __init__(self, connection=None):
-        self.conn = connection or sqlite3.connect(DB_FILE)
+    """
+    The currently loaded project and all queries on the projects table.
+
+    Changes to the project fields are tracked per field, update_data_in_sql
+    only writes the fields that actually changed since the last load or save.
+    An optional ProjectRepository is kept up to date on every write.
+    With an optional DatabaseWriter, updates and deletes are queued to its
+    background thread instead of being executed on the calling (GUI) thread.
+    Loading a project never waits for the writer: queued updates are laid over
+    the (older) row read from the database.
+    """
+    # project attributes that are stored in the column of the same name
+    FIELDS = ("name", "description", "type", "time_tracked", "start_date", "end_date", "status")
+    INSERT_TIME_ENTRY_SQL = '''
+        INSERT INTO time_entries (project_id, minutes, recorded_at) VALUES (?, ?, ?)
+    '''
+    # projects with these statuses are moved to the archive by archive_projects()
+    ARCHIVE_STATUSES = ("completed", "archived")
+    # move projects to the archive table together with a summary of their time,
+    # the delete only removes rows that arrived in the archive (their time is kept)
+    ARCHIVE_SQL = '''
+        INSERT INTO projects_archive (id, name, description, type, time_tracked, start_date, end_date, status,
+                                      first_day, last_day, active_days)
+        SELECT id, name, description, type, time_tracked, start_date, end_date, status,
+               (SELECT MIN(day) FROM time_rollup_daily WHERE project_id = projects.id),
+               (SELECT MAX(day) FROM time_rollup_daily WHERE project_id = projects.id),
+               (SELECT COUNT(*) FROM time_rollup_daily WHERE project_id = projects.id)
+        FROM projects WHERE {condition}
+    '''
+    DELETE_ARCHIVED_SQL = '''
+        DELETE FROM projects WHERE {condition} AND id IN (SELECT id FROM projects_archive)
+    '''
+
+    def __init__(self, connection=None, repository=None, writer=None):
+        self._dirty_fields = set()
+        self._pending_entries = []  # (minutes, recorded_at) not yet written to time_entries
+        self._queued_fields = {}  # project id -> (writer ticket, {field: value}) of updates not yet committed
+        self.repository = repository
+        self.writer = writer
+        self.conn = connection or connect(DB_FILE)
         self.cursor = self.conn.cursor()
-        try:
-            project_names = ProjectManagement.get_projects_name_list(self.conn)
-            if project_names:   # If there are projects in the database
-                self.id = ProjectManagement.get_id_by_name(project_names[0], self.conn)
-                self.load_data_from_sql()
-            else:   # If there are no projects in the database
-                self.add_project()
-        except sqlite3.OperationalError as e:   # Handle the case where the table does not exist
-            if "no such table" in str(e).lower():
-                self.add_project()
-            else:   # Raise the error if it is not related to the table not existing
-                raise
+        migrate(self.conn)  # create or upgrade the database schema
+        first_id = ProjectManagement.get_first_id(self.conn)  # one index lookup, not a scan of all projects
+        if first_id is not None:   # If there are projects in the database
+            self.id = first_id
+            self.load_data_from_sql()
+        else:   # If there are no projects in the database
+            self.add_project()
     
-    def add_time(self, minutes: int):
+    def __setattr__(self, name, value):
+        # mark a field as changed if it gets a different value
+        if name in ProjectManagement.FIELDS and getattr(self, name, None) != value:
+            self._dirty_fields.add(name)
+        super().__setattr__(name, value)
+
+    def has_changes(self):
+        """Return True if a field changed since the project was loaded or saved."""
+        return bool(self._dirty_fields or self._pending_entries)
+
+    def add_time(self, minutes: int, recorded_at=None):
+        """Add tracked minutes, they are stored as a time entry with the next save."""
+        if minutes == 0:
+            return
         self.time_tracked += minutes
+        self._pending_entries.append((minutes, recorded_at or ProjectManagement.get_timestamp()))
     
     def get_time(self):
         return self.time_tracked
 
     def save_data_to_sql(self):
-        """Create the current project data in the database."""
-        # Create table if it does not exist
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS projects (
-                id INTEGER PRIMARY KEY,
-                name TEXT,
-                description TEXT,
-                type TEXT,
-                time_tracked INTEGER,
-                start_date TEXT,
-                end_date TEXT,
-                status TEXT
-            )
-        ''')
-        # Insert the project data
+        """
+        Create the current project data in the database.
+        If the project has no ID yet, the database assigns one.
+        """
         self.cursor.execute('''
             INSERT INTO projects (id, name, description, type, time_tracked, start_date, end_date, status)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         ''', (self.id, self.name, self.description, self.type, self.time_tracked,
               self.start_date.toString("yyyy-MM-dd"), self.end_date.toString("yyyy-MM-dd"), self.status))
+        self.id = self.cursor.lastrowid
+        for sql, parameters in self._take_time_entry_statements():
+            self.cursor.execute(sql, parameters)
         self.conn.commit()
+        self._dirty_fields.clear()
+        self._update_repository()
     
     def update_data_in_sql(self):
-        """Update the current project data in the database."""
-        self.cursor.execute('''
-            UPDATE projects
-            SET name = ?, description = ?, type = ?, time_tracked = ?,
-                start_date = ?, end_date = ?, status = ?
-            WHERE id = ?
-        ''', (self.name, self.description, self.type, self.time_tracked,
-              self.start_date.toString("yyyy-MM-dd"), self.end_date.toString("yyyy-MM-dd"), self.status, self.id))
-        self.conn.commit()
+        """
+        Write the changed fields of the current project to the database in one statement,
+        followed by the time entries added since the last save.
+        Does nothing (no statement, no commit) if nothing changed.
+        Returns True if data was written.
+        """
+        if not self.has_changes():
+            return False
+        statements = []
+        if self._dirty_fields:
+            fields = [field for field in ProjectManagement.FIELDS if field in self._dirty_fields]
+            values = [self._get_sql_value(field) for field in fields]
+            # column names come from FIELDS only, values are passed as parameters
+            statements.append((f'''
+                UPDATE projects
+                SET {", ".join(f"{field} = ?" for field in fields)}
+                WHERE id = ?
+            ''', (*values, self.id)))
+        statements.extend(self._take_time_entry_statements())
+        self._write(statements)
+        if self.writer is not None and self._dirty_fields:
+            _, fields = self._queued_fields.get(self.id, (0, {}))
+            fields.update((field, getattr(self, field)) for field in self._dirty_fields)
+            self._queued_fields[self.id] = (self.writer.last_ticket, fields)
+        self._dirty_fields.clear()
+        self._update_repository()
+        return True
     
     def load_data_from_sql(self):
-        """Load the current project data from the database."""
+        """
+        Load the current project data from the database. Updates still queued in the writer
+        are taken from memory instead (waiting for the writer would block the GUI).
+        """
         self.cursor.execute('''
             SELECT name, description, type, time_tracked, start_date, end_date, status
             FROM projects
@@ -73,13 +136,59 @@ class ProjectManagement:
             self.name, self.description, self.type, self.time_tracked, start_date, end_date, self.status = row
             self.start_date = QDate.fromString(start_date, "yyyy-MM-dd")
             self.end_date = QDate.fromString(end_date, "yyyy-MM-dd")
+            self._apply_queued_writes()
+            self._dirty_fields.clear()
+            self._pending_entries.clear()
         else:
             raise ValueError(f"No project found with ID {self.id}")
+
+    def _apply_queued_writes(self):
+        """Lay the writes of this project that the writer hasn't committed yet over the loaded row."""
+        if self.writer is None or not self.writer.has_pending():
+            self._queued_fields.clear()  # everything is committed, the row is up to date
+            return
+        ticket, fields = self._queued_fields.get(self.id, (0, {}))
+        if ticket > self.writer.committed_ticket:
+            for field, value in fields.items():
+                setattr(self, field, value)
+        if self.repository is not None:
+            summary = self.repository.get_summary(self.id)  # includes time added by background timers
+            if summary is not None:
+                self.name, self.time_tracked = summary
+
+    def _write(self, statements):
+        """Execute (sql, parameters) writes on the writer thread if there is one, else directly."""
+        if self.writer is not None:
+            for sql, parameters in statements:
+                self.writer.execute(sql, parameters)
+        else:
+            for sql, parameters in statements:
+                self.cursor.execute(sql, parameters)
+            self.conn.commit()
+
+    def _take_time_entry_statements(self):
+        """Return the inserts of the pending time entries and forget them."""
+        statements = [(ProjectManagement.INSERT_TIME_ENTRY_SQL, (self.id, minutes, recorded_at))
+                      for minutes, recorded_at in self._pending_entries]
+        self._pending_entries.clear()
+        return statements
+
+    def _update_repository(self):
+        if self.repository is not None:
+            self.repository.project_saved(self.id, self.name, self.time_tracked)
+
+    def _get_sql_value(self, field: str):
+        """Return the value of a field as it is stored in the database."""
+        value = getattr(self, field)
+        if isinstance(value, QDate):
+            return value.toString("yyyy-MM-dd")
+        return value
     
     def add_project(self):
         """Add a new project to the database."""
-        self.id = random.randint(1000, 9999)
-        self.name = ""
+        self.id = None  # assigned by the database
+        self._pending_entries.clear()
+        self.name = ProjectManagement.get_unique_name("New Project", self.conn)
         self.description = ""
         self.type = ""
         self.time_tracked = 0
@@ -90,15 +199,100 @@ class ProjectManagement:
         print("New project added successfully!")
 
     def delete_project(self):
-        """Delete a project from the database by its name."""
-        self.cursor.execute('''
-            DELETE FROM projects WHERE name = ?
-        ''', (self.name,))
-        if self.cursor.rowcount > 0:
-            print(f"Project '{self.name}' deleted successfully!")
+        """Delete the current project from the database by its ID."""
+        if self.writer is not None:
+            self.writer.execute('''
+                DELETE FROM projects WHERE id = ?
+            ''', (self.id,))
         else:
-            print(f"No project found with the name '{self.name}'.")
+            self.cursor.execute('''
+                DELETE FROM projects WHERE id = ?
+            ''', (self.id,))
+            if self.cursor.rowcount > 0:
+                print(f"Project '{self.name}' deleted successfully!")
+            else:
+                print(f"No project found with the ID {self.id}.")
+            self.conn.commit()
+        if self.repository is not None:
+            self.repository.project_deleted(self.id)
     
+    def archive_project(self):
+        """
+        Move the current project (with all unsaved changes) to the archive table.
+        Its time history is kept, restore_project() brings it back.
+        """
+        self.status = "archived"
+        self.update_data_in_sql()
+        condition = "id = ?"
+        self._write([(ProjectManagement.ARCHIVE_SQL.format(condition=condition), (self.id,)),
+                     (ProjectManagement.DELETE_ARCHIVED_SQL.format(condition=condition), (self.id,))])
+        print(f"Project '{self.name}' archived!")  # Debug message
+        if self.repository is not None:
+            self.repository.project_deleted(self.id)
+
+    @staticmethod
+    def archive_projects(connection: sqlite3.Connection, statuses=ARCHIVE_STATUSES):
+        """
+        Move all projects with one of the given statuses to the archive table in one transaction.
+        Returns the number of archived projects.
+
+        Example:
+            ProjectManagement.archive_projects(connection, ("completed",))
+        """
+        placeholders = ", ".join("?" for _ in statuses)
+        condition = f"status IN ({placeholders})"
+        connection.commit()  # the move must not be mixed with pending changes
+        try:
+            cursor = connection.execute(ProjectManagement.ARCHIVE_SQL.format(condition=condition), tuple(statuses))
+            count = cursor.rowcount
+            connection.execute(ProjectManagement.DELETE_ARCHIVED_SQL.format(condition=condition), tuple(statuses))
+            connection.commit()
+        except sqlite3.Error:
+            connection.rollback()
+            raise
+        return count
+
+    @staticmethod
+    def restore_project(project_id: int, connection: sqlite3.Connection):
+        """
+        Move an archived project back to the projects table (status "active"), with its time history.
+        A project with the same name may have been created meanwhile, the restored one gets a unique name.
+        Returns False if there is no archived project with the ID.
+        """
+        cursor = connection.cursor()
+        cursor.execute("SELECT name FROM projects_archive WHERE id = ?", (project_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return False
+        connection.commit()
+        try:
+            cursor.execute('''
+                INSERT INTO projects (id, name, description, type, time_tracked, start_date, end_date, status)
+                SELECT id, ?, description, type, time_tracked, start_date, end_date, 'active'
+                FROM projects_archive WHERE id = ?
+            ''', (ProjectManagement.get_unique_name(row[0], connection), project_id))
+            cursor.execute('''
+                DELETE FROM projects_archive WHERE id = ? AND id IN (SELECT id FROM projects)
+            ''', (project_id,))
+            connection.commit()
+        except sqlite3.Error:
+            connection.rollback()
+            raise
+        return True
+
+    @staticmethod
+    def get_archived_projects(connection: sqlite3.Connection):
+        """
+        Return the summaries of all archived projects, the most recently archived first:
+        a list of (id, name, type, time_tracked, first_day, last_day, active_days, archived_at) tuples.
+        """
+        cursor = connection.cursor()
+        cursor.execute('''
+            SELECT id, name, type, time_tracked, first_day, last_day, active_days, archived_at
+            FROM projects_archive ORDER BY archived_at DESC, id DESC
+        ''')
+        return cursor.fetchall()
+
     @staticmethod
     def get_projects_name_list(connection: sqlite3.Connection):
         """Retrieve all project names from the database and return a list of names."""
@@ -109,6 +303,11 @@ class ProjectManagement:
         names = [row[0] for row in cursor.fetchall()]
         return names
     
+    @staticmethod
+    def get_first_id(connection: sqlite3.Connection):
+        """Return the lowest project ID or None if there are no projects."""
+        return connection.execute("SELECT MIN(id) FROM projects").fetchone()[0]
+
     @staticmethod
     def get_id_by_name(name_to_check: str, connection: sqlite3.Connection):
         """Check if a project name exists and return its ID if found."""
@@ -119,6 +318,50 @@ class ProjectManagement:
         row = cursor.fetchone()
         return row[0] if row else None
 
+    @staticmethod
+    def is_name_available(name: str, connection: sqlite3.Connection, project_id=None):
+        """Return True if no project other than `project_id` uses the name (names are unique)."""
+        found_id = ProjectManagement.get_id_by_name(name, connection)
+        return found_id is None or found_id == project_id
+
+    @staticmethod
+    def get_unique_name(base_name: str, connection: sqlite3.Connection):
+        """Return `base_name` or, if it is taken, the first free "base_name 2", "base_name 3", ..."""
+        name = base_name
+        number = 1
+        while ProjectManagement.get_id_by_name(name, connection) is not None:
+            number += 1
+            name = f"{base_name} {number}"
+        return name
+
+    @staticmethod
+    def get_name_by_id(project_id: int, connection: sqlite3.Connection):
+        """Return the name of the project with the given ID or None if it does not exist."""
+        cursor = connection.cursor()
+        cursor.execute('''
+            SELECT name FROM projects WHERE id = ?
+        ''', (project_id,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def add_time_to_project(project_id: int, minutes: int, connection: sqlite3.Connection,
+                            repository=None, writer=None):
+        """Add tracked minutes to a project that is not loaded (e.g. from a background timer)."""
+        statements = [('''
+            UPDATE projects SET time_tracked = time_tracked + ? WHERE id = ?
+        ''', (minutes, project_id)),
+            (ProjectManagement.INSERT_TIME_ENTRY_SQL, (project_id, minutes, ProjectManagement.get_timestamp()))]
+        if writer is not None:
+            for sql, parameters in statements:
+                writer.execute(sql, parameters)
+        else:
+            for sql, parameters in statements:
+                connection.execute(sql, parameters)
+            connection.commit()
+        if repository is not None:
+            repository.project_time_added(project_id, minutes)
+
     @staticmethod
     def get_projects_time_tracked_list(connection: sqlite3.Connection):
         """Retrieve all project time_tracked from the database and return a list."""
@@ -127,4 +370,106 @@ class ProjectManagement:
             SELECT time_tracked FROM projects
         ''')
         time_tracked_list = [row[0] for row in cursor.fetchall()]
-        return time_tracked_list
\ No newline at end of file
+        return time_tracked_list
+
+    @staticmethod
+    def get_search_query(text: str):
+        """
+        Turn user input into an FTS5 query: every word is a prefix, all words must match.
+        Returns None if the text contains no words.
+        """
+        words = re.findall(r"[^\W_]+", text)
+        if not words:
+            return None
+        return " ".join(f'"{word}"*' for word in words)
+
+    @staticmethod
+    def search_projects(text: str, connection: sqlite3.Connection, limit=50, offset=0):
+        """
+        Full-text search over name, description and type of all projects.
+        Returns a list of (id, name) tuples, best matches (bm25, a name match counts most) first.
+        """
+        query = ProjectManagement.get_search_query(text)
+        if query is None:
+            return []
+        cursor = connection.cursor()
+        cursor.execute('''
+            SELECT projects.id, projects.name
+            FROM projects_fts JOIN projects ON projects.id = projects_fts.rowid
+            WHERE projects_fts MATCH ?
+            ORDER BY bm25(projects_fts, 10.0, 1.0, 3.0), projects.id
+            LIMIT ? OFFSET ?
+        ''', (query, limit, offset))
+        return cursor.fetchall()
+
+    @staticmethod
+    def matches_search(project_id: int, text: str, connection: sqlite3.Connection):
+        """Return True if the project is a result of search_projects(text)."""
+        query = ProjectManagement.get_search_query(text)
+        if query is None:
+            return False
+        cursor = connection.cursor()
+        cursor.execute('''
+            SELECT 1 FROM projects_fts WHERE projects_fts MATCH ? AND rowid = ?
+        ''', (query, project_id))
+        return cursor.fetchone() is not None
+
+    @staticmethod
+    def get_timestamp():
+        """Return the current local time as stored in time_entries.recorded_at."""
+        return QDateTime.currentDateTime().toString("yyyy-MM-dd HH:mm:ss")
+
+    @staticmethod
+    def get_time_in_range(start_date: QDate, end_date: QDate, connection: sqlite3.Connection, project_id=None):
+        """
+        Return the minutes tracked from start_date to end_date (both included)
+        for one project or, if project_id is None, for all projects.
+        Full weeks are summed from the weekly rollup, the days before and after them
+        from the daily rollup, so even ranges over years read only a few rows.
+        """
+        first_week = start_date.addDays((8 - start_date.dayOfWeek()) % 7)  # first monday >= start_date
+        day_after = end_date.addDays(1)
+        after_weeks = day_after.addDays(1 - day_after.dayOfWeek())  # monday after the last full week
+        project_filter = "" if project_id is None else "AND project_id = ?"
+        project_parameter = () if project_id is None else (project_id,)
+        cursor = connection.cursor()
+        if first_week < after_weeks:
+            cursor.execute(f'''
+                SELECT
+                    (SELECT COALESCE(SUM(minutes), 0) FROM time_rollup_weekly
+                     WHERE week >= ? AND week < ? {project_filter})
+                  + (SELECT COALESCE(SUM(minutes), 0) FROM time_rollup_daily
+                     WHERE ((day >= ? AND day < ?) OR (day >= ? AND day <= ?)) {project_filter})
+            ''', (first_week.toString("yyyy-MM-dd"), after_weeks.toString("yyyy-MM-dd"), *project_parameter,
+                  start_date.toString("yyyy-MM-dd"), first_week.toString("yyyy-MM-dd"),
+                  after_weeks.toString("yyyy-MM-dd"), end_date.toString("yyyy-MM-dd"), *project_parameter))
+        else:  # less than a full week
+            cursor.execute(f'''
+                SELECT COALESCE(SUM(minutes), 0) FROM time_rollup_daily
+                WHERE day >= ? AND day <= ? {project_filter}
+            ''', (start_date.toString("yyyy-MM-dd"), end_date.toString("yyyy-MM-dd"), *project_parameter))
+        return cursor.fetchone()[0]
+
+    @staticmethod
+    def get_time_per_day(start_date: QDate, end_date: QDate, connection: sqlite3.Connection, project_id=None):
+        """Return a list of (day, minutes) from the daily rollup, days without time are left out."""
+        return ProjectManagement._get_rollup("time_rollup_daily", "day", start_date, end_date, connection, project_id)
+
+    @staticmethod
+    def get_time_per_week(start_date: QDate, end_date: QDate, connection: sqlite3.Connection, project_id=None):
+        """Return a list of (monday of the week, minutes) for the weeks that start in the range."""
+        return ProjectManagement._get_rollup("time_rollup_weekly", "week", start_date, end_date, connection, project_id)
+
+    @staticmethod
+    def _get_rollup(table: str, column: str, start_date: QDate, end_date: QDate,
+                    connection: sqlite3.Connection, project_id=None):
+        project_filter = "" if project_id is None else "AND project_id = ?"
+        cursor = connection.cursor()
+        # table and column names are fixed by the callers, values are passed as parameters
+        cursor.execute(f'''
+            SELECT {column}, SUM(minutes) FROM {table}
+            WHERE {column} >= ? AND {column} <= ? {project_filter}
+            GROUP BY {column} ORDER BY {column}
+        ''', (start_date.toString("yyyy-MM-dd"), end_date.toString("yyyy-MM-dd"),
+              *(() if project_id is None else (project_id,))))
+        return cursor.fetchall()
@@ -0,0 +1,109 @@
+import sqlite3
+
+
+class ProjectRepository:
+    """
+    In-memory cache of the summaries (name, time tracked) of all projects.
+
+    The summaries are loaded with one query on first use. Writes of ProjectManagement
+    update the cache in place. Changes by other connections or processes are detected
+    with PRAGMA data_version, unreported changes on the own connection with total_changes.
+    Both checks are O(1), so the periodic GUI update only reloads if something changed.
+    Commits of the own DatabaseWriter are no external changes: while writes are queued
+    the check is skipped, writes_committed() then takes over the new version.
+
+    Parameters:
+        connection (sqlite3.Connection): Connection to the projects database.
+        writer (DatabaseWriter, optional): Writer thread the project updates are sent to.
+
+    Example:
+        repository = ProjectRepository(connection)
+        repository.refresh_if_changed()
+        pie_chart.update_data(repository.get_projects_name_list(),
+                              repository.get_projects_time_tracked_list())
+    """
+    def __init__(self, connection: sqlite3.Connection, writer=None):
+        self.conn = connection
+        self.writer = writer
+        self._summaries = None  # {id: (name, time_tracked)} in id order, None until loaded
+        self._version = None
+        self._acknowledged_ticket = 0  # last writer ticket whose commit is part of _version
+
+    def refresh(self):
+        """Reload all project summaries with a single query."""
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT id, name, time_tracked FROM projects ORDER BY id
+        ''')
+        self._summaries = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+        self._version = self._get_version()
+
+    def refresh_if_changed(self):
+        """Reload the summaries if the database was changed behind the cache's back."""
+        if self._summaries is None:
+            self.refresh()
+            return True
+        if self.writer is not None and self.writer.last_ticket > self._acknowledged_ticket:
+            return False  # the cache already contains the queued writes
+        if self._get_version() != self._version:
+            self.refresh()
+            return True
+        return False
+
+    def writes_committed(self, ticket: int):
+        """Is called when the writer committed up to `ticket`, the cache already contains these writes."""
+        self._acknowledged_ticket = ticket
+        if self._summaries is not None:
+            self._version = self._get_version()
+
+    def get_summaries(self):
+        """Return a list of (id, name, time_tracked) tuples of all projects."""
+        self._ensure_loaded()
+        return [(project_id, name, time_tracked) for project_id, (name, time_tracked) in self._summaries.items()]
+
+    def get_summary(self, project_id: int):
+        """Return (name, time_tracked) of a project from the cache, None if it isn't cached (no query)."""
+        if self._summaries is None:
+            return None
+        return self._summaries.get(project_id)
+
+    def get_projects_name_list(self):
+        """Return the names of all projects."""
+        self._ensure_loaded()
+        return [name for name, _ in self._summaries.values()]
+
+    def get_projects_time_tracked_list(self):
+        """Return the tracked time of all projects (same order as get_projects_name_list)."""
+        self._ensure_loaded()
+        return [time_tracked for _, time_tracked in self._summaries.values()]
+
+    def project_saved(self, project_id: int, name: str, time_tracked: int):
+        """Update the cache after a project was inserted or updated on this connection."""
+        if self._summaries is not None:
+            self._summaries[project_id] = (name, time_tracked)
+            self._version = self._get_version()
+
+    def project_time_added(self, project_id: int, minutes: int):
+        """Update the cache after time was added to a project on this connection."""
+        if self._summaries is not None and project_id in self._summaries:
+            name, time_tracked = self._summaries[project_id]
+            self._summaries[project_id] = (name, time_tracked + minutes)
+            self._version = self._get_version()
+
+    def project_deleted(self, project_id: int):
+        """Update the cache after a project was deleted on this connection."""
+        if self._summaries is not None:
+            self._summaries.pop(project_id, None)
+            self._version = self._get_version()
+
+    def _ensure_loaded(self):
+        if self._summaries is None:
+            self.refresh()
+
+    def _get_version(self):
+        """
+        data_version changes with commits of other connections,
+        total_changes with every change made on this connection.
+        """
+        data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        return data_version, self.conn.total_changes
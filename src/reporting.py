@@ -0,0 +1,206 @@
+import csv
+import datetime
+import sqlite3
+
+# Statistics over the tracked time, computed in SQLite from the daily rollup (time_rollup_daily).
+# Only the aggregated result rows are returned, so reports over years of history stay cheap.
+# Archived projects are included (view projects_all).
+# Dates are ISO strings ("yyyy-MM-dd"), a missing start or end date leaves the range open.
+
+FIRST_DAY = "0000-01-01"
+LAST_DAY = "9999-12-31"
+WEEKDAY_NAMES = ("Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday")  # strftime('%w')
+
+# columns of the rows returned by the report functions, used as header of the CLI output
+REPORT_COLUMNS = {
+    "summary": ("minutes", "active_days", "days", "average_per_day", "average_per_active_day"),
+    "projects": ("id", "name", "type", "minutes", "active_days", "average_per_active_day", "share", "rank"),
+    "types": ("type", "projects", "minutes", "average_per_project", "share"),
+    "weekdays": ("weekday", "minutes", "active_days", "average_per_active_day", "share"),
+    "streaks": ("first_day", "last_day", "days"),
+}
+OUTPUT_FORMATS = ("text", "csv")
+
+
+def _range_parameters(start_date=None, end_date=None):
+    return start_date or FIRST_DAY, end_date or LAST_DAY
+
+
+def _project_filter(project_id=None):
+    """Return the SQL condition and its parameters to restrict a query to one project (or all)."""
+    if project_id is None:
+        return "", ()
+    return "AND project_id = ?", (project_id,)
+
+
+def get_summary(connection: sqlite3.Connection, start_date=None, end_date=None, project_id=None):
+    """
+    Return the totals of a date range (both days included) for one project or all projects:
+    (minutes, active days, days, average minutes per day, average minutes per active day).
+    The number of days is counted from the first to the last active day if the range is open.
+    """
+    project_filter, project_parameter = _project_filter(project_id)
+    cursor = connection.cursor()
+    cursor.execute(f'''
+        WITH per_day AS (
+            SELECT day, SUM(minutes) AS minutes FROM time_rollup_daily
+            WHERE day BETWEEN ? AND ? {project_filter}
+            GROUP BY day
+        )
+        SELECT COALESCE(SUM(minutes), 0), COUNT(*), ROUND(AVG(minutes), 1),
+               (SELECT CAST(julianday(COALESCE(?, MAX(day))) - julianday(COALESCE(?, MIN(day))) + 1 AS INTEGER)
+                FROM per_day)
+        FROM per_day
+    ''', (*_range_parameters(start_date, end_date), *project_parameter, end_date, start_date))
+    minutes, active_days, average_per_active_day, days = cursor.fetchone()
+    days = days or 0
+    average_per_day = round(minutes / days, 1) if days > 0 else 0.0
+    return minutes, active_days, days, average_per_day, average_per_active_day or 0.0
+
+
+def get_project_report(connection: sqlite3.Connection, start_date=None, end_date=None, limit=None):
+    """
+    Return one row per project with time in the range, the most tracked first:
+    (id, name, type, minutes, active days, average minutes per active day, share of all minutes in %, rank).
+    """
+    cursor = connection.cursor()
+    cursor.execute('''
+        WITH per_project AS (
+            SELECT project_id, SUM(minutes) AS minutes, COUNT(*) AS active_days, AVG(minutes) AS average
+            FROM time_rollup_daily
+            WHERE day BETWEEN ? AND ?
+            GROUP BY project_id
+        )
+        SELECT projects.id, projects.name, projects.type, per_project.minutes, per_project.active_days,
+               ROUND(per_project.average, 1),
+               ROUND(100.0 * per_project.minutes / NULLIF(SUM(per_project.minutes) OVER (), 0), 1),
+               RANK() OVER (ORDER BY per_project.minutes DESC)
+        FROM per_project JOIN projects_all AS projects ON projects.id = per_project.project_id
+        ORDER BY per_project.minutes DESC, projects.id
+        LIMIT ?
+    ''', (*_range_parameters(start_date, end_date), -1 if limit is None else limit))
+    return cursor.fetchall()
+
+
+def get_type_report(connection: sqlite3.Connection, start_date=None, end_date=None):
+    """
+    Return one row per project type (category) with time in the range, the most tracked first:
+    (type, number of projects, minutes, average minutes per project, share of all minutes in %).
+    """
+    cursor = connection.cursor()
+    cursor.execute('''
+        WITH per_project AS (
+            SELECT project_id, SUM(minutes) AS minutes FROM time_rollup_daily
+            WHERE day BETWEEN ? AND ?
+            GROUP BY project_id
+        )
+        SELECT COALESCE(NULLIF(TRIM(projects.type), ''), '(none)') AS project_type, COUNT(*),
+               SUM(per_project.minutes), ROUND(AVG(per_project.minutes), 1),
+               ROUND(100.0 * SUM(per_project.minutes) / NULLIF(SUM(SUM(per_project.minutes)) OVER (), 0), 1)
+        FROM per_project JOIN projects_all AS projects ON projects.id = per_project.project_id
+        GROUP BY project_type
+        ORDER BY SUM(per_project.minutes) DESC, project_type
+    ''', _range_parameters(start_date, end_date))
+    return cursor.fetchall()
+
+
+def get_weekday_distribution(connection: sqlite3.Connection, start_date=None, end_date=None, project_id=None):
+    """
+    Return the tracked time per weekday, Monday first, weekdays without time included:
+    (weekday name, minutes, active days, average minutes per active day, share of all minutes in %).
+    """
+    project_filter, project_parameter = _project_filter(project_id)
+    cursor = connection.cursor()
+    cursor.execute(f'''
+        WITH RECURSIVE weekdays (weekday) AS (
+            SELECT 0 UNION ALL SELECT weekday + 1 FROM weekdays WHERE weekday < 6
+        ),
+        per_day AS (
+            SELECT day, SUM(minutes) AS minutes FROM time_rollup_daily
+            WHERE day BETWEEN ? AND ? {project_filter}
+            GROUP BY day
+        ),
+        per_weekday AS (
+            SELECT CAST(strftime('%w', day) AS INTEGER) AS weekday, SUM(minutes) AS minutes,
+                   COUNT(*) AS active_days, AVG(minutes) AS average
+            FROM per_day
+            GROUP BY weekday
+        )
+        SELECT weekdays.weekday, COALESCE(per_weekday.minutes, 0), COALESCE(per_weekday.active_days, 0),
+               COALESCE(ROUND(per_weekday.average, 1), 0.0),
+               COALESCE(ROUND(100.0 * per_weekday.minutes / NULLIF(SUM(per_weekday.minutes) OVER (), 0), 1), 0.0)
+        FROM weekdays LEFT JOIN per_weekday ON per_weekday.weekday = weekdays.weekday
+        ORDER BY (weekdays.weekday + 6) % 7
+    ''', (*_range_parameters(start_date, end_date), *project_parameter))
+    return [(WEEKDAY_NAMES[row[0]], *row[1:]) for row in cursor.fetchall()]
+
+
+def get_streaks(connection: sqlite3.Connection, start_date=None, end_date=None, project_id=None, limit=None):
+    """
+    Return the streaks (runs of consecutive days with tracked time), the longest first:
+    (first day, last day, number of days).
+
+    The days are grouped with the gaps-and-islands pattern: within a run of consecutive days
+    the day number minus the row number is constant, so it identifies the run.
+    """
+    project_filter, project_parameter = _project_filter(project_id)
+    cursor = connection.cursor()
+    cursor.execute(f'''
+        WITH active_days AS (
+            SELECT day FROM time_rollup_daily
+            WHERE day BETWEEN ? AND ? {project_filter}
+            GROUP BY day HAVING SUM(minutes) > 0
+        ),
+        islands AS (
+            SELECT day, julianday(day) - ROW_NUMBER() OVER (ORDER BY day) AS island FROM active_days
+        )
+        SELECT MIN(day), MAX(day), COUNT(*) FROM islands
+        GROUP BY island
+        ORDER BY COUNT(*) DESC, MIN(day) DESC
+        LIMIT ?
+    ''', (*_range_parameters(start_date, end_date), *project_parameter, -1 if limit is None else limit))
+    return cursor.fetchall()
+
+
+def get_current_streak(connection: sqlite3.Connection, today=None, project_id=None):
+    """
+    Return the number of consecutive days with tracked time up to today.
+    A streak that ended yesterday still counts, today may not be over yet.
+
+    Example:
+        days = get_current_streak(connection, project_id=project.id)
+    """
+    today = today or datetime.date.today().isoformat()
+    project_filter, project_parameter = _project_filter(project_id)
+    cursor = connection.cursor()
+    cursor.execute(f'''
+        WITH active_days AS (
+            SELECT day FROM time_rollup_daily
+            WHERE day <= ? {project_filter}
+            GROUP BY day HAVING SUM(minutes) > 0
+        ),
+        islands AS (
+            SELECT day, julianday(day) - ROW_NUMBER() OVER (ORDER BY day) AS island FROM active_days
+        )
+        SELECT COUNT(*) FROM islands
+        GROUP BY island
+        HAVING MAX(day) >= date(?, '-1 day')
+    ''', (today, *project_parameter, today))
+    row = cursor.fetchone()
+    return row[0] if row else 0
+
+
+def write_report(columns, rows, file, output_format="text"):
+    """Write report rows to an open text file, as aligned text columns or as csv."""
+    if output_format == "csv":
+        writer = csv.writer(file)
+        writer.writerow(columns)
+        writer.writerows(rows)
+    elif output_format == "text":
+        cells = [[str(column) for column in columns]] + [["" if value is None else str(value) for value in row]
+                                                         for row in rows]
+        widths = [max(len(row[i]) for row in cells) for i in range(len(columns))]
+        for row in cells:
+            file.write("  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() + "\n")
+    else:
+        raise ValueError(f"Unknown output format '{output_format}', use one of {OUTPUT_FORMATS}")
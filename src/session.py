@@ -1,20 +1,31 @@
-import json
 import os
 import re
 import sqlite3
 import subprocess
 from PyQt6.QtWidgets import QMainWindow, QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QWidget, \
     QLineEdit, QPlainTextEdit, QComboBox, QDateEdit
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt, QTimer, QDate
 from PyQt6.QtGui import QPixmap, QPainter, QColor, QPaintEvent, QBrush
 from PyQt6.QtCharts import QChart, QChartView, QPieSeries
 from src.timemanagement import TimeManagement
+from src.timerscheduler import TimerScheduler
 from src.pointssystem import PointsSystem
 from src.projectmanagement import ProjectManagement
+from src.projectrepository import ProjectRepository
+from src.projectlistmodel import ProjectListModel
+from src.dbwriter import DatabaseWriter
+from src import reporting
+from src.persistence import TimerCheckpoint, JsonStore
+from src.notes import ProjectNotes
+from src.binding import FormBinding
+from src.style import STYLESHEET, set_invalid
+from src.database import connect
+from src.ipc import IpcServer, get_server_name
+from src.profiling import Profiler, profiled
+from src.profiles import Profile, get_profile, list_profiles, create_profile, set_active_profile
 # from main_vg import main
-from src.constants import WIDTH, HEIGHT, \
-    COLOR_BEIGE_HEX, COLOR_OCEANBAY_HEX, COLOR_OCEANBAY_RGB, COLOR_ROSE_RGB, COLOR_ROSE_HEX, COLOR_RED_HEX, \
-    IMGDIR_GUI_FLOWER_MEADOW, COLOR_SOFTCORAL_HEX, JSON_FILE
+from src.constants import WIDTH, HEIGHT, COLOR_BEIGE_HEX, COLOR_OCEANBAY_RGB, COLOR_ROSE_RGB, \
+    IMGDIR_GUI_FLOWER_MEADOW, PIE_CHART_TOP_N, DEFAULT_PROFILE
 
 
 class CircleWithNumber(QWidget):
@@ -46,9 +57,27 @@ class CircleWithNumber(QWidget):
         self.color_circle = color_circle
         self.color_number = color_number
         self.setFixedSize(w, h)
+        # the rendered circle, only drawn again if one of the values in the key changes
+        self._pixmap = None
+        self._pixmap_key = None
 
     def paintEvent(self, event: QPaintEvent):   # type: ignore
         painter = QPainter(self)
+        painter.drawPixmap(0, 0, self.get_pixmap())
+
+    def get_pixmap(self):
+        """Return the circle as pixmap, rendered again only if number, size, colors or screen changed."""
+        key = (self.number, self.w, self.h, self.color_circle, self.color_number, self.devicePixelRatioF())
+        if key != self._pixmap_key:
+            self._pixmap = self._render_pixmap(key[-1])
+            self._pixmap_key = key
+        return self._pixmap
+
+    def _render_pixmap(self, device_pixel_ratio: float):
+        pixmap = QPixmap(round(self.w * device_pixel_ratio), round(self.h * device_pixel_ratio))
+        pixmap.setDevicePixelRatio(device_pixel_ratio)  # sharp on high dpi screens
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
         # Draw circle
@@ -64,9 +93,13 @@ class CircleWithNumber(QWidget):
         font.setBold(True)
         font.setPointSize(14)
         painter.setFont(font)
-        painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, str(self.number))
+        painter.drawText(0, 0, self.w, self.h, Qt.AlignmentFlag.AlignCenter, str(self.number))
+        painter.end()
+        return pixmap
     
     def update_widget(self, new_number):
+        if new_number == self.number:
+            return  # nothing to repaint
         self.number = new_number
         self.update()
 
@@ -74,20 +107,26 @@ class CircleWithNumber(QWidget):
 class ProjectsOverviewPieChart:
     """
     Create and manage a pie chart that provides an overview of projects and their associated data.
+    Only the `top_n` projects with the most tracked time get their own slice,
+    all others are combined in an "Other" slice.
 
     Attributes:
         chart (QChart): The main chart object.
         series (QPieSeries): The pie series object representing the data in the chart.
         chart_view (QChartView): The view for rendering the chart.
+        top_n (int): Maximum number of project slices.
+        slices (dict): The current slices by project name (None for the "Other" slice).
     
     Example:
-        pie_chart = ProjectsOverviewPieChart()
+        pie_chart = ProjectsOverviewPieChart(top_n=5)
         pie_chart.update_data(
             project_names=["Project A", "Project B"],
             time_tracked_list=[10, 20]
         )
     """
-    def __init__(self):
+    OTHER_LABEL = "Other"
+
+    def __init__(self, top_n=PIE_CHART_TOP_N):
         # Initialisierung der Diagrammkomponenten
         self.chart = QChart()
         self.chart.setTitle("")
@@ -106,10 +145,16 @@ class ProjectsOverviewPieChart:
 
         # self.layout = QVBoxLayout()  # Erstelle einen Layout-Container
         # self.layout.addWidget(self.chart_view)
+        
+        self.top_n = top_n
+        self.slices = {}
+        self._values = {}  # values currently shown, by the same keys as self.slices
 
     def update_data(self, project_names, time_tracked_list):
         """
         Update the pie chart with the latest project data.
+        Existing slices are updated in place, only slices of new or removed projects
+        are added or removed. Nothing is done if no value changed.
 
         Parameters:
             project_names (list of str): A list of project names to be displayed on the pie chart.
@@ -121,10 +166,25 @@ class ProjectsOverviewPieChart:
                 time_tracked_list=[10, 20]
             )
         """
+        projects = sorted(zip(project_names, time_tracked_list), key=lambda project: project[1], reverse=True)
+        values = dict(projects[:self.top_n])
+        if len(projects) > self.top_n:
+            values[None] = sum(time_tracked for _, time_tracked in projects[self.top_n:])
+        if values == self._values:
+            return
 
-        self.series.clear()  # Vorhandene Daten entfernen
-        for i, name in enumerate(project_names):
-            self.series.append(name, time_tracked_list[i])
+        # remove slices of projects that are gone (or moved to "Other")
+        for key in [key for key in self.slices if key not in values]:
+            self.series.remove(self.slices.pop(key))
+        # update existing slices and add new ones
+        for key, value in values.items():
+            pie_slice = self.slices.get(key)
+            if pie_slice is None:
+                label = self.OTHER_LABEL if key is None else key
+                self.slices[key] = self.series.append(label, value)
+            elif pie_slice.value() != value:
+                pie_slice.setValue(value)
+        self._values = values
 
 
 class MainSession(QMainWindow):
@@ -133,11 +193,20 @@ class MainSession(QMainWindow):
     data handling and periodic updates.
 
     Attributes:
-        minute_counter (int): Counter for minutes elapsed.
+        minute_counters (dict): Minutes not yet converted to points, per project id.
         point_system (PointsSystem): Instance of the points management system.
-        time_manager (TimeManagement): Instance of the time management system.
-        conn (sqlite3.Connection): SQLite database connection.
+        timer_scheduler (TimerScheduler): Single scheduler driving all timers.
+        time_manager (TimeManagement): The timer shown in the time management area.
+        project_timers (list of TimeManagement): Additional timers running in the background.
+        conn (sqlite3.Connection): SQLite database connection (reads and inserts).
+        writer (DatabaseWriter): Background writer for updates, None to write on the GUI thread.
+        project_repository (ProjectRepository): Cached summaries of all projects.
         current_project (ProjectManagement): Instance of the project management system.
+        timer_checkpoint (TimerCheckpoint): Durable record of the timer state.
+        profile (Profile): The profile (user) whose data is shown, see switch_profile.
+        ipc_server (IpcServer): Live channel to the garden (points and timer state).
+        profiler (Profiler): Profiles the timer callbacks if profiling is enabled, else None.
+        flushed_minutes (int): Minutes counted by time_manager that are already stored in the database.
     
     Example:
         connection = sqlite3.connect("database.db")
@@ -147,17 +216,33 @@ class MainSession(QMainWindow):
         sys.exit(app.exec_())
     """
 
-    def __init__(self, connection: sqlite3.Connection):
+    def __init__(self, connection: sqlite3.Connection, checkpoint_file=None,
+                 writer: DatabaseWriter | None = None, profile: Profile | None = None,
+                 profiler: Profiler | None = None):
         super().__init__()
-        self.minute_counter = 0  # init local minute counter
+        self.minute_counters = {}  # init local minute counters (project id -> minutes)
+        self.profile = profile or get_profile(DEFAULT_PROFILE)
+        self.profiler = profiler
         
         # Create class instances
-        self.point_system = PointsSystem()
-        self.time_manager = TimeManagement()
+        self.timer_scheduler = TimerScheduler(self, profiler=self.profiler)
+        self.time_manager = TimeManagement(self.timer_scheduler)
+        self.project_timers = []
         self.conn = connection
-        self.current_project = ProjectManagement(self.conn)
+        self.writer = writer
+        self.project_repository = ProjectRepository(self.conn, self.writer)
+        self.current_project = ProjectManagement(self.conn, self.project_repository, self.writer)
+        self.point_system = PointsSystem(self.conn, self.writer)  # after the database was migrated
+        self.timer_checkpoint = TimerCheckpoint(checkpoint_file or self.profile.checkpoint_file)
+        self.json_store = JsonStore(self.profile.json_file, parent=self)
+        self.flushed_minutes = 0
+        self.pending_flush = None  # (writer ticket, flushed minutes) waiting for the commit
+        if self.writer is not None:
+            self.writer.writes_committed.connect(self.handle_database_writes_committed)
+            self.writer.write_failed.connect(self.handle_database_write_failed)
         
         # UI setup
+        self.setStyleSheet(STYLESHEET)  # one stylesheet for all widgets, set before they are created
         self.setWindowTitle("ProductivityGarden")
         self.setGeometry(100, 100, WIDTH, HEIGHT)
         self.setup_gui()
@@ -165,17 +250,28 @@ class MainSession(QMainWindow):
         # get user data from json
         self.load_json_data()
         
+        # live channel to the garden, points and timer changes are published as they happen
+        self.ipc_server = IpcServer(parent=self)
+        self.ipc_server.message_received.connect(self.handle_ipc_message)
+        self.ipc_server.listen(get_server_name(self.profile.name))
+        self.point_system.on_points_changed = self.publish_points_changed
+        
+        # restore the timer that was running when the app was closed or crashed
+        self.restore_timer_checkpoint()
+        self.time_manager.on_state_changed = self.handle_timer_state_changed
+        
         # initial component updates
         self.update_high_frequency()
         self.update_low_frequency()
         
         # Timer for updating various components of the application at different frequencies
         self.update_timer_high_frequency = QTimer(self)
-        self.update_timer_high_frequency.timeout.connect(self.update_high_frequency)
+        # (profiled only if profiling is enabled, otherwise the methods are connected directly)
+        self.update_timer_high_frequency.timeout.connect(profiled(self.update_high_frequency, self.profiler))
         self.update_timer_high_frequency.start(250)
         
         self.update_timer_low_frequency = QTimer(self)
-        self.update_timer_low_frequency.timeout.connect(self.update_low_frequency)
+        self.update_timer_low_frequency.timeout.connect(profiled(self.update_low_frequency, self.profiler))
         self.update_timer_low_frequency.start(2000)
 
     def setup_gui(self):
@@ -206,7 +302,6 @@ class MainSession(QMainWindow):
         # Set central widget
         central_widget = QWidget()
         central_widget.setLayout(main_layout)
-        central_widget.setStyleSheet(f"background-color: {COLOR_BEIGE_HEX};")
         self.setCentralWidget(central_widget)
 
     def gui_create_first_column(self):
@@ -216,12 +311,15 @@ class MainSession(QMainWindow):
         """
         layout = QVBoxLayout()
         
+        # create profile switcher
+        self.gui_draw_profile_switcher(layout)
+        
         # create point overview
         self.gui_draw_point_overview(layout)
         
         # create button to the gardens
         # button = self.gui_create_button("TO THE GARDENS", main)
-        button_gardens = self.gui_create_button("TO THE GARDENS", COLOR_OCEANBAY_HEX, self.handle_open_virtualgardens)
+        button_gardens = self.gui_create_button("TO THE GARDENS", self.handle_open_virtualgardens)
         layout.addWidget(button_gardens)
         
         # Image
@@ -237,7 +335,6 @@ class MainSession(QMainWindow):
 
         container = QWidget()
         container.setLayout(layout)
-        container.setStyleSheet(f"background-color: {COLOR_BEIGE_HEX};")
         return container
 
     def gui_create_second_column(self):
@@ -249,19 +346,19 @@ class MainSession(QMainWindow):
         # Add spacer to push content to the top
         layout.addStretch()
         
-        # Input field for text
+        # Notes of the selected project, loaded on selection and saved when typing pauses
         self.text_box = QPlainTextEdit()
-        self.text_box.setPlaceholderText("Enter your text here...")
-        self.text_box.setStyleSheet(f"font-size: 16px; padding: 5px; color: {COLOR_OCEANBAY_HEX};\
-            border: 1px solid {COLOR_OCEANBAY_HEX};")
+        self.text_box.setPlaceholderText("Notes for this project...")
         font_metrics = self.text_box.fontMetrics()
         line_height = font_metrics.lineSpacing()
         self.text_box.setFixedHeight(8 * line_height + 10)
+        self.project_notes = ProjectNotes(self.conn, self.text_box.toPlainText, self.writer, parent=self)
+        self.text_box.setPlainText(self.project_notes.load(self.current_project.id))
+        self.text_box.textChanged.connect(self.project_notes.text_edited)
         layout.addWidget(self.text_box)
 
         container = QWidget()
         container.setLayout(layout)
-        container.setStyleSheet(f"background-color: {COLOR_BEIGE_HEX};")
         return container
 
     def gui_create_third_column(self):
@@ -276,46 +373,45 @@ class MainSession(QMainWindow):
 
         container = QWidget()
         container.setLayout(layout)
-        container.setStyleSheet(f"background-color: {COLOR_BEIGE_HEX};")
         return container
 
     def gui_create_separator(self):
         """Create a separator line."""
         separator = QWidget()
         separator.setFixedWidth(1)
-        separator.setStyleSheet(f"background-color: {COLOR_OCEANBAY_HEX};")
+        separator.setObjectName("separator")
         return separator
 
-    def gui_create_button(self, text, main_color: str, callback=None):
-        """ Method helps create a button, so that each button has a similar style """
+    def gui_create_button(self, text, callback=None):
+        """ Method helps create a button, the style of all buttons is set by the window stylesheet """
         button = QPushButton(text)
-        button.setStyleSheet(f"""
-            QPushButton{{
-                font-size: 16px;
-                font-weight: bold;
-                padding: 10px;
-                color: {main_color};
-                border: 1px solid {main_color};
-                background-color: transparent;
-            }}
-            QPushButton:hover {{
-                background-color: {COLOR_ROSE_HEX};
-                color: {main_color};
-            }}
-            QPushButton:pressed {{
-                background-color: {main_color};
-                color: {main_color};
-            }}
-        """)
         if callback is not None:
             button.clicked.connect(callback)
         return button
 
+    def gui_draw_profile_switcher(self, layout : QVBoxLayout):
+        """ init and draw the profile dropdown and the input to add a profile """
+        profile_layout = QHBoxLayout()
+        self.profiles_dropdown = QComboBox()
+        self.profiles_dropdown.addItems(list_profiles())
+        if self.profiles_dropdown.findText(self.profile.name) == -1:
+            self.profiles_dropdown.addItem(self.profile.name)
+        self.profiles_dropdown.setCurrentText(self.profile.name)
+        self.profiles_dropdown.currentTextChanged.connect(self.handle_select_profile)
+        profile_layout.addWidget(self.profiles_dropdown)
+        self.new_profile_input = QLineEdit()
+        self.new_profile_input.setPlaceholderText("New profile")
+        self.new_profile_input.setMaxLength(32)
+        profile_layout.addWidget(self.new_profile_input)
+        add_profile_button = self.gui_create_button("+", self.handle_add_profile)
+        profile_layout.addWidget(add_profile_button)
+        layout.addLayout(profile_layout)
+
     def gui_draw_point_overview(self, layout : QVBoxLayout):
         """ init and draw the whole "point overview" area """
         # Text Element
         points_label = QLabel("POINTS")
-        points_label.setStyleSheet(f"font-size: 24px; font-weight: bold; color: {COLOR_OCEANBAY_HEX}")
+        points_label.setObjectName("heading")
         points_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(points_label)
 
@@ -329,7 +425,6 @@ class MainSession(QMainWindow):
         
         # Label next to the circle
         circle_text_label = QLabel("available")
-        circle_text_label.setStyleSheet(f"font-size: 16px; font-weight: bold; color: {COLOR_OCEANBAY_HEX}")
         circle_and_text_layout_av.addWidget(circle_text_label)
         
         # Add the horizontal layout to the main layout
@@ -345,7 +440,6 @@ class MainSession(QMainWindow):
         
         # Label next to the circle
         circle_text_label = QLabel("total")
-        circle_text_label.setStyleSheet(f"font-size: 16px; font-weight: bold; color: {COLOR_OCEANBAY_HEX}")
         circle_and_text_layout_tot.addWidget(circle_text_label)
         
         # Add the horizontal layout to the main layout
@@ -355,25 +449,25 @@ class MainSession(QMainWindow):
         """ init and draw the whole "time management" area """
         # Display current timer mode
         self.timer_mode_label = QLabel(self.time_manager.selected_timer.upper())
-        self.timer_mode_label.setStyleSheet(f"font-size: 24px; font-weight: bold; color: {COLOR_OCEANBAY_HEX}")
+        self.timer_mode_label.setObjectName("heading")
         self.timer_mode_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(self.timer_mode_label)
         
         # Digital clock
         self.clock_label = QLabel("00:00:00")
-        self.clock_label.setStyleSheet(f"font-size: 20px; font-weight: bold; color: {COLOR_OCEANBAY_HEX}")
+        self.clock_label.setObjectName("clock")
         self.clock_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(self.clock_label)
         
         # Buttons to control the various time functions
         buttons_layout = QHBoxLayout()
-        start_button = self.gui_create_button("Start", COLOR_OCEANBAY_HEX, self.handle_start_time)
+        start_button = self.gui_create_button("Start", self.handle_start_time)
         buttons_layout.addWidget(start_button)
 
-        self.pause_button = self.gui_create_button("-", COLOR_OCEANBAY_HEX, self.handle_pause_time)
+        self.pause_button = self.gui_create_button("-", self.handle_pause_time)
         buttons_layout.addWidget(self.pause_button)
         
-        stop_button = self.gui_create_button("Stop", COLOR_OCEANBAY_HEX, self.handle_stop_time)
+        stop_button = self.gui_create_button("Stop", self.handle_stop_time)
         buttons_layout.addWidget(stop_button)
         
         layout.addLayout(buttons_layout)
@@ -382,55 +476,45 @@ class MainSession(QMainWindow):
         work_input_layout = QHBoxLayout()
         self.pomodoro_work_input = QLineEdit()
         self.pomodoro_work_input.setText("00:25:00")
-        self.pomodoro_work_input.setStyleSheet(f"font-size: 16px; font-weight: bold; padding: 5px; \
-            color: {COLOR_OCEANBAY_HEX};\
-            border: 2px solid {COLOR_SOFTCORAL_HEX};")
+        self.pomodoro_work_input.setObjectName("timeInput")
         self.pomodoro_work_input.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.pomodoro_work_input.setVisible(True)
         work_input_layout.addWidget(self.pomodoro_work_input)
         work_input_layout.addStretch()
         # Label next to the input box
         self.pomodoro_work_input_label = QLabel("set work time ")
-        self.pomodoro_work_input_label.setStyleSheet(
-            f"font-size: 16px; font-weight: bold; color: {COLOR_OCEANBAY_HEX}")
         work_input_layout.addWidget(self.pomodoro_work_input_label)
         layout.addLayout(work_input_layout)
         # Input field for pomodoro #2
         break_input_layout = QHBoxLayout()
         self.pomodoro_break_input = QLineEdit()
         self.pomodoro_break_input.setText("00:05:00")
-        self.pomodoro_break_input.setStyleSheet(f"font-size: 16px; font-weight: bold; padding: 5px; \
-            color: {COLOR_OCEANBAY_HEX};\
-            border: 2px solid {COLOR_SOFTCORAL_HEX};")
+        self.pomodoro_break_input.setObjectName("timeInput")
         self.pomodoro_break_input.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.pomodoro_break_input.setVisible(True)
         break_input_layout.addWidget(self.pomodoro_break_input)
         break_input_layout.addStretch()
         # Label next to the input box
         self.pomodoro_break_input_label = QLabel("set break time")
-        self.pomodoro_break_input_label.setStyleSheet(
-            f"font-size: 16px; font-weight: bold; color: {COLOR_OCEANBAY_HEX}")
         break_input_layout.addWidget(self.pomodoro_break_input_label)
         layout.addLayout(break_input_layout)
         
         # Input field for timer
         self.timer_input_field = QLineEdit()
         self.timer_input_field.setText("00:50:00")
-        self.timer_input_field.setStyleSheet(f"font-size: 16px; font-weight: bold; padding: 5px; \
-            color: {COLOR_OCEANBAY_HEX};\
-            border: 2px solid {COLOR_SOFTCORAL_HEX};")
+        self.timer_input_field.setObjectName("timeInput")
         self.timer_input_field.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.timer_input_field.setVisible(False)
         layout.addWidget(self.timer_input_field)
         
         # Text element for errors
         self.input_error_label = QLabel("")
-        self.input_error_label.setStyleSheet(f"font-size: 20px; font-weight: bold; color: {COLOR_RED_HEX}")
+        self.input_error_label.setObjectName("error")
         self.input_error_label.setVisible(False)
         layout.addWidget(self.input_error_label)
         
         # Toggle button for stopwatch/timer
-        self.mode_toggle_button = self.gui_create_button("Switch to Timer", COLOR_OCEANBAY_HEX, self.handle_toggle_mode)
+        self.mode_toggle_button = self.gui_create_button("Switch to Timer", self.handle_toggle_mode)
         layout.addWidget(self.mode_toggle_button)
 
     def gui_draw_project_overview(self, layout : QVBoxLayout):
@@ -439,24 +523,35 @@ class MainSession(QMainWindow):
         
         # Text "Projects"
         projects_label = QLabel("PROJECTS")
-        projects_label.setStyleSheet(f"font-size: 24px; font-weight: bold; color: {COLOR_OCEANBAY_HEX}")
+        projects_label.setObjectName("heading")
         projects_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(projects_label)
         
-        # Drop-Down menu for projects
+        # Input field to filter the projects dropdown menu (type-ahead)
+        self.projects_filter_input = QLineEdit()
+        self.projects_filter_input.setPlaceholderText("Search projects")
+        self.projects_filter_input.setObjectName("search")
+        layout.addWidget(self.projects_filter_input)
+        
+        # Drop-Down menu for projects, rows are loaded lazily by the model
+        self.project_list_model = ProjectListModel(self.conn, parent=self)
         self.projects_dropdown = QComboBox()
-        self.projects_dropdown.setStyleSheet(f"font-size: 16px; font-weight: bold; padding: 5px; \
-            color: {COLOR_OCEANBAY_HEX}; border: 1px solid {COLOR_OCEANBAY_HEX};")
-        self.projects_dropdown.addItems(ProjectManagement.get_projects_name_list(self.conn))
+        # don't measure every item to size the dropdown
+        self.projects_dropdown.setSizeAdjustPolicy(QComboBox.SizeAdjustPolicy.AdjustToMinimumContentsLengthWithIcon)
+        self.projects_dropdown.setMinimumContentsLength(20)
+        self.projects_dropdown.setModel(self.project_list_model)
         self.projects_dropdown.currentIndexChanged.connect(self.handle_select_project_from_dropdown)
+        self.projects_filter_input.textChanged.connect(self.project_list_model.set_filter)
         layout.addWidget(self.projects_dropdown)
         
         # Button to add a new project and one to delete the selected project
         buttons_layout = QHBoxLayout()
-        add_button = self.gui_create_button("Add", COLOR_OCEANBAY_HEX, self.handle_add_new_project)
+        add_button = self.gui_create_button("Add", self.handle_add_new_project)
         buttons_layout.addWidget(add_button)
-        del_button = self.gui_create_button("Delete", COLOR_OCEANBAY_HEX, self.handle_delete_project)
+        del_button = self.gui_create_button("Delete", self.handle_delete_project)
         buttons_layout.addWidget(del_button)
+        archive_button = self.gui_create_button("Archive", self.handle_archive_project)
+        buttons_layout.addWidget(archive_button)
         layout.addLayout(buttons_layout)
         
         # Add edit info area
@@ -469,11 +564,15 @@ class MainSession(QMainWindow):
         circle_and_text_layout.addWidget(self.circle_project_time)
         # Label next to the circle
         circle_text_label = QLabel("time tracked (min)")
-        circle_text_label.setStyleSheet(f"font-size: 16px; font-weight: bold; color: {COLOR_OCEANBAY_HEX}")
         circle_and_text_layout.addWidget(circle_text_label)
         # Add the horizontal layout to the main layout
         layout.addLayout(circle_and_text_layout)
         
+        # Time of the current week and streak of the selected project
+        self.project_report_label = QLabel("")
+        self.project_report_label.setObjectName("report")
+        layout.addWidget(self.project_report_label)
+        
         # Add pie chart for project time distribution
         self.projects_pie_chart = ProjectsOverviewPieChart()
         layout.addWidget(self.projects_pie_chart.chart_view)
@@ -484,13 +583,11 @@ class MainSession(QMainWindow):
         # Create items to manually add time
         layout_add_time = QHBoxLayout()
         # Button next to the input field
-        pr_add_time_button = self.gui_create_button("Add time", COLOR_OCEANBAY_HEX, self.handle_add_time_to_project)
+        pr_add_time_button = self.gui_create_button("Add time", self.handle_add_time_to_project)
         # Input field
         self.pr_add_time = QLineEdit()
         self.pr_add_time.setText("")
         self.pr_add_time.setPlaceholderText("Add x minutes to the current project")
-        self.pr_add_time.setStyleSheet(f"font-size: 14px; padding: 5px; font-weight: bold; \
-            color: {COLOR_OCEANBAY_HEX}; border: 2px solid {COLOR_SOFTCORAL_HEX};")
         self.pr_add_time.setVisible(True)
         # Add to layout
         layout_add_time.addWidget(pr_add_time_button)
@@ -505,44 +602,28 @@ class MainSession(QMainWindow):
         inputv2_layout = QVBoxLayout()
         # Label next to the input box
         self.pr_name_input_label = QLabel("Name")
-        self.pr_name_input_label.setStyleSheet(
-            f"font-size: 16px; font-weight: bold; color: {COLOR_OCEANBAY_HEX}")
         # Input field for name of the project
         self.pr_name_input = QLineEdit()
-        self.pr_name_input.setText(self.current_project.name)
+        self.pr_name_input.setMaxLength(40)
         self.pr_name_input.setPlaceholderText("Physics")
-        self.pr_name_input.setStyleSheet(f"font-size: 14px; padding: 5px; font-weight: bold; \
-            color: {COLOR_OCEANBAY_HEX}; border: 2px solid {COLOR_SOFTCORAL_HEX};")
         self.pr_name_input.setVisible(True)
         inputv1_layout.addWidget(self.pr_name_input_label)
         inputv2_layout.addWidget(self.pr_name_input)
-        # connect to update dropdown menu
-        self.pr_name_input.textChanged.connect(self.handle_update_project_name)
         
         # Label next to the input box
         self.pr_description_input_label = QLabel("Description")
-        self.pr_description_input_label.setStyleSheet(
-            f"font-size: 16px; font-weight: bold; color: {COLOR_OCEANBAY_HEX}")
         # Input field for description of the project
         self.pr_description_input = QLineEdit()
-        self.pr_description_input.setText(self.current_project.description)
         self.pr_description_input.setPlaceholderText("Physics class")
-        self.pr_description_input.setStyleSheet(f"font-size: 14px; padding: 5px; font-weight: bold; \
-            color: {COLOR_OCEANBAY_HEX}; border: 2px solid {COLOR_SOFTCORAL_HEX};")
         self.pr_description_input.setVisible(True)
         inputv1_layout.addWidget(self.pr_description_input_label)
         inputv2_layout.addWidget(self.pr_description_input)
         
         # Label next to the input box
         self.pr_type_input_label = QLabel("Category")
-        self.pr_type_input_label.setStyleSheet(
-            f"font-size: 16px; font-weight: bold; color: {COLOR_OCEANBAY_HEX}")
         # Input field for type of the project
         self.pr_type_input = QLineEdit()
-        self.pr_type_input.setText(self.current_project.type)
         self.pr_type_input.setPlaceholderText("Study")
-        self.pr_type_input.setStyleSheet(f"font-size: 14px; padding: 5px; font-weight: bold; \
-            color: {COLOR_OCEANBAY_HEX}; border: 2px solid {COLOR_SOFTCORAL_HEX};")
         self.pr_type_input.setVisible(True)
         inputv1_layout.addWidget(self.pr_type_input_label)
         inputv2_layout.addWidget(self.pr_type_input)
@@ -553,12 +634,9 @@ class MainSession(QMainWindow):
         # Date input for the project start date
         start_date_layout = QHBoxLayout()
         self.project_start_date_label = QLabel("Start Date")
-        self.project_start_date_label.setStyleSheet(f"font-size: 16px; font-weight: bold; color: {COLOR_OCEANBAY_HEX}")
         self.project_start_date_edit = QDateEdit(self)
         self.project_start_date_edit.setCalendarPopup(True)  # Enable the calendar popup
         self.project_start_date_edit.setDate(self.current_project.start_date)  # Set default date
-        self.project_start_date_edit.setStyleSheet(f"font-size: 14px; padding: 5px; font-weight: bold;\
-            color: {COLOR_OCEANBAY_HEX}; border: 2px solid {COLOR_SOFTCORAL_HEX};")
         self.project_start_date_edit.dateChanged.connect(self.handle_start_date_changed)  # call ... if date changes
         start_date_layout.addWidget(self.project_start_date_label)
         start_date_layout.addWidget(self.project_start_date_edit)
@@ -567,18 +645,25 @@ class MainSession(QMainWindow):
         # Date input for the project end date
         end_date_layout = QHBoxLayout()
         self.project_end_date_label = QLabel("End Date")
-        self.project_end_date_label.setStyleSheet(f"font-size: 16px; font-weight: bold; color: {COLOR_OCEANBAY_HEX}")
         self.project_end_date_edit = QDateEdit(self)
         self.project_end_date_edit.setCalendarPopup(True)  # Enable the calendar popup
         self.project_end_date_edit.setMinimumDate(self.project_start_date_edit.date())  # Set minimum date
         self.project_end_date_edit.setDate(self.current_project.end_date)  # Set default date
-        self.project_end_date_edit.setStyleSheet(f"font-size: 14px; padding: 5px; font-weight: bold;\
-            color: {COLOR_OCEANBAY_HEX}; border: 2px solid {COLOR_SOFTCORAL_HEX};")
         self.project_end_date_edit.dateChanged.connect(self.handle_end_date_changed)  # call ... if date changes
         end_date_layout.addWidget(self.project_end_date_label)
         end_date_layout.addWidget(self.project_end_date_edit)
         layout.addLayout(end_date_layout)
         
+        # every input writes its field of the current project when it changes (no polling)
+        self.project_form = FormBinding(self.current_project, parent=self)
+        self.project_form.bind_line_edit(self.pr_name_input, "name", validator=self.is_valid_project_name)
+        self.project_form.bind_line_edit(self.pr_description_input, "description")
+        self.project_form.bind_line_edit(self.pr_type_input, "type")
+        self.project_form.bind_date_edit(self.project_start_date_edit, "start_date")
+        self.project_form.bind_date_edit(self.project_end_date_edit, "end_date")
+        self.project_form.field_changed.connect(self.handle_project_field_changed)
+        self.project_form.validity_changed.connect(self.handle_project_field_validity_changed)
+        
     def gui_show_error(self, text):
         """Show error on gui."""
         self.input_error_label.setText(text)
@@ -633,46 +718,58 @@ class MainSession(QMainWindow):
     
     def handle_add_new_project(self):
         """Handle a click on the "Add" new project button."""
+        self.project_form.validate()
+        self.sync_project_time()
+        self.current_project.update_data_in_sql()  # save the previous project first
         self.current_project.add_project()
-        self.projects_dropdown.addItem(self.current_project.name)
-        self.projects_dropdown.setCurrentIndex(self.projects_dropdown.count()-1)
+        self.project_list_model.project_added(self.current_project.id, self.current_project.name)
+        self.select_project_in_dropdown(self.current_project.id)
         
     def handle_delete_project(self):
         """Handle a click on the "Delete" project button."""
+        self.project_notes.discard()  # the note is deleted with the project
+        project_id = self.current_project.id
         self.current_project.delete_project()
-        self.projects_dropdown.removeItem(self.projects_dropdown.currentIndex())
+        self.project_list_model.project_deleted(project_id)
+        if self.project_list_model.rowCount() == 0:
+            self.projects_filter_input.clear()  # the filter hid all other projects
+        self.projects_dropdown.setCurrentIndex(0)
+    
+    def handle_archive_project(self):
+        """Handle a click on the "Archive" button: move the selected project out of the projects list."""
+        self.project_form.validate()
+        self.sync_project_time()  # book the minutes counted so far on the project first
+        self.project_notes.flush()
+        project_id = self.current_project.id
+        self.current_project.archive_project()
+        self.project_list_model.project_deleted(project_id)
+        if self.project_list_model.rowCount() == 0:
+            self.projects_filter_input.clear()  # the filter hid all other projects
         self.projects_dropdown.setCurrentIndex(0)
     
     def handle_select_project_from_dropdown(self):
         """Handle a click on another project in the projects dropdown menu."""
-        self.current_project.id = ProjectManagement.get_id_by_name(self.projects_dropdown.currentText(), self.conn)
+        project_id = self.projects_dropdown.currentData()
+        if project_id is None:  # no project matches the filter
+            return
+        self.project_form.validate()  # take over a name that is still being typed
+        self.sync_project_time()
+        self.current_project.update_data_in_sql()  # don't lose time booked since the last save
+        self.current_project.id = project_id
         self.current_project.load_data_from_sql()
-        self.pr_name_input.setText(self.current_project.name)
-        self.pr_description_input.setText(self.current_project.description)
-        self.pr_type_input.setText(self.current_project.type)
-        self.project_start_date_edit.setDate(self.current_project.start_date)
-        self.project_end_date_edit.setDate(self.current_project.end_date)
+        self.text_box.setPlainText(self.project_notes.load(project_id))  # saves the previous note first
+        self.project_form.load()
+
+    def handle_project_field_changed(self, field: str):
+        """Is called when an input of the project form changed a field of the current project."""
+        if field == "name":
+            self.project_list_model.project_renamed(self.current_project.id, self.current_project.name)
+
+    def handle_project_field_validity_changed(self, field: str, valid: bool):
+        """Mark an invalid input of the project form (e.g. an empty or used name) red."""
+        if field == "name":
+            set_invalid(self.pr_name_input, not valid)  # toggles a property, the stylesheet stays parsed
 
-    def handle_update_project_name(self):
-        """
-        Validate the user input for the project name and
-        update the projects dropdown menu
-        """
-        text = self.pr_name_input.text()
-        if len(text) > 40:
-            # Truncate the text to 40 characters
-            self.pr_name_input.setText(text[:40])
-            self.pr_name_input.setCursorPosition(40)  # Set cursor to the end
-        elif not text.strip():
-            # Prevent empty input
-            self.pr_name_input.setStyleSheet("font-size: 14px; padding: 5px; font-weight: bold; \
-                color: red; border: 2px solid red;")
-        else:
-            # Restore original style if valid
-            self.pr_name_input.setStyleSheet(f"font-size: 14px; padding: 5px; font-weight: bold; \
-                color: {COLOR_OCEANBAY_HEX}; border: 2px solid {COLOR_SOFTCORAL_HEX};")
-        self.projects_dropdown.setItemText(self.projects_dropdown.currentIndex(), self.pr_name_input.text())
- 
     def handle_add_time_to_project(self):
         """Handle the manual add time to the current project input field"""
         self.input_error_label.setVisible(False)
@@ -710,10 +807,144 @@ class MainSession(QMainWindow):
             self.project_end_date_edit.setDate(self.project_start_date_edit.date())
     
     def handle_open_virtualgardens(self):
-        """Start virtualgardens.py and close this app."""
-        self.close()
+        """
+        Start virtualgardens.py, this window stays open (the timer keeps running),
+        points and timer state reach the garden over the ipc channel.
+        """
+        self.store_session_data()  # the garden reads the points from the database
         subprocess.Popen(["python", "virtualgardens.py"])
     
+    def handle_timer_state_changed(self, time_manager: TimeManagement):
+        """Is called on every state transition of the timer (start, pause, phase switch, ...)."""
+        self.save_timer_checkpoint()
+        self.ipc_server.publish({"type": "timer", "selected_timer": self.time_manager.selected_timer,
+                                 "mode": self.time_manager.mode, "project_id": self.current_project.id})
+    
+    def publish_points_changed(self, total_delta: int, available_delta: int):
+        """Is called by the points system after every change, the garden shows the new balance."""
+        self.ipc_server.publish({"type": "points", "total_delta": total_delta, "available_delta": available_delta})
+    
+    def handle_ipc_message(self, message: dict):
+        """Is called when the garden published a message, e.g. points spent on a garden object."""
+        if message.get("type") == "points":
+            self.point_system.apply_points_changed(int(message.get("total_delta", 0)),
+                                                   int(message.get("available_delta", 0)))
+            self.circle_av.update_widget(self.point_system.get_points()[1])
+            self.circle_tot.update_widget(self.point_system.get_points()[0])
+    
+    def handle_select_profile(self, name: str):
+        """Handle the selection of another profile in the profiles dropdown."""
+        if not name or name == self.profile.name:
+            return
+        self.switch_profile(get_profile(name))
+        set_active_profile(name)  # used by the next start and by the garden
+
+    def handle_add_profile(self):
+        """Handle a click on the "+" (add profile) button: create the profile and switch to it."""
+        self.input_error_label.setVisible(False)
+        name = self.new_profile_input.text().strip()
+        try:
+            create_profile(name)
+        except (ValueError, OSError) as e:
+            self.gui_show_error(str(e))
+            return
+        self.new_profile_input.clear()
+        self.profiles_dropdown.addItem(name)
+        self.profiles_dropdown.setCurrentText(name)  # switches the profile
+
+    def switch_profile(self, profile: Profile):
+        """
+        Show the data of another profile without restarting the app.
+        The data of the current profile is stored (a running timer is restored paused when
+        switching back), then the connection, the writer and all caches are replaced.
+        Caches of the new profile are filled lazily: the project list loads its first batch,
+        the pie chart and the report follow with the next low frequency update.
+        """
+        if profile == self.profile:
+            return
+        self.store_session_data()
+        for timer in [self.time_manager] + self.project_timers:
+            timer.on_state_changed = None
+            timer.stop()
+        os.makedirs(profile.map_folder, exist_ok=True)
+        
+        # replace the connection and the writer
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = DatabaseWriter(profile.db_file)
+            self.writer.writes_committed.connect(self.handle_database_writes_committed)
+            self.writer.write_failed.connect(self.handle_database_write_failed)
+        self.conn.close()
+        self.conn = connect(profile.db_file)
+        self.profile = profile
+        
+        # replace the data of the old profile
+        self.minute_counters = {}
+        self.flushed_minutes = 0
+        self.pending_flush = None
+        self.time_manager = TimeManagement(self.timer_scheduler)
+        self.project_timers = []
+        self.project_repository = ProjectRepository(self.conn, self.writer)
+        self.current_project = ProjectManagement(self.conn, self.project_repository, self.writer)
+        self.point_system = PointsSystem(self.conn, self.writer)
+        self.point_system.on_points_changed = self.publish_points_changed
+        self.ipc_server.listen(get_server_name(profile.name))  # the garden of the old profile is disconnected
+        self.timer_checkpoint = TimerCheckpoint(profile.checkpoint_file)
+        self.json_store.deleteLater()  # flushed by store_session_data
+        self.json_store = JsonStore(profile.json_file, parent=self)
+        self.project_form.set_model(self.current_project)
+        self.project_notes.set_connection(self.conn, self.writer)
+        self.text_box.setPlainText(self.project_notes.load(self.current_project.id))
+        self.project_list_model.set_connection(self.conn)
+        self.select_project_in_dropdown(self.current_project.id)
+        self.load_json_data()
+        self.restore_timer_checkpoint()
+        self.time_manager.on_state_changed = self.handle_timer_state_changed
+        
+        # O(1) updates, everything else is updated lazily
+        self.update_high_frequency()
+        self.circle_av.update_widget(self.point_system.get_points()[1])
+        self.circle_tot.update_widget(self.point_system.get_points()[0])
+        self.circle_project_time.update_widget(self.current_project.get_time())
+        print(f"Switched to profile {profile.name}")  # Debug message
+
+    def store_session_data(self):
+        """Store all data of the session, e.g. before the window closes or the profile changes."""
+        self.project_form.validate()
+        self.sync_variables()
+        self.save_json_data()
+        self.json_store.flush()  # write a change that is still waiting for the debounce
+        self.project_notes.flush()
+        self.current_project.update_data_in_sql()
+        if self.writer is not None:
+            self.writer.flush()  # everything must be on disk before e.g. the garden starts
+        self.flushed_minutes = self.time_manager.counted_minutes - self.time_manager.productiv_minutes
+        self.save_timer_checkpoint()
+
+    def closeEvent(self, event):  # type: ignore
+        """Store all data before the window closes, a running timer is restored (paused) on the next start."""
+        self.store_session_data()
+        self.ipc_server.close()
+        super().closeEvent(event)
+    
+    def handle_database_writes_committed(self, ticket: int):
+        """Is called (on the GUI thread) when the writer thread committed statements up to `ticket`."""
+        self.project_repository.writes_committed(ticket)
+        if self.pending_flush is not None and ticket >= self.pending_flush[0]:
+            _, flushed_minutes = self.pending_flush
+            self.pending_flush = None
+            self.handle_minutes_flushed(flushed_minutes)
+    
+    def handle_database_write_failed(self, message: str):
+        """Is called (on the GUI thread) when the writer thread could not write data."""
+        self.gui_show_error(f"Could not save: {message}")
+    
+    def handle_minutes_flushed(self, flushed_minutes: int):
+        """Checkpoint the timer whenever new minutes reached the database (at most once per minute)."""
+        if flushed_minutes != self.flushed_minutes:
+            self.flushed_minutes = flushed_minutes
+            self.save_timer_checkpoint()
+    
     def update_gui(self):
         """
         Update the GUI frequently.
@@ -761,24 +992,50 @@ class MainSession(QMainWindow):
             self.clock_label.setText("00:00:00")
             self.pause_button.setText("-")
     
+    def add_project_timer(self, project_id: int, timer_mode="stopwatch"):
+        """
+        Create an additional timer that tracks time for the given project
+        in the background, independent of the currently selected project.
+        The timer is driven by the shared scheduler and only ticks once per minute.
+        """
+        project_timer = TimeManagement(self.timer_scheduler, project_id, tick_interval=60)
+        project_timer.set_timer_mode(timer_mode)
+        project_timer.on_state_changed = self.handle_timer_state_changed
+        self.project_timers.append(project_timer)
+        return project_timer
+
+    def remove_project_timer(self, project_timer: TimeManagement):
+        """Stop a background timer and book its remaining minutes."""
+        project_timer.on_state_changed = None
+        project_timer.stop()
+        self.sync_project_time()
+        self.project_timers.remove(project_timer)
+        self.save_timer_checkpoint()
+
+    def sync_project_time(self):
+        """Move the productive minutes of all timers to their projects and the local counters."""
+        for timer in [self.time_manager] + self.project_timers:
+            minutes = timer.productiv_minutes
+            if not minutes:
+                continue
+            timer.productiv_minutes = 0  # reset counter after reading
+            project_id = self.current_project.id if timer.project_id is None else timer.project_id
+            self.minute_counters[project_id] = self.minute_counters.get(project_id, 0) + minutes
+            if project_id == self.current_project.id:
+                self.current_project.add_time(minutes)
+            else:
+                ProjectManagement.add_time_to_project(timer.project_id, minutes, self.conn,
+                                                      self.project_repository, self.writer)
+
     def sync_variables(self):
         """Update and synchronize various variables"""
-        # get counter of productiv minutes from timemanagement
-        # add the time to the local counter
-        self.minute_counter += self.time_manager.productiv_minutes
-        if self.minute_counter >= 10:  # add points to point system every 10 minutes
-            self.point_system.add_points(self.minute_counter//10)
-            self.minute_counter = self.minute_counter % 10
-        
-        # write project data from gui to the backend class
-        self.current_project.add_time(self.time_manager.productiv_minutes)
-        self.current_project.start_date = self.project_start_date_edit.date()
-        self.current_project.end_date = self.project_end_date_edit.date()
-        self.current_project.name = self.pr_name_input.text()
-        self.current_project.description = self.pr_description_input.text()
-        self.current_project.type = self.pr_type_input.text()
-        
-        self.time_manager.productiv_minutes = 0  # reset counter after reading
+        # get counter of productiv minutes from all timers
+        # add the time to the projects and the local counters
+        self.sync_project_time()
+        for project_id, minutes in self.minute_counters.items():
+            if minutes >= 10:  # add points to point system every 10 minutes, earned on the project they were booked on
+                self.point_system.add_points(minutes//10, project_id=project_id)
+                self.minute_counters[project_id] = minutes % 10
 
     def update_high_frequency(self):
         """Updates components of the application at high frequency (e.g., every 250ms)."""
@@ -790,6 +1047,11 @@ class MainSession(QMainWindow):
         # save data
         self.save_json_data()
         self.current_project.update_data_in_sql()
+        flushed_minutes = self.time_manager.counted_minutes - self.time_manager.productiv_minutes
+        if self.writer is None or self.writer.committed_ticket >= self.writer.last_ticket:
+            self.handle_minutes_flushed(flushed_minutes)
+        else:  # wait until the writer thread committed the update
+            self.pending_flush = (self.writer.last_ticket, flushed_minutes)
         
         # update Point Overview
         self.circle_av.update_widget(self.point_system.get_points()[1])
@@ -797,40 +1059,94 @@ class MainSession(QMainWindow):
         
         # update Project Overview
         self.circle_project_time.update_widget(self.current_project.get_time())
+        self.update_project_report()
+        self.project_repository.refresh_if_changed()  # O(1) unless the database was changed elsewhere
         self.projects_pie_chart.update_data(
-            ProjectManagement.get_projects_name_list(self.conn),
-            ProjectManagement.get_projects_time_tracked_list(self.conn))
+            self.project_repository.get_projects_name_list(),
+            self.project_repository.get_projects_time_tracked_list())
+    
+    def update_project_report(self):
+        """Show the minutes of the current week and the current streak of the selected project."""
+        today = QDate.currentDate()
+        monday = today.addDays(1 - today.dayOfWeek())
+        week_minutes = reporting.get_summary(self.conn, monday.toString("yyyy-MM-dd"), today.toString("yyyy-MM-dd"),
+                                             self.current_project.id)[0]
+        streak = reporting.get_current_streak(self.conn, today.toString("yyyy-MM-dd"), self.current_project.id)
+        self.project_report_label.setText(f"this week: {week_minutes} min, streak: {streak} days")
     
     def save_json_data(self):
-        """Save user data to a json file"""
-        total_points, available_points = self.point_system.get_points()
+        """Save user data to a json file (only if it changed, debounced by the json store)"""
         pomodoro_work_input = self.pomodoro_work_input.text()
         pomodoro_break_input = self.pomodoro_break_input.text()
         timer_input_field = self.timer_input_field.text()
-        text_box = self.text_box.toPlainText()
         data = {
-            "total_points": total_points,
-            "available_points": available_points,
             "pomodoro_work_input": pomodoro_work_input,
             "pomodoro_break_input": pomodoro_break_input,
-            "timer_input_field": timer_input_field,
-            "text_box": text_box
+            "timer_input_field": timer_input_field
             }
-        with open(JSON_FILE, "w") as file:
-            json.dump(data, file)
+        self.json_store.save(data)
         
     def load_json_data(self):
         """Load user data from a json file"""
-        if not os.path.exists(JSON_FILE):
+        data = self.json_store.load()
+        if data is None:
             self.save_json_data()  # create file with default values
+            self.json_store.flush()
         else:
-            with open(JSON_FILE, "r") as file:
-                data = json.load(file)
+            if "total_points" in data and not self.point_system.has_history():
+                # the points of older versions become the first event of the points history
                 self.point_system.set_points(data["total_points"], data["available_points"])
-                self.pomodoro_work_input.setText(data["pomodoro_work_input"])
-                self.pomodoro_break_input.setText(data["pomodoro_break_input"])
-                self.timer_input_field.setText(data["timer_input_field"])
+            self.pomodoro_work_input.setText(data["pomodoro_work_input"])
+            self.pomodoro_break_input.setText(data["pomodoro_break_input"])
+            self.timer_input_field.setText(data["timer_input_field"])
+            if data.get("text_box") and not self.text_box.toPlainText():
+                # the global note of older versions becomes the note of the selected project
                 self.text_box.setPlainText(data["text_box"])
+                self.project_notes.flush()
+
+    def save_timer_checkpoint(self):
+        """Write the state of the timer and the minutes not yet stored in the database."""
+        state = self.time_manager.get_state()
+        state["project_id"] = self.current_project.id
+        state["unbooked_minutes"] = self.time_manager.counted_minutes - self.flushed_minutes
+        # background timers book their minutes right away, only their state is needed
+        state["project_timers"] = [project_timer.get_state() for project_timer in self.project_timers]
+        self.timer_checkpoint.save(state)
+
+    def restore_timer_checkpoint(self):
+        """Restore the timer and its project from the last checkpoint."""
+        state = self.timer_checkpoint.load()
+        if state is None:
+            return
+        # book the restored time on the project the timer was running for
+        project_id = state.pop("project_id", None)
+        if project_id is not None:
+            self.select_project_in_dropdown(project_id)
+        project_timer_states = state.pop("project_timers", [])
+        self.time_manager.restore_state(state)
+        self.flushed_minutes = self.time_manager.counted_minutes - self.time_manager.productiv_minutes
+        for project_timer_state in project_timer_states:
+            if ProjectManagement.get_name_by_id(project_timer_state["project_id"], self.conn) is None:
+                continue  # the project was deleted
+            project_timer = self.add_project_timer(project_timer_state["project_id"])
+            project_timer.on_state_changed = None  # don't checkpoint a half restored state
+            project_timer.restore_state(project_timer_state)
+            project_timer.on_state_changed = self.handle_timer_state_changed
+        print(f"Restored {self.time_manager.selected_timer} ({self.time_manager.mode}) from checkpoint")  # Debug
+
+    def select_project_in_dropdown(self, project_id: int):
+        """Select a project in the dropdown menu, clear the filter if it hides the project."""
+        row = self.project_list_model.row_of_id(project_id)
+        if row == -1 and self.projects_filter_input.text():
+            self.projects_filter_input.clear()
+            row = self.project_list_model.row_of_id(project_id)
+        if row != -1:
+            self.projects_dropdown.setCurrentIndex(row)
+
+    def is_valid_project_name(self, name: str):
+        """A project name must not be empty and must not be used by another project."""
+        return bool(name.strip()) and \
+            ProjectManagement.is_name_available(name, self.conn, self.current_project.id)
 
     def validate_timer_input(self, input_text):
         """
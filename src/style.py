@@ -0,0 +1,93 @@
+from PyQt6.QtWidgets import QWidget
+from src.constants import COLOR_BEIGE_HEX, COLOR_OCEANBAY_HEX, COLOR_ROSE_HEX, COLOR_RED_HEX, COLOR_SOFTCORAL_HEX
+
+# Stylesheet of the main window, set once and parsed once. Widgets are styled by their type,
+# special widgets by object name (setObjectName), states by dynamic properties (see set_invalid).
+STYLESHEET = f"""
+QWidget {{
+    background-color: {COLOR_BEIGE_HEX};
+}}
+QWidget#separator {{
+    background-color: {COLOR_OCEANBAY_HEX};
+}}
+
+QLabel {{
+    font-size: 16px;
+    font-weight: bold;
+    color: {COLOR_OCEANBAY_HEX};
+}}
+QLabel#heading {{
+    font-size: 24px;
+}}
+QLabel#clock {{
+    font-size: 20px;
+}}
+QLabel#error {{
+    font-size: 20px;
+    color: {COLOR_RED_HEX};
+}}
+QLabel#report {{
+    font-size: 14px;
+    font-weight: normal;
+}}
+
+QPushButton {{
+    font-size: 16px;
+    font-weight: bold;
+    padding: 10px;
+    color: {COLOR_OCEANBAY_HEX};
+    border: 1px solid {COLOR_OCEANBAY_HEX};
+    background-color: transparent;
+}}
+QPushButton:hover {{
+    background-color: {COLOR_ROSE_HEX};
+}}
+QPushButton:pressed {{
+    background-color: {COLOR_OCEANBAY_HEX};
+}}
+
+QLineEdit, QDateEdit {{
+    font-size: 14px;
+    font-weight: bold;
+    padding: 5px;
+    color: {COLOR_OCEANBAY_HEX};
+    border: 2px solid {COLOR_SOFTCORAL_HEX};
+}}
+QLineEdit#timeInput {{
+    font-size: 16px;
+}}
+QLineEdit#search {{
+    font-weight: normal;
+    border: 1px solid {COLOR_OCEANBAY_HEX};
+}}
+QComboBox {{
+    font-size: 16px;
+    font-weight: bold;
+    padding: 5px;
+    color: {COLOR_OCEANBAY_HEX};
+    border: 1px solid {COLOR_OCEANBAY_HEX};
+}}
+QPlainTextEdit {{
+    font-size: 16px;
+    padding: 5px;
+    color: {COLOR_OCEANBAY_HEX};
+    border: 1px solid {COLOR_OCEANBAY_HEX};
+}}
+
+*[invalid="true"] {{
+    color: red;
+    border: 2px solid red;
+}}
+"""
+
+
+def set_invalid(widget: QWidget, invalid: bool):
+    """
+    Mark an input as invalid (red) or valid via the dynamic property "invalid".
+    Only this widget is polished again, the stylesheet is not parsed again.
+    """
+    if bool(widget.property("invalid")) == invalid:
+        return
+    widget.setProperty("invalid", invalid)
+    widget.style().unpolish(widget)
+    widget.style().polish(widget)
@@ -1,11 +1,33 @@
-from PyQt6.QtCore import QTime, QTimer
+import time
+from PyQt6.QtCore import QTime
+from src.timerscheduler import TimerScheduler
 
 
 class TimeManagement:
-    def __init__(self):
+    """
+    A single pomodoro, timer or stopwatch.
+
+    The timer does not own a QTimer. Its ticks are scheduled on a TimerScheduler,
+    so any number of TimeManagement instances can share one OS timer.
+
+    Parameters:
+        scheduler (TimerScheduler, optional): Shared scheduler. A private one is created if omitted.
+        project_id (int, optional): Project the tracked time belongs to.
+            None means "the currently selected project".
+        tick_interval (int, optional): Seconds between ticks. Background timers without a clock
+            display can use 60 to be woken up only once per minute. Defaults to 1.
+
+    Attributes:
+        productiv_minutes (int): Full minutes passed that were not yet booked by the session.
+        counted_minutes (int): All full minutes counted by this timer (never reset).
+        on_state_changed (callable): Called with this instance on every state transition.
+    """
+    def __init__(self, scheduler=None, project_id=None, tick_interval=1):
+        self.scheduler = scheduler or TimerScheduler()
+        self.project_id = project_id
+        self.tick_interval = tick_interval
         self.selected_timer = "pomodoro"  # "pomodoro", "timer", "stoppwatch"
         self.mode = "stopped"  # "stopped", "running", "paused"
-        self.timer = QTimer()
         self.elapsed_time = QTime(0, 0, 0)
         self.target_time = QTime(0, 0, 0)
         self.remaining_time = QTime(0, 0, 0)
@@ -13,16 +35,16 @@ class TimeManagement:
         self.pomodoro_work_time = QTime(0, 25, 0)
         self.pomodoro_break_time = QTime(0, 5, 0)
         self.productiv_minutes = 0
+        self.counted_minutes = 0
+        self.on_state_changed = None
+        self._tick_handle = None
+        self._tick_deadline = 0.0
+        self._tick_step = 0
 
     def start_stopwatch(self):
-        # Safely disconnect to avoid conflicts
-        try:
-            self.timer.timeout.disconnect(self.increment_time)  # For stopwatch
-        except TypeError:
-            pass  # Ignore if no connection exists
-        self.timer.timeout.connect(self.increment_time)
-        self.timer.start(1000)
+        self._start_ticking()
         self.mode = "running"
+        self._state_changed()
 
     def set_timer(self, hours=0, minutes=0, seconds=0):
         """Set the timer's target time."""
@@ -32,15 +54,9 @@ class TimeManagement:
 
     def start_timer(self):
         """Start the timer countdown."""
-        # print("Starting timer...")  # Debug message
-        # Safely disconnect to avoid conflicts
-        try:
-            self.timer.timeout.disconnect(self.increment_time)  # For stopwatch
-        except TypeError:
-            pass  # Ignore if no connection exists
-        self.timer.timeout.connect(self.increment_time)
-        self.timer.start(1000)
+        self._start_ticking()
         self.mode = "running"
+        self._state_changed()
 
     def set_pomodoro_time(self, wh=0, wm=25, ws=0, bh=0, bm=5, bs=0):
         """Set the time based on the current phase and manual input."""
@@ -54,7 +70,7 @@ class TimeManagement:
             self.set_timer(self.pomodoro_break_time.hour(),
                            self.pomodoro_break_time.minute(),
                            self.pomodoro_break_time.second())
-    
+
     def start_pomodoro(self):
         """Starts the pomodoro-timer."""
         self.is_work_phase = True  # start with work phase
@@ -74,20 +90,23 @@ class TimeManagement:
                            self.pomodoro_break_time.second())
         self.start_timer()
 
-    def increment_time(self):
+    def increment_time(self, seconds=1):
         """Increment the stopwatches elapsed time."""
-        self.elapsed_time = self.elapsed_time.addSecs(1)
+        seconds_in_minute = self.elapsed_time.second()
+        self.elapsed_time = self.elapsed_time.addSecs(seconds)
         print(f"Time elapsed: {self.elapsed_time.toString("hh:mm:ss")}")  # Debug message
-        if self.elapsed_time.second() == 0:  # 1 minute passed
-            self.productiv_minutes += 1
+        minutes_passed = (seconds_in_minute + seconds) // 60  # full minutes passed
+        self.productiv_minutes += minutes_passed
+        self.counted_minutes += minutes_passed
         if self.selected_timer != "stopwatch":
             self.update_remaining_time()
             if self.remaining_time == QTime(0, 0, 0):
                 if self.selected_timer == "pomodoro":
                     self.switch_pomodoro_phase()
                 elif self.selected_timer == "timer":
-                    self.timer.stop()
+                    self._stop_ticking()
                     self.mode = "stopped"
+                    self._state_changed()
                     print("Timer reached zero!")
 
     def update_remaining_time(self):
@@ -100,21 +119,118 @@ class TimeManagement:
 
     def pause(self):
         """Pause the timer or stopwatch."""
-        self.timer.stop()
+        if self._tick_handle is not None:
+            # keep the seconds that already passed since the last tick
+            passed = int(self.scheduler.clock() - (self._tick_deadline - self._tick_step))
+            self._stop_ticking()
+            if 0 < passed < self._tick_step:
+                self.increment_time(passed)
         self.mode = "paused"
+        self._state_changed()
 
     def resume(self):
         """Resume the timer or stopwatch from the paused state."""
-        self.timer.start(1000)  # Restart the timer
+        self._start_ticking()  # Restart the timer
         self.mode = "running"  # Change state to running
-    
+        self._state_changed()
+
     def stop(self):
-        self.timer.stop()
+        self._stop_ticking()
         self.elapsed_time = QTime(0, 0, 0)
         self.remaining_timem = QTime(0, 0, 0)
         self.mode = "stopped"
-  
+        self._state_changed()
+
     def set_timer_mode(self, timer_mode: str):
         """Set the timer mode to either 'pomodoro', 'timer' or 'stopwatch'."""
         self.selected_timer = timer_mode
         self.stop()  # Reset the timer/stopwatch
+
+    def get_state(self):
+        """Return the timer state as a json serializable dict (see restore_state)."""
+        return {
+            "selected_timer": self.selected_timer,
+            "mode": self.mode,
+            "is_work_phase": self.is_work_phase,
+            "project_id": self.project_id,
+            "pomodoro_work_secs": self.pomodoro_work_time.msecsSinceStartOfDay() // 1000,
+            "pomodoro_break_secs": self.pomodoro_break_time.msecsSinceStartOfDay() // 1000,
+            "target_secs": self.target_time.msecsSinceStartOfDay() // 1000,
+            "elapsed_secs": self.elapsed_time.msecsSinceStartOfDay() // 1000,
+            "tick_started_at": self._tick_started_at(),
+            "saved_at": time.time(),
+            "counted_minutes": self.counted_minutes,
+            "unbooked_minutes": self.productiv_minutes,
+        }
+
+    def restore_state(self, state: dict):
+        """
+        Restore a state returned by get_state.
+        The time up to the checkpoint (including a started tick) and the minutes
+        that were not booked at that time are restored. The time the app was not
+        running is not tracked: a running timer is restored paused and can be resumed.
+        """
+        self._stop_ticking()
+        self.selected_timer = state["selected_timer"]
+        self.is_work_phase = state["is_work_phase"]
+        self.project_id = state.get("project_id", self.project_id)
+        self.pomodoro_work_time = QTime(0, 0, 0).addSecs(state["pomodoro_work_secs"])
+        self.pomodoro_break_time = QTime(0, 0, 0).addSecs(state["pomodoro_break_secs"])
+        self.target_time = QTime(0, 0, 0).addSecs(state["target_secs"])
+        elapsed = state["elapsed_secs"]
+        if state["mode"] == "running" and state.get("tick_started_at") is not None:
+            # seconds between the last tick and the checkpoint, at most one tick
+            passed = int(state.get("saved_at", state["tick_started_at"]) - state["tick_started_at"])
+            elapsed += min(max(0, passed), self.tick_interval)
+            if self.selected_timer != "stopwatch":
+                elapsed = min(elapsed, state["target_secs"])  # a countdown ends at its target
+        minutes_passed = elapsed // 60 - state["elapsed_secs"] // 60
+        self.elapsed_time = QTime(0, 0, 0).addSecs(elapsed)
+        self.counted_minutes = state["counted_minutes"] + minutes_passed
+        self.productiv_minutes = state.get("unbooked_minutes", 0) + minutes_passed
+        self.update_remaining_time()
+        self.mode = "paused" if state["mode"] == "running" else state["mode"]
+        self._state_changed()
+
+    def _tick_started_at(self):
+        """Wall clock time at which the elapsed time was last advanced (None if not running)."""
+        if self._tick_handle is None:
+            return None
+        return time.time() - (self.scheduler.clock() - (self._tick_deadline - self._tick_step))
+
+    def _state_changed(self):
+        if self.on_state_changed is not None:
+            self.on_state_changed(self)
+
+    def _next_step(self):
+        """Seconds until the next tick: the tick interval, but never past the end of a countdown."""
+        step = self.tick_interval
+        if self.selected_timer != "stopwatch":
+            remaining_seconds = self.target_time.msecsSinceStartOfDay() // 1000 - \
+                                self.elapsed_time.msecsSinceStartOfDay() // 1000
+            if remaining_seconds > 0:
+                step = min(step, remaining_seconds)
+        return step
+
+    def _start_ticking(self):
+        """(Re)start ticking from now on the shared scheduler."""
+        self._stop_ticking()
+        self._schedule_tick(self.scheduler.clock())
+
+    def _schedule_tick(self, start: float):
+        self._tick_step = self._next_step()
+        self._tick_deadline = start + self._tick_step
+        self._tick_handle = self.scheduler.call_at(self._tick_deadline, self._on_tick)
+
+    def _stop_ticking(self):
+        self.scheduler.cancel(self._tick_handle)
+        self._tick_handle = None
+
+    def _on_tick(self):
+        """Called by the scheduler. Advances the time and schedules the next tick."""
+        self._tick_handle = None
+        deadline = self._tick_deadline
+        self.increment_time(self._tick_step)
+        # a phase switch may have restarted ticking already
+        if self.mode == "running" and self._tick_handle is None:
+            self._schedule_tick(deadline)  # based on the deadline to avoid drift
@@ -0,0 +1,75 @@
+import heapq
+import itertools
+import math
+import time
+from PyQt6.QtCore import Qt, QTimer
+from src.profiling import profiled
+
+
+class TimerScheduler:
+    """
+    Drive any number of timers with a single QTimer.
+
+    All pending deadlines are kept in a priority queue (heap) and only the
+    nearest one arms the underlying QTimer. When it fires, every due callback
+    is run and the QTimer is re-armed for the next deadline.
+
+    Parameters:
+        parent (QObject, optional): The parent of the internal QTimer. Defaults to None.
+        clock (callable, optional): Monotonic clock returning seconds. Defaults to time.monotonic.
+        profiler (Profiler, optional): Profiles the fired callbacks (see profiling.py). Defaults to None.
+
+    Example:
+        scheduler = TimerScheduler()
+        handle = scheduler.call_later(1.5, lambda: print("fired"))
+        scheduler.cancel(handle)
+    """
+    def __init__(self, parent=None, clock=time.monotonic, profiler=None):
+        self.clock = clock
+        self._heap = []
+        self._counter = itertools.count()  # tie-breaker for equal deadlines
+        self._timer = QTimer(parent)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(profiled(self._fire, profiler))
+
+    def call_at(self, deadline: float, callback):
+        """Schedule callback at the given clock time and return a handle to cancel it."""
+        entry = [deadline, next(self._counter), callback, True]
+        heapq.heappush(self._heap, entry)
+        if self._heap[0] is entry:  # new nearest deadline
+            self._arm()
+        return entry
+
+    def call_later(self, delay: float, callback):
+        """Schedule callback in `delay` seconds and return a handle to cancel it."""
+        return self.call_at(self.clock() + delay, callback)
+
+    def cancel(self, handle):
+        """Cancel a scheduled callback. Cancelled entries are dropped lazily."""
+        if handle is not None:
+            handle[3] = False
+
+    def pending(self):
+        """Return the number of callbacks that are still scheduled."""
+        return sum(1 for entry in self._heap if entry[3])
+
+    def _arm(self):
+        """Arm the QTimer for the nearest active deadline (or stop it if there is none)."""
+        while self._heap and not self._heap[0][3]:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            self._timer.stop()
+            return
+        delay_ms = max(0, math.ceil((self._heap[0][0] - self.clock()) * 1000))
+        self._timer.start(delay_ms)
+
+    def _fire(self):
+        """Run all callbacks whose deadline has passed."""
+        now = self.clock()
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if entry[3]:
+                entry[3] = False
+                entry[2]()
+        self._arm()
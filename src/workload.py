@@ -0,0 +1,208 @@
+import datetime
+import json
+import os
+import random
+import sqlite3
+from src.constants import ROWS, COLS, POINTS_SNAPSHOT_INTERVAL
+from src.database import connect, migrate
+from src.gardenobjects import VEGETATION_DATA
+from src.persistence import write_json_atomic
+
+# Synthetic data for load and soak tests: projects with years of tracked time, points histories,
+# gardens and settings. Everything is drawn from one random.Random(seed), so the same seed
+# (and end date) always generates the same data. Rows are inserted with executemany from
+# generators in one transaction and map files are written row by row, nothing is held in memory.
+
+PROJECT_TYPES = ("study", "work", "sport", "music", "reading", "household", "")
+DESCRIPTION_WORDS = ("weekly", "exam", "report", "practice", "review", "draft", "course", "plan", "notes", "release")
+TIMER_SETTINGS = ("00:15:00", "00:25:00", "00:45:00", "00:50:00", "01:00:00")
+BREAK_SETTINGS = ("00:05:00", "00:10:00", "00:15:00")
+
+
+def _day_strings(end_date: datetime.date, days: int):
+    """Return the ISO strings of the `days` days up to `end_date`, the oldest first."""
+    first = end_date - datetime.timedelta(days=days - 1)
+    return [(first + datetime.timedelta(days=offset)).isoformat() for offset in range(days)]
+
+
+def generate_projects(connection: sqlite3.Connection, rng: random.Random, count: int, years: int,
+                      end_date: datetime.date):
+    """
+    Insert `count` projects, each active during a random part of the last `years` years with
+    one to three time entries on its active days. Returns (number of projects, number of time entries).
+
+    The rollup trigger of time_entries is dropped while inserting, the rollups of the new
+    entries are then built with one grouped query and the trigger is created again
+    (all in one transaction, so a failed run changes nothing).
+    """
+    days = _day_strings(end_date, years * 365)
+    first_id = (connection.execute("SELECT COALESCE(MAX(id), 0) FROM projects_all").fetchone()[0]) + 1
+    first_entry_id = connection.execute("SELECT COALESCE(MAX(id), 0) FROM time_entries").fetchone()[0]
+    projects = []  # (id, name, description, type, start day, end day, status)
+    entry_count = 0
+
+    def entries():
+        nonlocal entry_count
+        for project_id, _, _, _, start, end, _ in projects:
+            activity = rng.uniform(0.1, 0.7)  # share of the days with tracked time
+            for day in days[start:end + 1]:
+                if rng.random() >= activity:
+                    continue
+                for _ in range(rng.randint(1, 3)):
+                    entry_count += 1
+                    time_of_day = f"{rng.randint(6, 22):02d}:{rng.randint(0, 59):02d}:00"
+                    yield project_id, rng.randint(5, 120), f"{day} {time_of_day}"
+
+    for project_id in range(first_id, first_id + count):
+        start = rng.randrange(len(days))
+        end = min(len(days) - 1, start + rng.randint(7, 2 * 365))
+        status = "active" if end >= len(days) - 30 else rng.choice(("completed", "completed", "paused"))
+        description = " ".join(rng.sample(DESCRIPTION_WORDS, 3))
+        projects.append((project_id, f"Generated {project_id:06d}", description, rng.choice(PROJECT_TYPES),
+                         start, end, status))
+
+    trigger_sql = connection.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'time_entries_rollup'").fetchone()[0]
+    with connection:  # one transaction, also for the trigger (DDL doesn't open one implicitly)
+        connection.execute("BEGIN")
+        connection.executemany('''
+            INSERT INTO projects (id, name, description, type, time_tracked, start_date, end_date, status)
+            VALUES (?, ?, ?, ?, 0, ?, ?, ?)
+        ''', ((project_id, name, description, project_type, days[start], days[end], status)
+              for project_id, name, description, project_type, start, end, status in projects))
+        connection.execute("DROP TRIGGER time_entries_rollup")
+        connection.executemany("INSERT INTO time_entries (project_id, minutes, recorded_at) VALUES (?, ?, ?)",
+                               entries())
+        connection.execute('''
+            INSERT INTO time_rollup_daily (project_id, day, minutes)
+            SELECT project_id, date(recorded_at), SUM(minutes) FROM time_entries WHERE id > ?
+            GROUP BY project_id, date(recorded_at)
+            ON CONFLICT (project_id, day) DO UPDATE SET minutes = minutes + excluded.minutes
+        ''', (first_entry_id,))
+        connection.execute('''
+            INSERT INTO time_rollup_weekly (project_id, week, minutes)
+            SELECT project_id, date(recorded_at, '-6 days', 'weekday 1'), SUM(minutes)
+            FROM time_entries WHERE id > ?
+            GROUP BY project_id, date(recorded_at, '-6 days', 'weekday 1')
+            ON CONFLICT (project_id, week) DO UPDATE SET minutes = minutes + excluded.minutes
+        ''', (first_entry_id,))
+        connection.execute(trigger_sql)
+        connection.execute('''
+            UPDATE projects SET time_tracked = (
+                SELECT COALESCE(SUM(minutes), 0) FROM time_rollup_daily WHERE project_id = projects.id
+            )
+            WHERE id >= ?
+        ''', (first_id,))
+    return count, entry_count
+
+
+def generate_points_events(connection: sqlite3.Connection, rng: random.Random, count: int, years: int,
+                           end_date: datetime.date):
+    """
+    Append `count` points events (earned on random projects, spent on garden objects while enough
+    points are available) spread over the last `years` years, with a balance snapshot every
+    POINTS_SNAPSHOT_INTERVAL events. Returns the number of events.
+    """
+    project_ids = [row[0] for row in connection.execute("SELECT id FROM projects ORDER BY id")] or [None]
+    objects = [obj["name"] for vegetation in VEGETATION_DATA.values() for obj in vegetation["objects"]]
+    gardens = [_garden_name(vegetation, i) for vegetation in VEGETATION_DATA for i in range(1, 4)]
+    first_id = connection.execute("SELECT COALESCE(MAX(id), 0) FROM points_events").fetchone()[0] + 1
+    total_points, available_points = connection.execute('''
+        WITH snapshot AS (
+            SELECT event_id, total_points, available_points FROM points_snapshots ORDER BY event_id DESC LIMIT 1
+        )
+        SELECT COALESCE((SELECT total_points FROM snapshot), 0) + COALESCE(SUM(total_delta), 0),
+               COALESCE((SELECT available_points FROM snapshot), 0) + COALESCE(SUM(available_delta), 0)
+        FROM points_events WHERE id > COALESCE((SELECT event_id FROM snapshot), 0)
+    ''').fetchone()
+    start = datetime.datetime.combine(end_date, datetime.time(23, 59)) - datetime.timedelta(days=years * 365)
+    step = years * 365 * 24 * 3600 / max(count, 1)  # events are spread evenly, with jitter
+    snapshots = []
+
+    def events():
+        nonlocal total_points, available_points
+        for i in range(count):
+            event_id = first_id + i
+            recorded_at = start + datetime.timedelta(seconds=(i + rng.random()) * step)
+            recorded_at = recorded_at.strftime("%Y-%m-%d %H:%M:%S")
+            cost = rng.randint(1, 6)
+            if rng.random() < 0.3 and available_points >= cost:
+                available_points -= cost
+                yield event_id, "spent", 0, -cost, None, rng.choice(objects), rng.choice(gardens), recorded_at
+            else:
+                total_points += cost
+                available_points += cost
+                yield event_id, "earned", cost, cost, rng.choice(project_ids), None, None, recorded_at
+            if (i + 1) % POINTS_SNAPSHOT_INTERVAL == 0:
+                snapshots.append((event_id, total_points, available_points))
+
+    with connection:
+        connection.executemany('''
+            INSERT INTO points_events (id, kind, total_delta, available_delta, project_id, object_name, garden,
+                                       recorded_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', events())
+        connection.executemany('''
+            INSERT INTO points_snapshots (event_id, total_points, available_points) VALUES (?, ?, ?)
+        ''', snapshots)
+    return count
+
+
+def _garden_name(vegetation: str, number: int):
+    return f"{vegetation.lower().replace(' ', '_')}_{number:04d}"
+
+
+def generate_gardens(map_folder: str, mapdata_file: str, rng: random.Random, per_vegetation: int):
+    """
+    Write `per_vegetation` garden maps for every vegetation, filled between 2% and 90%,
+    and register them in the garden metadata. Returns the number of gardens.
+    """
+    os.makedirs(map_folder, exist_ok=True)
+    metadata = {}
+    if os.path.isfile(mapdata_file):
+        with open(mapdata_file, "r", encoding="utf-8") as file:
+            metadata = json.load(file)
+    for vegetation, data in VEGETATION_DATA.items():
+        object_count = len(data["objects"])
+        for number in range(1, per_vegetation + 1):
+            name = _garden_name(vegetation, number)
+            density = rng.uniform(0.02, 0.9)
+            with open(map_folder + name + ".map", "w") as file:
+                for _ in range(ROWS):
+                    file.write("".join(str(rng.randint(1, object_count)) if rng.random() < density else "0"
+                                       for _ in range(COLS)) + "\n")
+            metadata[name] = {"vegetation": vegetation}
+    write_json_atomic(mapdata_file, metadata)
+    return per_vegetation * len(VEGETATION_DATA)
+
+
+def generate_settings(json_file: str, rng: random.Random):
+    """Write the timer settings of data.json (the points are stored in the database)."""
+    write_json_atomic(json_file, {
+        "pomodoro_work_input": rng.choice(TIMER_SETTINGS),
+        "pomodoro_break_input": rng.choice(BREAK_SETTINGS),
+        "timer_input_field": rng.choice(TIMER_SETTINGS),
+    })
+
+
+def generate(profile, seed=0, projects=1000, years=3, gardens_per_vegetation=100, points_events=100000,
+             end_date=None):
+    """
+    Fill a profile with synthetic data, return the numbers of generated rows and files.
+
+    Example:
+        counts = generate(get_profile("loadtest"), seed=42, projects=5000, years=5)
+    """
+    end_date = end_date or datetime.date.today()
+    rng = random.Random(seed)
+    connection = connect(profile.db_file)
+    try:
+        migrate(connection)
+        project_count, entry_count = generate_projects(connection, rng, projects, years, end_date)
+        event_count = generate_points_events(connection, rng, points_events, years, end_date)
+    finally:
+        connection.close()
+    garden_count = generate_gardens(profile.map_folder, profile.mapdata_file, rng, gardens_per_vegetation)
+    generate_settings(profile.json_file, rng)
+    return {"projects": project_count, "time_entries": entry_count, "points_events": event_count,
+            "gardens": garden_count}
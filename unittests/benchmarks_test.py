@@ -0,0 +1,32 @@
+import os
+import tempfile
+import unittest
+from PyQt6.QtWidgets import QApplication
+from benchmarks import data_layer
+
+
+class TestBenchmarks(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_compare(self):
+        baseline = {"a[100]": {"min_us": 1000.0}, "b[100]": {"min_us": 10.0}, "c[100]": {"min_us": 100.0}}
+        results = {"a[100]": {"min_us": 2000.0}, "b[100]": {"min_us": 20.0}, "c[100]": {"min_us": 140.0},
+                   "d[100]": {"min_us": 1.0}}
+        # b is twice as slow, but only by 10 us, c is within the tolerance
+        self.assertEqual(data_layer.compare(results, baseline), [("a[100]", 1000.0, 2000.0, 2.0)])
+
+    def test_run_and_report(self):
+        results = data_layer.run(project_counts=(10,), map_sizes=((3, 4),), repeat=1)
+        self.assertIn("update_low_frequency[10]", results)
+        self.assertIn("garden_save[3x4]", results)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "report.json")
+            data_layer.write_report(data_layer.make_report(results, 1), path)
+            self.assertEqual(data_layer.load_report(path)["results"], results)
+            self.assertEqual(data_layer.compare(results, results), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from PyQt6.QtCore import QDate
+from PyQt6.QtWidgets import QApplication, QLineEdit, QDateEdit
+from src.binding import FormBinding
+
+
+class Model:
+    def __init__(self):
+        self.name = "Physics"
+        self.start_date = QDate(2024, 1, 1)
+
+
+class TestFormBinding(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.model = Model()
+        self.name_input = QLineEdit()
+        self.date_edit = QDateEdit()
+        self.form = FormBinding(self.model, validation_delay_ms=10000)
+        self.form.bind_line_edit(self.name_input, "name", validator=lambda name: bool(name.strip()))
+        self.form.bind_date_edit(self.date_edit, "start_date")
+        self.changes = []
+        self.validity = []
+        self.form.field_changed.connect(self.changes.append)
+        self.form.validity_changed.connect(lambda field, valid: self.validity.append((field, valid)))
+
+    def test_widgets_show_the_model(self):
+        self.assertEqual(self.name_input.text(), "Physics")
+        self.assertEqual(self.date_edit.date(), QDate(2024, 1, 1))
+
+    def test_changes_are_written_to_the_model(self):
+        self.date_edit.setDate(QDate(2024, 2, 1))  # no validator: written at once
+        self.assertEqual(self.model.start_date, QDate(2024, 2, 1))
+        self.name_input.setText("Math")
+        self.assertEqual(self.model.name, "Physics")  # waits for the validation
+        self.assertTrue(self.form.has_pending())
+        self.form.validate()
+        self.assertEqual(self.model.name, "Math")
+        self.assertEqual(self.changes, ["start_date", "name"])
+
+    def test_invalid_values_are_not_written(self):
+        self.name_input.setText(" ")
+        self.form.validate()
+        self.name_input.setText("")
+        self.form.validate()
+        self.assertEqual(self.model.name, "Physics")
+        self.assertFalse(self.form.is_valid("name"))
+        self.name_input.setText("Math")
+        self.form.validate()
+        self.assertEqual(self.validity, [("name", False), ("name", True)])  # only on a change of validity
+
+    def test_load(self):
+        self.name_input.setText("")
+        self.model.name = "Biology"
+        self.form.load()
+        self.assertEqual(self.name_input.text(), "Biology")
+        self.assertTrue(self.form.is_valid("name"))
+        self.assertFalse(self.form.has_pending())
+        self.assertEqual(self.changes, [])  # loading doesn't write back
+
+
+if __name__ == '__main__':
+    unittest.main()
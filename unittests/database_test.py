@@ -0,0 +1,137 @@
+import os
+import tempfile
+import unittest
+import sqlite3
+from src.database import connect, migrate, get_schema_version, SCHEMA_VERSION
+
+
+class TestDatabase(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_file = os.path.join(self.tmp_dir.name, "projects.db")
+        self.conn = sqlite3.connect(self.db_file)
+
+    def tearDown(self):
+        self.conn.close()
+        self.tmp_dir.cleanup()
+
+    def get_index_names(self):
+        rows = self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'").fetchall()
+        return [row[0] for row in rows]
+
+    def test_migrate_new_database(self):
+        migrate(self.conn)
+        self.assertEqual(get_schema_version(self.conn), SCHEMA_VERSION)
+        self.assertIn("idx_projects_name", self.get_index_names())
+
+    def test_migrate_is_idempotent(self):
+        migrate(self.conn)
+        migrate(self.conn)
+        self.assertEqual(get_schema_version(self.conn), SCHEMA_VERSION)
+
+    def test_migrate_legacy_database(self):
+        self.conn.execute('''
+            CREATE TABLE projects (
+                id INTEGER PRIMARY KEY, name TEXT, description TEXT, type TEXT,
+                time_tracked INTEGER, start_date TEXT, end_date TEXT, status TEXT
+            )
+        ''')
+        self.conn.executemany('''
+            INSERT INTO projects VALUES (?, ?, "", "", ?, "2023-01-01", "2023-01-01", "active")
+        ''', [(4711, "Physics", 10), (1234, "", 5), (9999, "Physics", 20), (2000, "", 0)])
+        self.conn.commit()
+
+        migrate(self.conn)
+
+        rows = self.conn.execute("SELECT id, name, time_tracked FROM projects ORDER BY id").fetchall()
+        self.assertEqual(rows, [(1234, "Project", 5), (2000, "Project (2000)", 0),
+                                (4711, "Physics", 10), (9999, "Physics (9999)", 20)])
+        # new projects get auto-assigned IDs
+        cursor = self.conn.execute("INSERT INTO projects (name) VALUES ('Chemistry')")
+        self.assertEqual(cursor.lastrowid, 10000)
+
+    def test_migrate_backfills_time_entries(self):
+        self.conn.execute('''
+            CREATE TABLE projects (
+                id INTEGER PRIMARY KEY, name TEXT, description TEXT, type TEXT,
+                time_tracked INTEGER, start_date TEXT, end_date TEXT, status TEXT
+            )
+        ''')
+        self.conn.executemany('''
+            INSERT INTO projects VALUES (?, ?, "", "", ?, ?, "2024-01-01", "active")
+        ''', [(1, "Physics", 90, "2024-01-04"), (2, "Math", 0, "2024-01-04"), (3, "Art", 5, "")])
+        self.conn.commit()
+
+        migrate(self.conn)
+
+        rows = self.conn.execute("SELECT project_id, minutes, recorded_at FROM time_entries ORDER BY id").fetchall()
+        self.assertEqual(rows[0], (1, 90, "2024-01-04 00:00:00"))
+        self.assertEqual([row[:2] for row in rows], [(1, 90), (3, 5)])  # no entry without time
+        rows = self.conn.execute("SELECT project_id, week, minutes FROM time_rollup_weekly ORDER BY project_id")
+        self.assertEqual(rows.fetchall()[0], (1, "2024-01-01", 90))
+
+    def test_deleting_a_project_deletes_its_time(self):
+        migrate(self.conn)
+        self.conn.execute("INSERT INTO projects (id, name) VALUES (1, 'Physics')")
+        self.conn.execute("INSERT INTO time_entries (project_id, minutes) VALUES (1, 30)")
+        self.conn.execute("DELETE FROM projects WHERE id = 1")
+        for table in ("time_entries", "time_rollup_daily", "time_rollup_weekly"):
+            self.assertEqual(self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0], 0)
+
+    def test_search_index_follows_projects(self):
+        migrate(self.conn)
+        self.conn.execute("INSERT INTO projects (id, name) VALUES (1, 'Physics')")
+        self.conn.execute("INSERT INTO projects (id, name, description) VALUES (2, 'Math', 'Algebra')")
+        self.conn.execute("UPDATE projects SET name = 'Biology' WHERE id = 1")
+        self.conn.execute("DELETE FROM projects WHERE id = 2")
+        self.conn.execute("INSERT INTO projects (id, name) VALUES (3, 'Café')")
+
+        def search(query):
+            rows = self.conn.execute("SELECT rowid FROM projects_fts WHERE projects_fts MATCH ?", (query,))
+            return [row[0] for row in rows]
+        self.assertEqual(search("biology"), [1])
+        self.assertEqual(search("physics"), [])
+        self.assertEqual(search("algebra"), [])
+        self.assertEqual(search("cafe"), [3])  # diacritics are ignored
+
+    def test_newer_schema_is_rejected(self):
+        self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+        with self.assertRaises(RuntimeError):
+            migrate(self.conn)
+
+    def test_connect_pragmas(self):
+        conn = connect(self.db_file)
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 1)  # NORMAL
+        self.assertEqual(conn.execute("PRAGMA temp_store").fetchone()[0], 2)  # MEMORY
+        conn.close()
+
+    def test_connect_while_database_is_locked(self):
+        self.conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+        self.conn.execute("INSERT INTO items DEFAULT VALUES")  # write transaction stays open
+        conn = connect(self.db_file)  # WAL can't be enabled now, the connection still works
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "delete")
+        self.conn.commit()
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM items").fetchone()[0], 1)
+        conn.close()
+
+    def test_reader_is_not_blocked_by_writer(self):
+        writer = connect(self.db_file)
+        migrate(writer)
+        writer.execute("INSERT INTO projects (name) VALUES ('Physics')")
+        writer.commit()
+        writer.execute("BEGIN IMMEDIATE")
+        writer.execute("UPDATE projects SET time_tracked = 10")  # write transaction stays open
+
+        reader = connect(self.db_file, readonly=True)
+        self.assertEqual(reader.execute("SELECT name, time_tracked FROM projects").fetchall(), [("Physics", 0)])
+        with self.assertRaises(sqlite3.OperationalError):
+            reader.execute("DELETE FROM projects")
+        writer.commit()
+        self.assertEqual(reader.execute("SELECT time_tracked FROM projects").fetchone()[0], 10)
+        reader.close()
+        writer.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
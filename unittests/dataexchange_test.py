@@ -0,0 +1,126 @@
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+import sqlite3
+import cli
+from src.database import migrate
+from src import dataexchange
+from src.profiles import create_profile, get_profile, list_profiles
+
+
+class TestDataExchange(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_file = os.path.join(self.tmp_dir.name, "projects.db")
+        self.conn = sqlite3.connect(self.db_file)
+        migrate(self.conn)
+        self.conn.execute('''
+            INSERT INTO projects (name, description, type, time_tracked, start_date, end_date)
+            VALUES ('Physics', 'Waves, "optics"', 'study', 45, '2024-01-01', '2024-06-30')
+        ''')
+        self.conn.execute("INSERT INTO projects (name, time_tracked) VALUES ('Math', 0)")
+        self.conn.execute("INSERT INTO time_entries (project_id, minutes, recorded_at) VALUES (1, 30, '2024-01-02 10:00:00')")
+        self.conn.execute("INSERT INTO time_entries (project_id, minutes, recorded_at) VALUES (1, 15, '2024-01-09 10:00:00')")
+        self.conn.commit()
+        self.target = sqlite3.connect(":memory:")
+        migrate(self.target)
+
+    def tearDown(self):
+        self.target.close()
+        self.conn.close()
+        self.tmp_dir.cleanup()
+
+    def roundtrip(self, file_format):
+        projects, entries = io.StringIO(), io.StringIO()
+        self.assertEqual(dataexchange.export_projects(self.conn, projects, file_format), 2)
+        self.assertEqual(dataexchange.export_time_entries(self.conn, entries, file_format), 2)
+        projects.seek(0)
+        entries.seek(0)
+        self.assertEqual(dataexchange.import_projects(self.target, projects, file_format), 2)
+        self.assertEqual(dataexchange.import_time_entries(self.target, entries, file_format), 2)
+        sql = "SELECT name, description, type, time_tracked, start_date, end_date, status FROM projects ORDER BY id"
+        self.assertEqual(self.target.execute(sql).fetchall(), self.conn.execute(sql).fetchall())
+        self.assertEqual(self.target.execute("SELECT week, minutes FROM time_rollup_weekly").fetchall(),
+                         [("2024-01-01", 30), ("2024-01-08", 15)])
+
+    def test_roundtrip_csv(self):
+        self.roundtrip("csv")
+
+    def test_roundtrip_jsonl(self):
+        self.roundtrip("jsonl")
+
+    def test_import_conflicts(self):
+        file = io.StringIO('{"name": "Physics", "time_tracked": 99}\n{"name": "Chemistry"}\n')
+        self.assertEqual(dataexchange.import_projects(self.conn, file, "jsonl", on_conflict="skip"), 1)
+        self.assertEqual(self.conn.execute("SELECT time_tracked FROM projects WHERE name = 'Physics'").fetchone()[0], 45)
+
+        file = io.StringIO('{"name": "Physics", "description": "Optics", "time_tracked": 99}\n')
+        self.assertEqual(dataexchange.import_projects(self.conn, file, "jsonl", on_conflict="update"), 1)
+        # the tracked time stays the sum of the time entries
+        self.assertEqual(self.conn.execute("SELECT description, time_tracked FROM projects WHERE name = 'Physics'")
+                         .fetchone(), ("Optics", 45))
+
+        file = io.StringIO('{"name": "Biology"}\n{"name": "Math"}\n')
+        with self.assertRaises(sqlite3.IntegrityError):
+            dataexchange.import_projects(self.conn, file, "jsonl", on_conflict="fail")
+        # the whole import was rolled back
+        self.assertIsNone(self.conn.execute("SELECT id FROM projects WHERE name = 'Biology'").fetchone())
+
+    def test_invalid_rows_roll_back(self):
+        file = io.StringIO("name,time_tracked\nBiology,10\n,5\n")
+        with self.assertRaises(ValueError):
+            dataexchange.import_projects(self.conn, file, "csv")
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM projects").fetchone()[0], 2)
+
+    def test_time_entries_of_unknown_projects_are_skipped(self):
+        file = io.StringIO("project,minutes,recorded_at\nPhysics,5,2024-02-01 08:00:00\nArt,5,2024-02-01 08:00:00\n")
+        self.assertEqual(dataexchange.import_time_entries(self.conn, file, "csv"), 1)
+
+    def test_duplicate_time_entries(self):
+        entries = io.StringIO()
+        dataexchange.export_time_entries(self.conn, entries, "csv")
+        entries.seek(0)
+        self.assertEqual(dataexchange.import_time_entries(self.conn, entries, "csv"), 0)  # the same export again
+        entries.seek(0)
+        self.assertEqual(dataexchange.import_time_entries(self.conn, entries, "csv", on_conflict="update"), 0)
+        self.assertEqual(self.conn.execute("SELECT week, minutes FROM time_rollup_weekly ORDER BY week").fetchall(),
+                         [("2024-01-01", 30), ("2024-01-08", 15)])
+        file = io.StringIO("project,minutes,recorded_at\nPhysics,5,2024-02-01 08:00:00\nPhysics,30,2024-01-02 10:00:00\n")
+        with self.assertRaises(sqlite3.IntegrityError):
+            dataexchange.import_time_entries(self.conn, file, "csv", on_conflict="fail")
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM time_entries").fetchone()[0], 2)  # rolled back
+        file.seek(0)
+        self.assertEqual(dataexchange.import_time_entries(self.conn, file, "csv"), 1)
+
+    def test_cli(self):
+        export_file = os.path.join(self.tmp_dir.name, "projects.jsonl")
+        self.assertEqual(cli.main(["--db", self.db_file, "export", "projects", export_file]), 0)
+        target_file = os.path.join(self.tmp_dir.name, "target.db")
+        self.assertEqual(cli.main(["--db", target_file, "import", "projects", export_file]), 0)
+        target = sqlite3.connect(target_file)
+        self.assertEqual(target.execute("SELECT name FROM projects ORDER BY id").fetchall(), [("Physics",), ("Math",)])
+        target.close()
+        self.assertEqual(cli.main(["--db", target_file, "import", "projects", export_file,
+                                   "--on-conflict", "fail"]), 1)
+
+
+    def test_cli_uses_the_database_of_the_profile(self):
+        work = create_profile("work", self.tmp_dir.name)
+        export_file = os.path.join(self.tmp_dir.name, "projects.csv")
+        with mock.patch("cli.get_active_profile", return_value=work):
+            self.assertEqual(cli.main(["import", "projects", export_file]), 1)  # no such file
+            self.assertTrue(os.path.exists(work.db_file))
+            self.assertEqual(cli.main(["export", "projects", export_file]), 0)
+        with open(export_file, encoding="utf-8") as file:
+            self.assertEqual(file.read().splitlines(), [",".join(dataexchange.PROJECT_COLUMNS)])
+        with mock.patch("cli.get_profile", side_effect=lambda name: get_profile(name, self.tmp_dir.name)), \
+                mock.patch("cli.list_profiles", side_effect=lambda: list_profiles(self.tmp_dir.name)):
+            self.assertEqual(cli.main(["--profile", "work", "import", "projects", export_file]), 0)
+            self.assertEqual(cli.main(["--profile", "home", "export", "projects", export_file]), 1)
+        self.assertFalse(os.path.exists(os.path.join(self.tmp_dir.name, "profiles", "home")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+import sqlite3
+import threading
+from PyQt6.QtCore import QCoreApplication
+from PyQt6.QtWidgets import QApplication
+from src.dbwriter import DatabaseWriter
+from src.projectmanagement import ProjectManagement
+
+
+class TestDatabaseWriter(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_file = os.path.join(self.tmp_dir.name, "projects.db")
+        self.conn = sqlite3.connect(self.db_file)
+        self.conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT UNIQUE)")
+        self.conn.commit()
+        self.writer = DatabaseWriter(self.db_file)
+
+    def tearDown(self):
+        self.writer.close()
+        self.conn.close()
+        self.tmp_dir.cleanup()
+
+    def test_writes_are_committed(self):
+        committed = []
+        self.writer.writes_committed.connect(committed.append)
+        tickets = [self.writer.execute("INSERT INTO items (name) VALUES (?)", (f"item {i}",)) for i in range(10)]
+        self.writer.flush()
+        QCoreApplication.processEvents()  # deliver the signals to this (GUI) thread
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM items").fetchone()[0], 10)
+        self.assertEqual(self.writer.committed_ticket, tickets[-1])
+        self.assertEqual(committed[-1], tickets[-1])
+
+    def test_failing_write_is_reported(self):
+        errors = []
+        self.writer.write_failed.connect(errors.append)
+        self.writer.execute("INSERT INTO items (name) VALUES ('a')")
+        self.writer.execute("INSERT INTO items (name) VALUES ('a')")  # violates UNIQUE
+        self.writer.execute("INSERT INTO items (name) VALUES ('b')")
+        self.writer.flush()
+        QCoreApplication.processEvents()
+        self.assertEqual(len(errors), 1)
+        names = [row[0] for row in self.conn.execute("SELECT name FROM items ORDER BY name")]
+        self.assertEqual(names, ["a", "b"])  # only the failing statement is lost
+
+    def test_writer_survives_connection_errors(self):
+        errors = []
+        writer = DatabaseWriter(os.path.join(self.tmp_dir.name, "missing", "projects.db"))
+        writer.write_failed.connect(errors.append)
+        writer.execute("INSERT INTO items (name) VALUES ('a')")
+        writer.flush()  # returns although the database can't be opened
+        QCoreApplication.processEvents()
+        self.assertEqual(len(errors), 1)
+        writer.close()
+
+    def test_project_updates_go_through_writer(self):
+        project = ProjectManagement(self.conn, writer=self.writer)
+        project.add_time(42)
+        changes_before = self.conn.total_changes
+        project.update_data_in_sql()
+        self.assertEqual(self.conn.total_changes, changes_before)  # nothing written on this thread
+        self.writer.flush()
+        self.assertEqual(self.conn.execute("SELECT time_tracked FROM projects").fetchone()[0], 42)
+
+
+    def test_switching_projects_reads_queued_updates(self):
+        project = ProjectManagement(self.conn, writer=self.writer)
+        project_a = project.id
+        project.add_project()
+        project_b = project.id
+        self.writer.flush()
+        # block the writer: another connection holds the write lock for a moment
+        blocker = sqlite3.connect(self.db_file, check_same_thread=False)
+        blocker.execute("BEGIN IMMEDIATE")
+        threading.Timer(0.3, blocker.rollback).start()
+
+        project.id = project_a
+        project.load_data_from_sql()
+        project.add_time(30)
+        project.update_data_in_sql()  # queued, the writer is blocked
+        project.id = project_b
+        project.load_data_from_sql()
+        project.id = project_a
+        project.load_data_from_sql()
+        self.assertEqual(project.get_time(), 30)
+        project.add_time(5)
+        project.update_data_in_sql()
+        self.writer.flush()
+        blocker.close()
+        self.assertEqual(self.conn.execute("SELECT time_tracked FROM projects WHERE id = ?",
+                                           (project_a,)).fetchone()[0], 35)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import time
+import unittest
+import uuid
+from PyQt6.QtWidgets import QApplication
+from src.ipc import IpcServer, IpcClient, MessageBuffer, encode_message
+
+
+def wait_until(condition, timeout=2.0):
+    """Process Qt events until `condition()` is true, return its last result."""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        QApplication.processEvents()
+        time.sleep(0.01)
+    return condition()
+
+
+class TestIpc(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.name = f"ProductivityGardenTest-{uuid.uuid4().hex[:8]}"
+        self.server = IpcServer()
+        self.assertTrue(self.server.listen(self.name))
+        self.client = IpcClient()
+
+    def tearDown(self):
+        self.client.close()
+        self.server.close()
+
+    def test_message_buffer(self):
+        buffer = MessageBuffer()
+        data = encode_message({"type": "points", "total_delta": 1}) + b"not json\n"
+        self.assertEqual(buffer.feed(data[:10]), [])
+        self.assertEqual(buffer.feed(data[10:]), [{"type": "points", "total_delta": 1}])
+
+    def test_messages_in_both_directions(self):
+        received = []
+        self.server.message_received.connect(received.append)
+        self.assertTrue(self.client.connect_to_server(self.name))
+        self.assertTrue(wait_until(lambda: self.server.client_count() == 1))
+        self.server.publish({"type": "timer", "mode": "running"})
+        messages = []
+        self.assertTrue(wait_until(lambda: messages.extend(self.client.poll()) or messages))
+        self.assertEqual(messages, [{"type": "timer", "mode": "running"}])
+        self.client.publish({"type": "points", "total_delta": 0, "available_delta": -2})
+        self.assertTrue(wait_until(lambda: received))
+        self.assertEqual(received, [{"type": "points", "total_delta": 0, "available_delta": -2}])
+
+    def test_channel_is_served_once(self):
+        self.assertFalse(IpcServer().listen(self.name))
+        self.assertFalse(IpcClient().connect_to_server(self.name + "-other"))
+
+
+if __name__ == '__main__':
+    unittest.main()
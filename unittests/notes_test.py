@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+import sqlite3
+from unittest import mock
+from PyQt6.QtWidgets import QApplication
+from src.database import migrate
+from src.notes import ProjectNotes
+from unittests.projectmanagement_test import QueueingWriter
+
+
+class TestProjectNotes(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.conn = sqlite3.connect(os.path.join(self.tmp_dir.name, "projects.db"))
+        migrate(self.conn)
+        self.conn.executemany("INSERT INTO projects (id, name) VALUES (?, ?)", [(1, "Physics"), (2, "Math")])
+        self.conn.commit()
+        self.text = ""
+        self.notes = ProjectNotes(self.conn, lambda: self.text, delay_ms=10000)
+
+    def tearDown(self):
+        self.conn.close()
+        self.tmp_dir.cleanup()
+
+    def edit(self, text):
+        self.text = text
+        self.notes.text_edited()
+
+    def test_note_is_saved_after_editing_pauses(self):
+        self.assertEqual(self.notes.load(1), "")
+        self.edit("a")
+        self.edit("ab")
+        self.assertTrue(self.notes.has_pending())
+        self.assertEqual(ProjectNotes.get_note(1, self.conn), "")  # not yet
+        self.assertTrue(self.notes.flush())
+        self.assertFalse(self.notes.flush())  # unchanged
+        self.assertEqual(ProjectNotes.get_note(1, self.conn), "ab")
+        self.assertEqual(self.notes.write_count, 1)
+
+    def test_notes_are_loaded_per_project(self):
+        self.notes.load(1)
+        self.edit("Waves")
+        self.assertEqual(self.notes.load(2), "")  # saves the note of project 1 first
+        self.assertEqual(self.notes.load(1), "Waves")
+        self.conn.execute("DELETE FROM projects WHERE id = 1")
+        self.assertEqual(ProjectNotes.get_revisions(1, self.conn), [])
+
+    def test_queued_save_is_loaded_from_memory(self):
+        writer = QueueingWriter(self.conn)
+        notes = ProjectNotes(self.conn, lambda: self.text, writer=writer, delay_ms=10000)
+        notes.load(1)
+        self.text = "Waves"
+        notes.text_edited()
+        self.text = notes.load(2)  # the editor shows the loaded note, the save of project 1 is queued
+        self.assertEqual(self.text, "")
+        self.text = notes.load(1)
+        self.assertEqual(self.text, "Waves")
+        self.assertFalse(notes.flush())  # nothing changed since the queued save
+        writer.commit()
+        self.assertEqual(notes.load(1), "Waves")
+        self.assertEqual(len(ProjectNotes.get_revisions(1, self.conn)), 1)
+        self.assertEqual(ProjectNotes.get_revisions(2, self.conn), [])
+
+    def test_revisions_and_retention(self):
+        self.notes.load(1)
+        self.edit("first")
+        self.notes.flush()
+        self.edit("first, corrected")  # shortly after: same revision
+        self.notes.flush()
+        self.assertEqual([row[1] for row in ProjectNotes.get_revisions(1, self.conn)], ["first, corrected"])
+        with mock.patch("src.notes.NOTE_REVISIONS_KEPT", 3), mock.patch("src.notes.NOTE_REVISION_MINUTES", 0):
+            for number in range(5):
+                self.edit(f"revision {number}")
+                self.notes.flush()
+        self.assertEqual([row[1] for row in ProjectNotes.get_revisions(1, self.conn)],
+                         ["revision 4", "revision 3", "revision 2"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from PyQt6.QtWidgets import QApplication
+from src.persistence import write_json_atomic, TimerCheckpoint, JsonStore
+
+
+class TestPersistence(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "checkpoint.json")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_write_json_atomic(self):
+        write_json_atomic(self.path, {"a": 1})
+        write_json_atomic(self.path, {"a": 2})
+        with open(self.path, "r") as file:
+            self.assertEqual(json.load(file), {"a": 2})
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def test_checkpoint_save_and_load(self):
+        checkpoint = TimerCheckpoint(self.path)
+        self.assertIsNone(checkpoint.load())
+        checkpoint.save({"mode": "running"})
+        self.assertEqual(checkpoint.load(), {"mode": "running"})
+        checkpoint.clear()
+        self.assertIsNone(checkpoint.load())
+
+    def test_checkpoint_corrupt_file(self):
+        with open(self.path, "w") as file:
+            file.write('{"mode": "runn')
+        self.assertIsNone(TimerCheckpoint(self.path).load())
+
+    def test_json_store_writes_only_changes(self):
+        store = JsonStore(self.path, delay_ms=10000)
+        self.assertIsNone(store.load())
+        store.save({"points": 1})
+        store.save({"points": 2})
+        self.assertFalse(os.path.exists(self.path))  # debounced
+        store.flush()
+        self.assertEqual(store.write_count, 1)
+        self.assertEqual(JsonStore(self.path).load(), {"points": 2})
+        store.save({"points": 2})
+        self.assertFalse(store.has_pending())
+        store.save({"points": 3})
+        store.save({"points": 2})  # changed back before it was written
+        self.assertFalse(store.has_pending())
+
+        store = JsonStore(self.path)
+        store.load()
+        store.save({"points": 2})  # same as the file
+        self.assertFalse(store.has_pending())
+
+    def test_json_store_debounce(self):
+        store = JsonStore(self.path, delay_ms=0)
+        store.save({"points": 1})
+        self.assertTrue(store.has_pending())
+        deadline = time.monotonic() + 5
+        while store.has_pending() and time.monotonic() < deadline:
+            QApplication.processEvents()
+        self.assertEqual(store.write_count, 1)
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,7 @@
 import unittest
+from unittest import mock
+import sqlite3
+from src.database import migrate
 from src.pointssystem import PointsSystem
 
 
@@ -29,4 +32,56 @@ class TestPointSystem(unittest.TestCase):
 
     def test_get_points(self):
         self.ps.set_points(30, 25)
-        self.assertEqual(self.ps.get_points(), (30, 25))
\ No newline at end of file
+        self.assertEqual(self.ps.get_points(), (30, 25))
+
+
+class TestPointSystemHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        migrate(self.conn)
+        self.ps = PointsSystem(self.conn)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_events_are_recorded(self):
+        self.ps.add_points(10, project_id=1)
+        self.ps.remove_points(4, object_name="tree", garden="garden_1.json")
+        self.ps.set_points(20, 6)
+        events = [event[1:7] for event in PointsSystem.get_events(self.conn)]
+        self.assertEqual(events, [("adjusted", 10, 0, None, None, None),
+                                  ("spent", 0, -4, None, "tree", "garden_1.json"),
+                                  ("earned", 10, 10, 1, None, None)])
+        self.assertEqual(PointsSystem.get_spending(self.conn), [("tree", 1, 4)])
+        self.assertEqual(PointsSystem(self.conn).get_points(), (20, 6))
+
+    def test_unchanged_points_are_not_recorded(self):
+        self.ps.set_points(0, 0)
+        self.assertFalse(self.ps.has_history())
+
+    def test_balance_is_loaded_from_snapshot(self):
+        with mock.patch("src.pointssystem.POINTS_SNAPSHOT_INTERVAL", 3):
+            for _ in range(7):
+                self.ps.add_points(2)
+            self.ps.remove_points(1)
+        self.assertEqual(self.conn.execute("SELECT event_id, total_points, available_points FROM points_snapshots "
+                                           "ORDER BY event_id").fetchall(), [(3, 6, 6), (6, 12, 12)])
+        new_ps = PointsSystem(self.conn)
+        self.assertEqual(new_ps.get_points(), (14, 13))
+        self.assertEqual(new_ps.events_since_snapshot, 2)  # only the events after the snapshot are replayed
+
+    def test_balance_at(self):
+        self.conn.executemany("INSERT INTO points_events (kind, total_delta, available_delta, recorded_at) "
+                              "VALUES (?, ?, ?, ?)", [("earned", 5, 5, "2024-01-01 10:00:00"),
+                                                      ("spent", 0, -3, "2024-01-02 10:00:00"),
+                                                      ("earned", 4, 4, "2024-01-03 10:00:00")])
+        self.conn.execute("INSERT INTO points_snapshots VALUES (2, 5, 2)")
+        self.assertEqual(PointsSystem.get_balance_at("2023-12-31", self.conn), (0, 0))
+        self.assertEqual(PointsSystem.get_balance_at("2024-01-01 12:00:00", self.conn), (5, 5))
+        self.assertEqual(PointsSystem.get_balance_at("2024-01-02 12:00:00", self.conn), (5, 2))
+        self.assertEqual(PointsSystem.get_balance_at("2024-01-04", self.conn), (9, 6))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+from src.profiles import Profile, get_profile, list_profiles, create_profile, get_active_profile, \
+    set_active_profile
+
+
+class TestProfiles(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.resources_path = self.tmp_dir.name
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_default_profile_uses_resources_folder(self):
+        profile = get_profile("default", self.resources_path)
+        self.assertEqual(profile.db_file, os.path.join(self.resources_path, "projects.db"))
+        self.assertEqual(list_profiles(self.resources_path), ["default"])
+        self.assertEqual(get_active_profile(self.resources_path), profile)
+
+    def test_create_profile(self):
+        profile = create_profile("work", self.resources_path)
+        self.assertEqual(profile, Profile("work", os.path.join(self.resources_path, "profiles", "work")))
+        self.assertTrue(os.path.isdir(profile.map_folder))
+        self.assertEqual(list_profiles(self.resources_path), ["default", "work"])
+        with self.assertRaises(ValueError):
+            create_profile("work", self.resources_path)
+        with self.assertRaises(ValueError):
+            create_profile("../work", self.resources_path)
+
+    def test_active_profile(self):
+        create_profile("work", self.resources_path)
+        set_active_profile("work", self.resources_path)
+        self.assertEqual(get_active_profile(self.resources_path).name, "work")
+        with self.assertRaises(ValueError):
+            set_active_profile("home", self.resources_path)
+        os.rmdir(get_profile("work", self.resources_path).map_folder)
+        os.rmdir(get_profile("work", self.resources_path).path)
+        self.assertEqual(get_active_profile(self.resources_path).name, "default")  # deleted profile
+
+
+if __name__ == '__main__':
+    unittest.main()
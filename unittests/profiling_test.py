@@ -0,0 +1,120 @@
+import cProfile
+import os
+import pstats
+import shutil
+import tempfile
+import tracemalloc
+import unittest
+from PyQt6.QtWidgets import QApplication
+from src.constants import PROFILING_ENV, PROFILING_INTERVAL_ENV, PROFILING_DIR_ENV, PROFILING_INTERVAL
+from src.profiling import Profiler, get_profiler, profiled, profiled_section, summarize
+from src.timerscheduler import TimerScheduler
+from unittests.ipc_test import wait_until
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def busy_function():
+    return sum(i * i for i in range(1000))
+
+
+def function_names(profile_file):
+    return {name for _, _, name in pstats.Stats(profile_file).stats}
+
+
+class TestProfiling(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.clock = FakeClock()
+        self.profiler = Profiler("test", self.directory, interval=10, clock=self.clock)
+
+    def tearDown(self):
+        if tracemalloc.is_tracing() and self.profiler._started_tracemalloc:
+            tracemalloc.stop()
+        shutil.rmtree(self.directory)
+
+    def test_disabled_costs_nothing(self):
+        self.assertIsNone(get_profiler("session", argv=[], environ={}))
+        self.assertIsNone(get_profiler("session", argv=["-platform", "offscreen"], environ={PROFILING_ENV: "0"}))
+        self.assertIs(profiled(busy_function, None), busy_function)
+        with profiled_section(None):
+            busy_function()
+
+    def test_enabled_by_flags_or_environment(self):
+        profiler = get_profiler("garden", argv=["--profiling", "--profiling-interval", "5",
+                                                "--profiling-dir", self.directory], environ={})
+        self.assertEqual((profiler.name, profiler.interval, profiler.output_dir), ("garden", 5, self.directory))
+        profiler = get_profiler("session", argv=[], environ={PROFILING_ENV: "1", PROFILING_INTERVAL_ENV: "2.5",
+                                                             PROFILING_DIR_ENV: self.directory})
+        self.assertEqual((profiler.interval, profiler.output_dir), (2.5, self.directory))
+        profiler = get_profiler("session", argv=[], environ={PROFILING_ENV: "yes", PROFILING_INTERVAL_ENV: "x"})
+        self.assertEqual(profiler.interval, PROFILING_INTERVAL)
+
+    def test_snapshots_after_the_interval(self):
+        self.profiler.start()
+        function = self.profiler.wrap(busy_function)
+        self.assertEqual(function.__name__, "busy_function")
+        function()
+        self.assertEqual(self.profiler.snapshot_count, 0)
+        self.clock.now = 10
+        function()
+        self.assertEqual(self.profiler.snapshot_count, 1)
+        profile_file = os.path.join(self.directory, "test-0001.prof")
+        self.assertIn("busy_function", function_names(profile_file))
+        snapshot = tracemalloc.Snapshot.load(os.path.join(self.directory, "test-0001.tracemalloc"))
+        self.assertTrue(snapshot.traces)
+        self.assertFalse(self.profiler.maybe_snapshot())
+        self.clock.now = 20
+        self.assertTrue(self.profiler.maybe_snapshot())
+        self.assertEqual(self.profiler.snapshot_count, 2)
+
+    def test_summary_when_stopped(self):
+        self.profiler.start()
+        self.profiler.wrap(busy_function)()
+        self.profiler.snapshot()
+        summary_file = self.profiler.stop()
+        self.assertEqual(summary_file, os.path.join(self.directory, "test-0002.txt"))
+        with open(summary_file, encoding="utf-8") as file:
+            summary = file.read()
+        self.assertIn("busy_function", summary)
+        self.assertIn("Largest allocations", summary)
+        self.assertIn("Growth since", summary)
+        empty_profile_file = os.path.join(self.directory, "empty.prof")
+        cProfile.Profile().dump_stats(empty_profile_file)
+        self.assertIn("nothing profiled", summarize(empty_profile_file))
+
+    def test_only_profiled_code_is_measured(self):
+        self.profiler.start()
+        busy_function()
+        with self.profiler.section():
+            with self.profiler.section():  # nested sections don't end the outer one
+                pass
+            self.assertEqual(len({1, 2}), 2)
+        self.profiler.stop()
+        self.assertFalse(tracemalloc.is_tracing())
+        names = function_names(os.path.join(self.directory, "test-0001.prof"))
+        self.assertIn("<built-in method builtins.len>", names)
+        self.assertNotIn("busy_function", names)
+
+    def test_timer_callbacks_are_profiled(self):
+        self.profiler.start()
+        scheduler = TimerScheduler(profiler=self.profiler)
+        calls = []
+        scheduler.call_later(0, lambda: calls.append(busy_function()))
+        self.assertTrue(wait_until(lambda: calls))
+        self.profiler.stop()
+        self.assertIn("busy_function", function_names(os.path.join(self.directory, "test-0001.prof")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+import sqlite3
+from PyQt6.QtCore import Qt, QModelIndex
+from PyQt6.QtWidgets import QApplication
+from src.database import migrate
+from src.projectlistmodel import ProjectListModel
+
+
+class TestProjectListModel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.conn = sqlite3.connect(os.path.join(self.tmp_dir.name, "projects.db"))
+        migrate(self.conn)
+        self.conn.executemany("INSERT INTO projects (name) VALUES (?)",
+                              [(f"Project {i}",) for i in range(1, 26)] + [("Physics",), ("physical exercise",)])
+        self.conn.commit()
+        self.model = ProjectListModel(self.conn, batch_size=10)
+
+    def tearDown(self):
+        self.conn.close()
+        self.tmp_dir.cleanup()
+
+    def test_rows_are_fetched_lazily(self):
+        self.assertEqual(self.model.rowCount(), 10)
+        self.assertTrue(self.model.canFetchMore(QModelIndex()))
+        self.model.fetchMore(QModelIndex())
+        self.model.fetchMore(QModelIndex())
+        self.assertEqual(self.model.rowCount(), 27)
+        self.assertFalse(self.model.canFetchMore(QModelIndex()))
+
+    def test_data_roles(self):
+        index = self.model.index(2)
+        self.assertEqual(self.model.data(index), "Project 3")
+        self.assertEqual(self.model.data(index, Qt.ItemDataRole.UserRole), 3)
+
+    def test_row_of_id_does_not_load_all_rows(self):
+        self.assertEqual(self.model.row_of_id(3), 2)
+        self.assertEqual(self.model.row_of_id(26), 10)  # pinned behind the loaded rows
+        self.assertEqual(self.model.rowCount(), 11)
+        self.assertEqual(self.model.row_of_id(999), -1)
+        # later batches are inserted in front of the pinned row, without a duplicate
+        self.model.fetchMore(QModelIndex())
+        self.model.fetchMore(QModelIndex())
+        self.assertEqual(self.model.rowCount(), 27)
+        self.assertEqual(self.model.row_of_id(26), 26)
+        self.assertEqual(self.model.data(self.model.index(26), Qt.ItemDataRole.UserRole), 26)
+        self.assertEqual(self.model.row_of_id(27), 25)
+
+    def test_new_project_is_selected_without_loading_all_rows(self):
+        self.conn.execute("INSERT INTO projects (id, name) VALUES (1000, 'Chemistry')")
+        self.model.project_added(1000, "Chemistry")
+        self.assertEqual(self.model.row_of_id(1000), 10)
+        self.assertEqual(self.model.rowCount(), 11)
+        self.model.set_filter("phy")  # doesn't match the filter
+        self.assertEqual(self.model.row_of_id(1000), -1)
+
+    def test_filter(self):
+        self.model.set_filter("phy")
+        self.assertEqual(self.model.rowCount(), 2)
+        self.model.set_filter("physic")
+        self.assertEqual([self.model.data(self.model.index(row)) for row in range(self.model.rowCount())],
+                         ["Physics", "physical exercise"])
+        self.model.set_filter("ex phy")  # every word is a prefix, in any order
+        self.assertEqual(self.model.rowCount(), 1)
+        self.model.set_filter("Project 2")
+        self.assertEqual(self.model.rowCount(), 7)  # Project 2, 20-25
+        self.model.set_filter("100%")
+        self.assertEqual(self.model.rowCount(), 0)
+        self.model.set_filter("")
+        self.assertEqual(self.model.rowCount(), 10)
+
+    def test_filter_is_ranked_and_searches_descriptions(self):
+        self.conn.execute("INSERT INTO projects (name, description) VALUES ('Lab report', 'physics lab, week 3')")
+        self.conn.execute("UPDATE projects SET description = 'Waves' WHERE name = 'Physics'")
+        self.conn.commit()
+        self.model.set_filter("physics")
+        names = [self.model.data(self.model.index(row)) for row in range(self.model.rowCount())]
+        self.assertEqual(names, ["Physics", "Lab report"])  # a name match ranks first
+        self.model.set_filter("waves")  # the index follows updates
+        self.assertEqual(self.model.data(self.model.index(0)), "Physics")
+
+    def test_project_changes(self):
+        while self.model.canFetchMore(QModelIndex()):  # load all rows
+            self.model.fetchMore(QModelIndex())
+        self.model.project_added(28, "Chemistry")
+        self.assertEqual(self.model.row_of_id(28), 27)
+        self.model.project_renamed(28, "Biology")
+        self.assertEqual(self.model.data(self.model.index(27)), "Biology")
+        self.model.project_deleted(1)
+        self.assertEqual(self.model.rowCount(), 27)
+        self.assertEqual(self.model.row_of_id(1), -1)
+
+
+if __name__ == "__main__":
+    unittest.main()
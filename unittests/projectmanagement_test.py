@@ -1,13 +1,47 @@
+import os
+import tempfile
 import unittest
 import sqlite3
+from unittest import mock
 from PyQt6.QtCore import QDate
-from src.projectmanagement import ProjectManagement, DB_FILE
+from src.projectmanagement import ProjectManagement
+from src.projectrepository import ProjectRepository
+from src.dbwriter import DatabaseWriter
+
+
+class QueueingWriter:
+    """Writer whose statements stay queued until commit(), waiting for it fails the test."""
+    def __init__(self, connection: sqlite3.Connection):
+        self.conn = connection
+        self.statements = []
+        self.last_ticket = 0
+        self.committed_ticket = 0
+
+    def execute(self, sql: str, parameters=()):
+        self.statements.append((sql, parameters))
+        self.last_ticket += 1
+        return self.last_ticket
+
+    def has_pending(self):
+        return self.committed_ticket < self.last_ticket
+
+    def flush(self):
+        raise AssertionError("the GUI thread must not wait for the writer")
+
+    def commit(self):
+        for sql, parameters in self.statements:
+            self.conn.execute(sql, parameters)
+        self.conn.commit()
+        self.statements = []
+        self.committed_ticket = self.last_ticket
 
 
 class TestProjectManagement(unittest.TestCase):
     def setUp(self):
-        # Set up a test database
-        self.conn = sqlite3.connect(DB_FILE)
+        # Set up a test database with a table in the old format (upgraded by ProjectManagement)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_file = os.path.join(self.tmp_dir.name, "projects.db")
+        self.conn = sqlite3.connect(self.db_file)
         self.cursor = self.conn.cursor()
         self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS projects (
@@ -29,6 +63,7 @@ class TestProjectManagement(unittest.TestCase):
         self.cursor.execute('DROP TABLE IF EXISTS projects')
         self.conn.commit()
         self.conn.close()
+        self.tmp_dir.cleanup()
 
     def test_add_time_and_get_time(self):
         self.project.time_tracked = 0
@@ -36,7 +71,7 @@ class TestProjectManagement(unittest.TestCase):
         self.assertEqual(self.project.get_time(), 30)
 
     def test_save_data_to_sql(self):
-        self.project.id = 1
+        self.project.id = None
         self.project.name = "Test Project"
         self.project.description = "Test Description"
         self.project.type = "Test Type"
@@ -46,13 +81,13 @@ class TestProjectManagement(unittest.TestCase):
         self.project.status = "active"
         self.project.save_data_to_sql()
 
-        self.cursor.execute('SELECT * FROM projects WHERE id = 1')
+        self.cursor.execute('SELECT * FROM projects WHERE id = ?', (self.project.id,))
         row = self.cursor.fetchone()
         self.assertIsNotNone(row)
         self.assertEqual(row[1], "Test Project")
 
     def test_update_data_in_sql(self):
-        self.project.id = 1
+        self.project.id = None
         self.project.name = "Test Project"
         self.project.description = "Test Description"
         self.project.type = "Test Type"
@@ -65,18 +100,96 @@ class TestProjectManagement(unittest.TestCase):
         self.project.name = "Updated Project"
         self.project.update_data_in_sql()
 
-        self.cursor.execute('SELECT * FROM projects WHERE id = 1')
+        self.cursor.execute('SELECT * FROM projects WHERE id = ?', (self.project.id,))
         row = self.cursor.fetchone()
         self.assertEqual(row[1], "Updated Project")
 
+    def test_update_data_in_sql_only_writes_changes(self):
+        self.assertFalse(self.project.has_changes())
+        changes_before = self.conn.total_changes
+        self.project.name = self.project.name  # same value -> no change
+        self.assertFalse(self.project.update_data_in_sql())
+        self.assertEqual(self.conn.total_changes, changes_before)
+
+        self.project.add_time(5)
+        self.project.description = "Changed"
+        self.assertTrue(self.project.has_changes())
+        with mock.patch.object(self.project, "cursor", wraps=self.project.cursor) as cursor:
+            self.assertTrue(self.project.update_data_in_sql())
+        self.assertFalse(self.project.has_changes())
+        # one statement for both fields, plus the insert of the time entry (rollups and index by triggers)
+        statements = [" ".join(call.args[0].split()[:3]) for call in cursor.execute.call_args_list]
+        self.assertEqual(statements, ["UPDATE projects SET", "INSERT INTO time_entries"])
+
+        self.cursor.execute('SELECT description, time_tracked FROM projects WHERE id = ?', (self.project.id,))
+        self.assertEqual(self.cursor.fetchone(), ("Changed", 5))
+
+    def test_add_time_records_time_entries(self):
+        self.project.add_time(30, "2024-01-03 10:00:00")
+        self.project.add_time(15, "2024-01-03 18:00:00")
+        self.project.add_time(0)  # nothing tracked, no entry
+        self.project.update_data_in_sql()
+        self.cursor.execute('SELECT minutes, recorded_at FROM time_entries WHERE project_id = ?',
+                            (self.project.id,))
+        self.assertEqual(self.cursor.fetchall(), [(30, "2024-01-03 10:00:00"), (15, "2024-01-03 18:00:00")])
+        self.cursor.execute('SELECT day, minutes FROM time_rollup_daily WHERE project_id = ?', (self.project.id,))
+        self.assertEqual(self.cursor.fetchall(), [("2024-01-03", 45)])
+        self.cursor.execute('SELECT week, minutes FROM time_rollup_weekly WHERE project_id = ?', (self.project.id,))
+        self.assertEqual(self.cursor.fetchall(), [("2024-01-01", 45)])  # monday of that week
+
+        ProjectManagement.add_time_to_project(self.project.id, 5, self.conn)
+        self.cursor.execute('SELECT COUNT(*), SUM(minutes) FROM time_entries WHERE project_id = ?',
+                            (self.project.id,))
+        self.assertEqual(self.cursor.fetchone(), (3, 50))
+
+    def add_time_entries(self):
+        """Book 10 minutes on every day from 2024-01-01 (monday) to 2024-03-31 (sunday)."""
+        day = QDate(2024, 1, 1)
+        while day <= QDate(2024, 3, 31):
+            self.project.add_time(10, day.toString("yyyy-MM-dd") + " 12:00:00")
+            day = day.addDays(1)
+        self.project.update_data_in_sql()
+
+    def test_get_time_in_range_across_weeks(self):
+        self.add_time_entries()
+        other = ProjectManagement(self.conn)
+        other.add_project()
+        other.add_time(7, "2024-01-10 08:00:00")
+        other.update_data_in_sql()
+        # wednesday to tuesday two weeks later: 5 days, one full week, 2 days
+        start, end = QDate(2024, 1, 3), QDate(2024, 1, 23)
+        self.assertEqual(ProjectManagement.get_time_in_range(start, end, self.conn, self.project.id), 210)
+        self.assertEqual(ProjectManagement.get_time_in_range(start, end, self.conn), 217)
+        # exactly full weeks (monday to sunday) and the whole period
+        self.assertEqual(ProjectManagement.get_time_in_range(QDate(2024, 1, 8), QDate(2024, 1, 21),
+                                                             self.conn, self.project.id), 140)
+        self.assertEqual(ProjectManagement.get_time_in_range(QDate(2023, 12, 1), QDate(2024, 12, 31),
+                                                             self.conn, self.project.id), 910)
+
+    def test_get_time_in_range_within_a_week(self):
+        self.add_time_entries()
+        self.assertEqual(ProjectManagement.get_time_in_range(QDate(2024, 1, 3), QDate(2024, 1, 5),
+                                                             self.conn, self.project.id), 30)
+        self.assertEqual(ProjectManagement.get_time_in_range(QDate(2024, 1, 6), QDate(2024, 1, 8),
+                                                             self.conn, self.project.id), 30)  # over a sunday
+        self.assertEqual(ProjectManagement.get_time_in_range(QDate(2024, 1, 7), QDate(2024, 1, 7),
+                                                             self.conn, self.project.id), 10)
+
+    def test_get_time_per_day_and_week(self):
+        self.add_time_entries()
+        self.assertEqual(ProjectManagement.get_time_per_day(QDate(2024, 1, 1), QDate(2024, 1, 2), self.conn),
+                         [("2024-01-01", 10), ("2024-01-02", 10)])
+        self.assertEqual(ProjectManagement.get_time_per_week(QDate(2024, 1, 1), QDate(2024, 1, 14), self.conn),
+                         [("2024-01-01", 70), ("2024-01-08", 70)])
+
     def test_load_data_from_sql(self):
         self.cursor.execute('''
             INSERT INTO projects (id, name, description, type, time_tracked, start_date, end_date, status)
-            VALUES (1, "Test Project", "Test Description", "Test Type", 60, "2023-01-01", "2023-01-01", "active")
+            VALUES (100, "Test Project", "Test Description", "Test Type", 60, "2023-01-01", "2023-01-01", "active")
         ''')
         self.conn.commit()
 
-        self.project.id = 1
+        self.project.id = 100
         self.project.load_data_from_sql()
         self.assertEqual(self.project.name, "Test Project")
         self.assertEqual(self.project.time_tracked, 60)
@@ -87,23 +200,115 @@ class TestProjectManagement(unittest.TestCase):
         row = self.cursor.fetchone()
         self.assertIsNotNone(row)
 
+    def test_add_project_assigns_unique_ids_and_names(self):
+        ids = set()
+        names = set()
+        for _ in range(20):
+            self.project.add_project()
+            ids.add(self.project.id)
+            names.add(self.project.name)
+        self.assertEqual(len(ids), 20)
+        self.assertEqual(len(names), 20)
+
+    def test_duplicate_name_is_rejected(self):
+        self.project.add_project()
+        self.assertFalse(ProjectManagement.is_name_available("New Project", self.conn, self.project.id))
+        self.assertTrue(ProjectManagement.is_name_available(self.project.name, self.conn, self.project.id))
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.project.name = "New Project"
+            self.project.update_data_in_sql()
+
     def test_delete_project(self):
         self.cursor.execute('''
             INSERT INTO projects (id, name, description, type, time_tracked, start_date, end_date, status)
-            VALUES (1, "Test Project", "Test Description", "Test Type", 60, "2023-01-01", "2023-01-01", "active")
+            VALUES (100, "Test Project", "Test Description", "Test Type", 60, "2023-01-01", "2023-01-01", "active")
         ''')
         self.conn.commit()
 
-        self.project.name = "Test Project"
+        self.project.id = 100
+        self.project.load_data_from_sql()
         self.project.delete_project()
         self.cursor.execute('SELECT * FROM projects WHERE name = "Test Project"')
         row = self.cursor.fetchone()
         self.assertIsNone(row)
 
+    def test_delete_project_with_pending_rename(self):
+        repository = ProjectRepository(self.conn)
+        writer = DatabaseWriter(self.db_file)
+        project = ProjectManagement(self.conn, repository, writer)
+        project.add_project()
+        repository.refresh()
+        project.name = "Renamed"  # queued on the writer, not yet in the database
+        project.update_data_in_sql()
+        project.delete_project()
+        writer.close()
+        self.assertNotIn(project.id, [summary[0] for summary in repository.get_summaries()])
+        self.assertIsNone(ProjectManagement.get_name_by_id(project.id, self.conn))
+
+    def test_load_takes_queued_writes_from_memory(self):
+        first_id = self.project.id
+        self.project.add_project()
+        second_id = self.project.id
+        writer = QueueingWriter(self.conn)
+        repository = ProjectRepository(self.conn, writer)
+        repository.refresh()
+        project = ProjectManagement(self.conn, repository, writer)
+        project.description = "Queued"
+        project.add_time(5)
+        project.update_data_in_sql()
+        project.id = second_id  # select the other project
+        project.load_data_from_sql()
+        ProjectManagement.add_time_to_project(first_id, 7, self.conn, repository, writer)  # background timer
+        project.id = first_id
+        project.load_data_from_sql()
+        self.assertEqual((project.description, project.get_time()), ("Queued", 12))
+        self.assertFalse(project.has_changes())
+        writer.commit()
+        project.load_data_from_sql()
+        self.assertEqual((project.description, project.get_time()), ("Queued", 12))
+
+    def test_archive_project_keeps_time(self):
+        repository = ProjectRepository(self.conn)
+        writer = DatabaseWriter(self.db_file)
+        project = ProjectManagement(self.conn, repository, writer)
+        project.add_project()
+        repository.refresh()
+        project.add_time(30, "2024-01-02 10:00:00")  # saved together with the move
+        project.archive_project()
+        writer.close()
+        self.assertIsNone(ProjectManagement.get_name_by_id(project.id, self.conn))
+        self.assertNotIn(project.id, [summary[0] for summary in repository.get_summaries()])
+        self.assertEqual(ProjectManagement.get_archived_projects(self.conn)[0][:7],
+                         (project.id, project.name, "", 30, "2024-01-02", "2024-01-02", 1))
+        self.assertEqual(ProjectManagement.get_time_in_range(QDate(2024, 1, 1), QDate(2024, 1, 7), self.conn), 30)
+
+    def test_archive_and_restore_projects(self):
+        self.cursor.executemany('''
+            INSERT INTO projects (id, name, time_tracked, status) VALUES (?, ?, 0, ?)
+        ''', [(100, "Done", "completed"), (101, "Old", "archived"), (102, "Running", "active")])
+        self.cursor.execute("INSERT INTO time_entries (project_id, minutes) VALUES (100, 15)")
+        self.conn.commit()
+        self.assertEqual(ProjectManagement.archive_projects(self.conn), 2)
+        self.assertIsNone(ProjectManagement.get_id_by_name("Done", self.conn))
+        self.assertEqual(ProjectManagement.get_id_by_name("Running", self.conn), 102)
+
+        self.cursor.execute("INSERT INTO projects (name) VALUES ('Done')")  # the name is free again
+        self.assertTrue(ProjectManagement.restore_project(100, self.conn))
+        self.assertEqual(ProjectManagement.get_name_by_id(100, self.conn), "Done 2")
+        self.assertEqual(ProjectManagement.get_time_in_range(QDate.currentDate(), QDate.currentDate(),
+                                                             self.conn, 100), 15)
+        self.assertFalse(ProjectManagement.restore_project(100, self.conn))
+
+        # deleting an archived project deletes its time
+        self.cursor.execute("INSERT INTO time_entries (project_id, minutes) VALUES (101, 5)")
+        self.cursor.execute("DELETE FROM projects_archive WHERE id = 101")
+        self.cursor.execute("SELECT COUNT(*) FROM time_entries WHERE project_id = 101")
+        self.assertEqual(self.cursor.fetchone()[0], 0)
+
     def test_get_projects_name_list(self):
         self.cursor.execute('''
             INSERT INTO projects (id, name, description, type, time_tracked, start_date, end_date, status)
-            VALUES (1, "Test Project", "Test Description", "Test Type", 60, "2023-01-01", "2023-01-01", "active")
+            VALUES (100, "Test Project", "Test Description", "Test Type", 60, "2023-01-01", "2023-01-01", "active")
         ''')
         self.conn.commit()
 
@@ -113,17 +318,17 @@ class TestProjectManagement(unittest.TestCase):
     def test_get_id_by_name(self):
         self.cursor.execute('''
             INSERT INTO projects (id, name, description, type, time_tracked, start_date, end_date, status)
-            VALUES (1, "Test Project", "Test Description", "Test Type", 60, "2023-01-01", "2023-01-01", "active")
+            VALUES (100, "Test Project", "Test Description", "Test Type", 60, "2023-01-01", "2023-01-01", "active")
         ''')
         self.conn.commit()
 
         project_id = ProjectManagement.get_id_by_name("Test Project", self.conn)
-        self.assertEqual(project_id, 1)
+        self.assertEqual(project_id, 100)
 
     def test_get_projects_time_tracked_list(self):
         self.cursor.execute('''
             INSERT INTO projects (id, name, description, type, time_tracked, start_date, end_date, status)
-            VALUES (1, "Test Project", "Test Description", "Test Type", 60, "2023-01-01", "2023-01-01", "active")
+            VALUES (100, "Test Project", "Test Description", "Test Type", 60, "2023-01-01", "2023-01-01", "active")
         ''')
         self.conn.commit()
 
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+import sqlite3
+from unittest import mock
+from src.projectmanagement import ProjectManagement
+from src.projectrepository import ProjectRepository
+from src.dbwriter import DatabaseWriter
+
+
+class TestProjectRepository(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_file = os.path.join(self.tmp_dir.name, "projects.db")
+        self.conn = sqlite3.connect(self.db_file)
+        self.repository = ProjectRepository(self.conn)
+        self.project = ProjectManagement(self.conn, self.repository)
+
+    def tearDown(self):
+        self.conn.close()
+        self.tmp_dir.cleanup()
+
+    def test_summaries(self):
+        self.assertEqual(self.repository.get_summaries(), [(self.project.id, "New Project", 0)])
+        self.assertEqual(self.repository.get_projects_name_list(), ["New Project"])
+        self.assertEqual(self.repository.get_projects_time_tracked_list(), [0])
+
+    def test_updated_on_writes(self):
+        self.repository.refresh()
+        self.project.add_time(15)
+        self.project.update_data_in_sql()
+        self.project.add_project()
+        self.assertFalse(self.repository.refresh_if_changed())  # cache is already up to date
+        self.assertEqual(self.repository.get_projects_name_list(), ["New Project", "New Project 2"])
+        self.assertEqual(self.repository.get_projects_time_tracked_list(), [15, 0])
+
+        self.project.delete_project()
+        ProjectManagement.add_time_to_project(1, 5, self.conn, self.repository)
+        self.assertFalse(self.repository.refresh_if_changed())
+        self.assertEqual(self.repository.get_summaries(), [(1, "New Project", 20)])
+
+    def test_refresh_if_changed_by_other_connection(self):
+        self.repository.refresh()
+        self.assertFalse(self.repository.refresh_if_changed())
+        other_conn = sqlite3.connect(self.db_file)
+        other_conn.execute("UPDATE projects SET time_tracked = 99")
+        other_conn.commit()
+        other_conn.close()
+        self.assertTrue(self.repository.refresh_if_changed())
+        self.assertEqual(self.repository.get_projects_time_tracked_list(), [99])
+
+    def test_refresh_if_changed_by_unreported_write(self):
+        self.repository.refresh()
+        ProjectManagement.add_time_to_project(self.project.id, 5, self.conn)  # no repository given
+        self.assertTrue(self.repository.refresh_if_changed())
+        self.assertEqual(self.repository.get_projects_time_tracked_list(), [5])
+
+
+    def test_writer_commits_are_no_external_changes(self):
+        writer = DatabaseWriter(self.db_file)
+        repository = ProjectRepository(self.conn, writer)
+        project = ProjectManagement(self.conn, repository, writer)
+        repository.refresh()
+        project.add_time(15)
+        project.update_data_in_sql()
+        self.assertFalse(repository.refresh_if_changed())  # queued, the cache is up to date
+        writer.flush()
+        self.assertFalse(repository.refresh_if_changed())  # committed, but not yet acknowledged
+        repository.writes_committed(writer.committed_ticket)
+        with mock.patch.object(repository, "refresh") as refresh:
+            self.assertFalse(repository.refresh_if_changed())  # no reload after the own commit
+            refresh.assert_not_called()
+        self.assertEqual(repository.get_projects_time_tracked_list(), [15])
+
+        other_conn = sqlite3.connect(self.db_file)
+        other_conn.execute("UPDATE projects SET time_tracked = 99")
+        other_conn.commit()
+        other_conn.close()
+        self.assertTrue(repository.refresh_if_changed())
+        writer.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import io
+import os
+import tempfile
+import unittest
+import sqlite3
+import cli
+from src.database import migrate
+from src import reporting
+from src.projectmanagement import ProjectManagement
+
+
+class TestReporting(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_file = os.path.join(self.tmp_dir.name, "projects.db")
+        self.conn = sqlite3.connect(self.db_file)
+        migrate(self.conn)
+        self.conn.executemany("INSERT INTO projects (id, name, type) VALUES (?, ?, ?)",
+                              [(1, "Physics", "study"), (2, "Math", "study"), (3, "Garden", "")])
+        # 2024-01-01 is a Monday
+        self.conn.executemany("INSERT INTO time_entries (project_id, minutes, recorded_at) VALUES (?, ?, ?)", [
+            (1, 30, "2024-01-01 10:00:00"), (1, 30, "2024-01-01 18:00:00"), (1, 20, "2024-01-02 10:00:00"),
+            (1, 10, "2024-01-03 10:00:00"), (1, 40, "2024-01-08 10:00:00"), (1, 10, "2024-01-09 10:00:00"),
+            (2, 30, "2024-01-05 10:00:00"), (3, 30, "2024-01-07 10:00:00"),
+        ])
+        self.conn.commit()
+
+    def tearDown(self):
+        self.conn.close()
+        self.tmp_dir.cleanup()
+
+    def test_summary(self):
+        self.assertEqual(reporting.get_summary(self.conn, "2024-01-01", "2024-01-07", project_id=1),
+                         (90, 3, 7, 12.9, 30.0))
+        self.assertEqual(reporting.get_summary(self.conn), (200, 7, 9, 22.2, 28.6))  # first to last active day
+        self.assertEqual(reporting.get_summary(self.conn, "2023-01-01", "2023-01-10"), (0, 0, 10, 0.0, 0.0))
+
+    def test_project_report(self):
+        rows = reporting.get_project_report(self.conn, "2024-01-01", "2024-01-07")
+        self.assertEqual(rows[0], (1, "Physics", "study", 90, 3, 30.0, 60.0, 1))
+        self.assertEqual([row[7] for row in rows], [1, 2, 2])  # Math and Garden tie
+        self.assertEqual(len(reporting.get_project_report(self.conn, limit=1)), 1)
+
+    def test_archived_projects_are_reported(self):
+        self.conn.execute("UPDATE projects SET status = 'completed' WHERE id = 1")
+        self.conn.commit()
+        ProjectManagement.archive_projects(self.conn)
+        self.assertEqual(reporting.get_project_report(self.conn, limit=1)[0][:4], (1, "Physics", "study", 140))
+        self.assertEqual(reporting.get_summary(self.conn)[0], 200)
+
+    def test_type_report(self):
+        self.assertEqual(reporting.get_type_report(self.conn), [("study", 2, 170, 85.0, 85.0),
+                                                                ("(none)", 1, 30, 30.0, 15.0)])
+
+    def test_weekday_distribution(self):
+        rows = reporting.get_weekday_distribution(self.conn, project_id=1)
+        self.assertEqual([row[0] for row in rows][:2], ["Monday", "Tuesday"])
+        self.assertEqual(rows[0], ("Monday", 100, 2, 50.0, 71.4))
+        self.assertEqual(rows[6], ("Sunday", 0, 0, 0.0, 0.0))
+
+    def test_streaks(self):
+        self.assertEqual(reporting.get_streaks(self.conn, project_id=1),
+                         [("2024-01-01", "2024-01-03", 3), ("2024-01-08", "2024-01-09", 2)])
+        # over all projects Friday to Tuesday is one run
+        self.assertEqual(reporting.get_streaks(self.conn, limit=1), [("2024-01-07", "2024-01-09", 3)])
+        self.assertEqual(reporting.get_current_streak(self.conn, "2024-01-09", project_id=1), 2)
+        self.assertEqual(reporting.get_current_streak(self.conn, "2024-01-10", project_id=1), 2)  # today is not over
+        self.assertEqual(reporting.get_current_streak(self.conn, "2024-01-11", project_id=1), 0)
+        self.assertEqual(reporting.get_current_streak(self.conn, "2024-01-02", project_id=1), 2)  # later days ignored
+
+    def test_write_report(self):
+        file = io.StringIO()
+        reporting.write_report(("name", "minutes"), [("Physics", 90), ("Math", 5)], file, "text")
+        self.assertEqual(file.getvalue(), "name     minutes\nPhysics  90\nMath     5\n")
+        file = io.StringIO()
+        reporting.write_report(("name", "minutes"), [("Physics", 90)], file, "csv")
+        self.assertEqual(file.getvalue(), "name,minutes\r\nPhysics,90\r\n")
+
+    def test_cli(self):
+        output_file = os.path.join(self.tmp_dir.name, "report.csv")
+        self.assertEqual(cli.main(["--db", self.db_file, "report", "streaks", "--project", "Physics",
+                                   "--format", "csv", "--output", output_file]), 0)
+        with open(output_file, encoding="utf-8") as file:
+            self.assertEqual(file.read().splitlines()[1], "2024-01-01,2024-01-03,3")
+        self.assertEqual(cli.main(["--db", self.db_file, "report", "weekdays", "--project", "Art"]), 1)
+
+    def test_cli_archive(self):
+        self.conn.execute("UPDATE projects SET status = 'completed' WHERE id = 2")
+        self.conn.commit()
+        self.assertEqual(cli.main(["--db", self.db_file, "archive"]), 0)
+        self.assertIsNone(ProjectManagement.get_name_by_id(2, self.conn))
+        self.assertEqual(cli.main(["--db", self.db_file, "restore", "2"]), 0)
+        self.assertEqual(ProjectManagement.get_name_by_id(2, self.conn), "Math")
+        self.assertEqual(cli.main(["--db", self.db_file, "restore", "2"]), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,20 @@
+import os
+import tempfile
 import unittest
+import uuid
+from unittest import mock
 import sqlite3
+from PyQt6.QtCore import QDate
 from PyQt6.QtWidgets import QApplication
-from src.session import MainSession
+from src.session import MainSession, ProjectsOverviewPieChart
+from src.projectmanagement import ProjectManagement
+from src.notes import ProjectNotes
+from src.pointssystem import PointsSystem
+from src.database import connect
+from src.profiles import Profile, create_profile
+from src.ipc import IpcClient
+from unittests.ipc_test import wait_until
 from src.constants import WIDTH, HEIGHT
-from src.projectmanagement import DB_FILE
 
 
 class TestMainSession(unittest.TestCase):
@@ -13,7 +24,8 @@ class TestMainSession(unittest.TestCase):
 
     def setUp(self):
         # Set up a test database
-        self.conn = sqlite3.connect(DB_FILE)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.conn = sqlite3.connect(os.path.join(self.tmp_dir.name, "projects.db"))
         self.cursor = self.conn.cursor()
         self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS projects (
@@ -33,13 +45,17 @@ class TestMainSession(unittest.TestCase):
             VALUES (1, "Test Project", "Test Description", "Test Type", 60, "2023-01-01", "2023-01-01", "active")
         ''')
         self.conn.commit()
-        self.main_session = MainSession(self.conn)
+        # settings, checkpoint and gardens of a temporary profile, the user's data files are never touched
+        self.profile = Profile("test", self.tmp_dir.name)
+        self.checkpoint_file = self.profile.checkpoint_file
+        self.main_session = MainSession(self.conn, self.checkpoint_file, profile=self.profile)
 
     def tearDown(self):
         # Clean up the test database
         self.cursor.execute('DROP TABLE IF EXISTS projects')
         self.conn.commit()
         self.conn.close()
+        self.tmp_dir.cleanup()
     
     def test_initial_ui_setup(self):
         self.assertEqual(self.main_session.windowTitle(), "ProductivityGarden")
@@ -94,8 +110,10 @@ class TestMainSession(unittest.TestCase):
         self.main_session.timer_input_field.setText("01:00:00")
         self.main_session.text_box.setPlainText("Test text")
         self.main_session.save_json_data()
+        self.main_session.json_store.flush()  # the store writes debounced
+        self.main_session.project_notes.flush()  # the note is stored with the project
 
-        new_session = MainSession(self.conn)
+        new_session = MainSession(self.conn, self.checkpoint_file, profile=self.profile)
         new_session.load_json_data()
         total_points, available_points = new_session.point_system.get_points()
         self.assertEqual(total_points, 10)
@@ -105,6 +123,215 @@ class TestMainSession(unittest.TestCase):
         self.assertEqual(new_session.timer_input_field.text(), "01:00:00")
         self.assertEqual(new_session.text_box.toPlainText(), "Test text")
     
+    def test_running_timer_is_restored_from_checkpoint(self):
+        self.main_session.handle_toggle_mode()
+        self.main_session.handle_toggle_mode()  # stopwatch
+        self.main_session.handle_start_time()
+        self.main_session.time_manager.increment_time(120)  # two minutes, not yet stored
+        self.main_session.save_timer_checkpoint()
+
+        new_session = MainSession(self.conn, self.checkpoint_file, profile=self.profile)
+        self.assertEqual(new_session.time_manager.selected_timer, "stopwatch")
+        self.assertEqual(new_session.time_manager.mode, "paused")  # the time the app was closed is not tracked
+        self.assertEqual(new_session.time_manager.elapsed_time.minute(), 2)
+        # the two minutes that never reached the database are booked on the project again
+        self.assertEqual(new_session.current_project.get_time(), 62)
+
+    def test_project_timer_books_time_and_is_checkpointed(self):
+        session = self.main_session
+        session.handle_add_new_project()
+        other_id = session.current_project.id
+        session.select_project_in_dropdown(1)
+        project_timer = session.add_project_timer(other_id)
+        project_timer.start_stopwatch()
+        project_timer.increment_time(180)
+        session.sync_project_time()
+        self.assertEqual(ProjectManagement.get_time_in_range(QDate.currentDate(), QDate.currentDate(),
+                                                             self.conn, other_id), 3)
+        self.assertEqual(session.current_project.get_time(), 60)  # not booked on the selected project
+
+        session.close()
+        new_session = MainSession(self.conn, self.checkpoint_file, profile=self.profile)
+        self.assertEqual(len(new_session.project_timers), 1)
+        self.assertEqual(new_session.project_timers[0].project_id, other_id)
+        self.assertEqual(new_session.project_timers[0].elapsed_time.minute(), 3)
+        new_session.remove_project_timer(new_session.project_timers[0])
+        self.assertEqual(MainSession(self.conn, self.checkpoint_file, profile=self.profile).project_timers, [])
+
+    def test_points_are_earned_on_the_booked_project(self):
+        session = self.main_session
+        session.handle_add_new_project()
+        other_id = session.current_project.id
+        session.select_project_in_dropdown(1)
+        project_timer = session.add_project_timer(other_id)
+        project_timer.start_stopwatch()
+        project_timer.increment_time(600)  # 10 minutes in the background
+        session.time_manager.productiv_minutes = 25  # selected project
+        session.sync_variables()
+        events = PointsSystem.get_events(self.conn, kind="earned")
+        self.assertEqual(sorted((project_id, total_delta) for _, _, total_delta, _, project_id, *_ in events),
+                         [(1, 2), (other_id, 1)])
+        self.assertEqual(session.minute_counters, {1: 5, other_id: 0})
+        session.remove_project_timer(project_timer)
+
+    def test_project_report_label(self):
+        session = self.main_session
+        session.current_project.add_time(25)
+        session.current_project.update_data_in_sql()
+        session.update_project_report()
+        self.assertEqual(session.project_report_label.text(), "this week: 25 min, streak: 1 days")
+
+    def test_archive_project(self):
+        session = self.main_session
+        session.handle_add_new_project()
+        other_id = session.current_project.id
+        session.time_manager.productiv_minutes = 4  # counted, not yet booked
+        session.handle_archive_project()
+        self.assertEqual(session.current_project.id, 1)
+        self.assertEqual(session.project_list_model.row_of_id(other_id), -1)
+        self.assertEqual(ProjectManagement.get_archived_projects(self.conn)[0][:4], (other_id, "New Project", "", 4))
+
+    def test_notes_are_stored_per_project(self):
+        session = self.main_session
+        session.text_box.setPlainText("Note of project 1")
+        self.assertTrue(session.project_notes.has_pending())
+        session.handle_add_new_project()  # saves the note of the previous project
+        self.assertEqual(session.text_box.toPlainText(), "")
+        session.text_box.setPlainText("Note of the new project")
+        session.select_project_in_dropdown(1)
+        self.assertEqual(session.text_box.toPlainText(), "Note of project 1")
+        self.assertEqual(len(ProjectNotes.get_revisions(1, self.conn)), 1)
+
+    def test_unsaved_note_of_a_deleted_project_is_not_stored(self):
+        session = self.main_session
+        session.handle_add_new_project()
+        new_id = session.current_project.id
+        session.text_box.setPlainText("Note of the deleted project")  # waits for the autosave
+        session.handle_delete_project()
+        session.project_notes.flush()
+        self.assertEqual(session.current_project.id, 1)
+        self.assertEqual(ProjectNotes.get_revisions(new_id, self.conn), [])
+
+    def test_global_note_is_migrated(self):
+        store = self.main_session.json_store
+        self.main_session.save_json_data()
+        store.flush()
+        store.save({**store.load(), "text_box": "Old note"})  # data.json of an older version
+        store.flush()
+        session = MainSession(self.conn, self.checkpoint_file, profile=self.profile)
+        self.assertEqual(ProjectNotes.get_note(1, self.conn), "Old note")
+        session.save_json_data()
+        session.json_store.flush()
+        self.assertNotIn("text_box", session.json_store.load())
+
+    def test_project_form_updates_the_project(self):
+        session = self.main_session
+        session.pr_description_input.setText("Waves")
+        self.assertEqual(session.current_project.description, "Waves")
+        session.pr_name_input.setText("Physics")
+        session.project_form.validate()
+        self.assertEqual(session.current_project.name, "Physics")
+        self.assertEqual(session.projects_dropdown.currentText(), "Physics")
+        session.handle_add_new_project()
+        session.pr_name_input.setText("Physics")  # used by the other project
+        session.project_form.validate()
+        self.assertFalse(session.project_form.is_valid("name"))
+        self.assertTrue(session.pr_name_input.property("invalid"))  # styled by the window stylesheet
+        self.assertEqual(session.current_project.name, "New Project")
+        session.select_project_in_dropdown(1)
+        self.assertEqual(session.pr_name_input.text(), "Physics")
+        self.assertTrue(session.project_form.is_valid("name"))
+        self.assertFalse(session.pr_name_input.property("invalid"))
+
+    def test_circle_is_rendered_only_on_changes(self):
+        circle = self.main_session.circle_project_time
+        with mock.patch.object(circle, "update") as update:
+            circle.update_widget(circle.number)
+            update.assert_not_called()
+            circle.update_widget(circle.number + 1)
+            update.assert_called_once()
+        with mock.patch.object(circle, "_render_pixmap", wraps=circle._render_pixmap) as render:
+            pixmap = circle.get_pixmap()
+            circle.grab()  # paints the cached pixmap
+            self.assertIs(circle.get_pixmap(), pixmap)
+            self.assertLessEqual(render.call_count, 1)
+            circle.update_widget(circle.number + 1)
+            self.assertIsNot(circle.get_pixmap(), pixmap)
+
+    def test_projects_dropdown_uses_ids(self):
+        session = self.main_session
+        session.handle_add_new_project()
+        new_id = session.current_project.id
+        self.assertEqual(session.projects_dropdown.currentData(), new_id)
+        session.projects_filter_input.setText("Test")
+        self.assertEqual(session.projects_dropdown.count(), 1)
+        self.assertEqual(session.current_project.id, 1)  # first match is selected
+        session.select_project_in_dropdown(new_id)  # hidden by the filter
+        self.assertEqual(session.projects_filter_input.text(), "")
+        self.assertEqual(session.current_project.id, new_id)
+        session.handle_delete_project()
+        self.assertEqual(session.projects_dropdown.count(), 1)
+        self.assertEqual(session.current_project.id, 1)
+
+    def test_switch_profile(self):
+        work = create_profile("work", self.tmp_dir.name)
+        home = create_profile("home", self.tmp_dir.name)
+        session = MainSession(connect(work.db_file), profile=work)
+        session.point_system.add_points(3)
+        session.pr_name_input.setText("Physics")
+        session.project_form.validate()
+        session.text_box.setPlainText("Work note")
+        session.handle_toggle_mode()  # timer
+        session.switch_profile(home)
+        self.assertEqual(session.point_system.get_points(), (0, 0))
+        self.assertEqual(session.current_project.name, "New Project")
+        self.assertEqual(session.text_box.toPlainText(), "")
+        self.assertEqual(session.time_manager.selected_timer, "pomodoro")
+        self.assertEqual(session.projects_dropdown.currentText(), "New Project")
+        session.switch_profile(work)
+        self.assertEqual(session.point_system.get_points(), (3, 3))
+        self.assertEqual(session.projects_dropdown.currentText(), "Physics")
+        self.assertEqual(session.text_box.toPlainText(), "Work note")
+        self.assertEqual(session.time_manager.selected_timer, "timer")  # restored from the profile's checkpoint
+        session.close()
+        session.conn.close()
+
+    def test_points_are_exchanged_with_the_garden(self):
+        session = self.main_session
+        name = f"ProductivityGardenTest-{uuid.uuid4().hex[:8]}"
+        self.assertTrue(session.ipc_server.listen(name))
+        garden = IpcClient()
+        self.assertTrue(garden.connect_to_server(name))
+        self.assertTrue(wait_until(lambda: session.ipc_server.client_count() == 1))
+        total_points, available_points = session.point_system.get_points()
+        session.point_system.add_points(2)
+        messages = []
+        self.assertTrue(wait_until(lambda: messages.extend(garden.poll()) or messages))
+        self.assertEqual(messages, [{"type": "points", "total_delta": 2, "available_delta": 2}])
+        garden.publish({"type": "points", "total_delta": 0, "available_delta": -3})  # spent in the garden
+        self.assertTrue(wait_until(lambda: session.point_system.available_points == available_points - 1))
+        self.assertEqual(session.circle_av.number, available_points - 1)
+        self.assertEqual(session.point_system.total_points, total_points + 2)
+        garden.close()
+        session.ipc_server.close()
+
+    def test_pie_chart_updates_slices_in_place(self):
+        pie_chart = ProjectsOverviewPieChart()
+        pie_chart.update_data(["Project 1", "Project 2"], [30, 70])
+        slice_1 = pie_chart.slices["Project 1"]
+        pie_chart.update_data(["Project 1", "Project 2", "Project 3"], [40, 70, 10])
+        self.assertIs(pie_chart.slices["Project 1"], slice_1)
+        self.assertEqual(slice_1.value(), 40)
+        self.assertEqual(len(pie_chart.series.slices()), 3)
+        pie_chart.update_data(["Project 1", "Project 3"], [40, 10])
+        self.assertEqual(sorted(slice.label() for slice in pie_chart.series.slices()), ["Project 1", "Project 3"])
+
+    def test_pie_chart_top_n(self):
+        pie_chart = ProjectsOverviewPieChart(top_n=2)
+        pie_chart.update_data(["A", "B", "C", "D"], [10, 40, 30, 5])
+        values = {slice.label(): slice.value() for slice in pie_chart.series.slices()}
+        self.assertEqual(values, {"B": 40, "C": 30, "Other": 15})
+
     """ not necessary - gui tests are covered manually
     
     def test_circle_with_number_initialization(self):
@@ -132,104 +359,104 @@ class TestMainSession(unittest.TestCase):
         self.assertEqual(len(pie_chart.series.slices()), 2)
 
     def test_main_session_initialization(self):
-        session = MainSession(self.conn)
+        session = MainSession(self.conn, profile=self.profile)
         self.assertEqual(session.windowTitle(), "ProductivityGarden")
         self.assertEqual(session.width(), WIDTH)
         self.assertEqual(session.height(), HEIGHT)
 
     def test_main_session_setup_ui(self):
-        session = MainSession(self.conn)
+        session = MainSession(self.conn, profile=self.profile)
         session.setup_ui()
         self.assertIsNotNone(session.centralWidget())
 
     def test_main_session_create_first_column(self):
-        session = MainSession(self.conn)
+        session = MainSession(self.conn, profile=self.profile)
         first_column = session.create_first_column()
         self.assertIsInstance(first_column, QWidget)
 
     def test_main_session_create_second_column(self):
-        session = MainSession(self.conn)
+        session = MainSession(self.conn, profile=self.profile)
         second_column = session.create_second_column()
         self.assertIsInstance(second_column, QWidget)
 
     def test_main_session_create_third_column(self):
-        session = MainSession(self.conn)
+        session = MainSession(self.conn, profile=self.profile)
         third_column = session.create_third_column()
         self.assertIsInstance(third_column, QWidget)
 
     def test_main_session_create_separator(self):
-        session = MainSession(self.conn)
+        session = MainSession(self.conn, profile=self.profile)
         separator = session.create_separator()
         self.assertIsInstance(separator, QWidget)
 
     def test_main_session_create_button(self):
-        session = MainSession(self.conn)
+        session = MainSession(self.conn, profile=self.profile)
         button = session.create_button("Test Button", COLOR_OCEANBAY_HEX)
         self.assertIsInstance(button, QPushButton)
         self.assertEqual(button.text(), "Test Button")
 
     def test_main_session_draw_point_overview(self):
-        session = MainSession(self.conn)
+        session = MainSession(self.conn, profile=self.profile)
         layout = QVBoxLayout()
         session.draw_point_overview(layout)
         self.assertEqual(layout.count(), 2)
 
     def test_main_session_draw_time_management_area(self):
-        session = MainSession(self.conn)
+        session = MainSession(self.conn, profile=self.profile)
         layout = QVBoxLayout()
         session.draw_time_management_area(layout)
         self.assertEqual(layout.count(), 6)
 
     def test_main_session_draw_project_overview(self):
-        session = MainSession(self.conn)
+        session = MainSession(self.conn, profile=self.profile)
         layout = QVBoxLayout()
         session.draw_project_overview(layout)
         self.assertEqual(layout.count(), 8)
 
     def test_main_session_draw_project_info_area(self):
-        session = MainSession(self.conn)
+        session = MainSession(self.conn, profile=self.profile)
         layout = QVBoxLayout()
         session.draw_project_info_area(layout)
         self.assertEqual(layout.count(), 5)
 
     def test_main_session_show_error(self):
-        session = MainSession(self.conn)
+        session = MainSession(self.conn, profile=self.profile)
         session.show_error("Test Error")
         self.assertEqual(session.input_error_label.text(), "Test Error")
         self.assertTrue(session.input_error_label.isVisible())
 
     def test_main_session_add_new_project(self):
-        session = MainSession(self.conn)
+        session = MainSession(self.conn, profile=self.profile)
         initial_count = session.projects_dropdown.count()
         session.add_new_project()
         self.assertEqual(session.projects_dropdown.count(), initial_count + 1)
 
     def test_main_session_del_selected_project(self):
-        session = MainSession(self.conn)
+        session = MainSession(self.conn, profile=self.profile)
         session.add_new_project()
         initial_count = session.projects_dropdown.count()
         session.del_selected_project()
         self.assertEqual(session.projects_dropdown.count(), initial_count - 1)
 
     def test_main_session_select_project_from_dropdown(self):
-        session = MainSession(self.conn)
+        session = MainSession(self.conn, profile=self.profile)
         session.select_project_from_dropdown()
         self.assertEqual(session.pr_name_input.text(), session.current_project.name)
 
     def test_main_session_update_projects_dropdown_menu(self):
-        session = MainSession(self.conn)
+        session = MainSession(self.conn, profile=self.profile)
         session.pr_name_input.setText("Updated Project")
         session.update_projects_dropdown_menu()
         self.assertEqual(session.projects_dropdown.currentText(), "Updated Project")
 
     def test_main_session_add_time_to_project(self):
-        session = MainSession(self.conn)
+        session = MainSession(self.conn, profile=self.profile)
         session.pr_add_time.setText("10")
         session.add_time_to_project()
         self.assertEqual(session.time_manager.productiv_minutes, 10)
 
     def test_main_session_update_gui(self):
-        session = MainSession(self.conn)
+        session = MainSession(self.conn, profile=self.profile)
         session.update_gui()
         self.assertEqual(session.timer_mode_label.text(), session.time_manager.selected_timer.upper())
     """
\ No newline at end of file
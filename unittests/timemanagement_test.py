@@ -1,6 +1,7 @@
 import unittest
 from PyQt6.QtCore import QTime
 from src.timemanagement import TimeManagement
+from src.timerscheduler import TimerScheduler
 
 
 class TestTimeManagement(unittest.TestCase):
@@ -53,6 +54,72 @@ class TestTimeManagement(unittest.TestCase):
         self.tm.increment_time()
         self.assertEqual(self.tm.elapsed_time, QTime(0, 0, 1))
 
+    def test_increment_time_counts_minutes(self):
+        self.tm.selected_timer = "stopwatch"
+        self.tm.increment_time(59)
+        self.assertEqual(self.tm.productiv_minutes, 0)
+        self.tm.increment_time(61)
+        self.assertEqual(self.tm.productiv_minutes, 2)
+
+    def test_ticks_on_shared_scheduler(self):
+        now = [0.0]
+        scheduler = TimerScheduler(clock=lambda: now[0])
+        foreground = TimeManagement(scheduler)
+        background = TimeManagement(scheduler, project_id=7, tick_interval=60)
+        foreground.set_timer_mode("stopwatch")
+        background.set_timer_mode("stopwatch")
+        foreground.start_stopwatch()
+        background.start_stopwatch()
+        for second in range(1, 61):
+            now[0] = second
+            scheduler._fire()
+        self.assertEqual(foreground.elapsed_time, QTime(0, 1, 0))
+        self.assertEqual(background.elapsed_time, QTime(0, 1, 0))
+        self.assertEqual(foreground.productiv_minutes, 1)
+        self.assertEqual(background.productiv_minutes, 1)
+
+    def test_restore_running_state(self):
+        tm = TimeManagement(tick_interval=60)
+        tm.set_timer_mode("stopwatch")
+        tm.start_stopwatch()
+        tm.increment_time(50)
+        tm.productiv_minutes = 0  # booked by the session
+        state = tm.get_state()
+        tm.stop()
+        state["saved_at"] = state["tick_started_at"] + 20  # checkpoint 20 seconds into the tick
+
+        restored = TimeManagement(tick_interval=60)
+        restored.restore_state(state)
+        self.assertEqual(restored.mode, "paused")  # not running on its own after a restart
+        self.assertEqual(restored.elapsed_time, QTime(0, 1, 10))
+        self.assertEqual(restored.productiv_minutes, 1)
+        restored.resume()
+        self.assertEqual(restored.mode, "running")
+        restored.stop()
+
+    def test_restore_ignores_downtime(self):
+        self.tm.set_timer_mode("timer")
+        self.tm.set_timer(0, 1, 0)
+        self.tm.start_timer()
+        state = self.tm.get_state()
+        self.tm.stop()
+
+        restored = TimeManagement()
+        state["saved_at"] = state["tick_started_at"] + 3600  # inconsistent checkpoint, at most one tick
+        restored.restore_state(state)
+        self.assertEqual(restored.mode, "paused")
+        self.assertEqual(restored.elapsed_time, QTime(0, 0, 1))
+        self.assertEqual(restored.productiv_minutes, 0)
+
+    def test_state_changed_callback(self):
+        states = []
+        self.tm.on_state_changed = lambda tm: states.append(tm.mode)
+        self.tm.start_stopwatch()
+        self.tm.pause()
+        self.tm.resume()
+        self.tm.stop()
+        self.assertEqual(states, ["running", "paused", "running", "stopped"])
+
     def test_pause(self):
         self.tm.start_stopwatch()
         self.tm.pause()
@@ -0,0 +1,57 @@
+import unittest
+from PyQt6.QtWidgets import QApplication
+from src.timerscheduler import TimerScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTimerScheduler(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.scheduler = TimerScheduler(clock=self.clock)
+        self.calls = []
+
+    def test_callbacks_fire_in_deadline_order(self):
+        self.scheduler.call_at(3, lambda: self.calls.append("c"))
+        self.scheduler.call_at(1, lambda: self.calls.append("a"))
+        self.scheduler.call_at(2, lambda: self.calls.append("b"))
+        self.clock.now = 5
+        self.scheduler._fire()
+        self.assertEqual(self.calls, ["a", "b", "c"])
+        self.assertEqual(self.scheduler.pending(), 0)
+
+    def test_only_due_callbacks_fire(self):
+        self.scheduler.call_later(1, lambda: self.calls.append("due"))
+        self.scheduler.call_later(10, lambda: self.calls.append("later"))
+        self.clock.now = 1
+        self.scheduler._fire()
+        self.assertEqual(self.calls, ["due"])
+        self.assertEqual(self.scheduler.pending(), 1)
+
+    def test_cancel(self):
+        handle = self.scheduler.call_later(1, lambda: self.calls.append("cancelled"))
+        self.scheduler.call_later(2, lambda: self.calls.append("kept"))
+        self.scheduler.cancel(handle)
+        self.clock.now = 2
+        self.scheduler._fire()
+        self.assertEqual(self.calls, ["kept"])
+
+    def test_single_timer_armed_for_nearest_deadline(self):
+        self.scheduler.call_later(5, lambda: None)
+        self.scheduler.call_later(2, lambda: None)
+        self.assertTrue(self.scheduler._timer.isActive())
+        self.assertEqual(self.scheduler._timer.interval(), 2000)
+
+
+if __name__ == '__main__':
+    unittest.main()
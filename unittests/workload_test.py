@@ -0,0 +1,83 @@
+import datetime
+import os
+import sqlite3
+import tempfile
+import unittest
+import cli
+from src.constants import ROWS, COLS
+from src.gardenobjects import VEGETATION_DATA
+from src.pointssystem import PointsSystem
+from src.profiles import Profile
+from src import workload
+
+END_DATE = datetime.date(2024, 6, 30)
+
+
+class TestWorkload(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def generate(self, name, seed):
+        profile = Profile(name, os.path.join(self.tmp_dir.name, name))
+        os.makedirs(profile.path)
+        counts = workload.generate(profile, seed, projects=20, years=1, gardens_per_vegetation=2,
+                                   points_events=250, end_date=END_DATE)
+        return profile, counts
+
+    def dump(self, profile):
+        connection = sqlite3.connect(profile.db_file)
+        try:
+            return [connection.execute(f"SELECT * FROM {table} ORDER BY 1").fetchall()
+                    for table in ("projects", "time_entries", "points_events", "points_snapshots")]
+        finally:
+            connection.close()
+
+    def test_data_is_consistent(self):
+        profile, counts = self.generate("a", 1)
+        self.assertEqual(counts["projects"], 20)
+        self.assertEqual(counts["gardens"], 2 * len(VEGETATION_DATA))
+        connection = sqlite3.connect(profile.db_file)
+        self.assertEqual(connection.execute("SELECT COUNT(*) FROM time_entries").fetchone()[0], counts["time_entries"])
+        # the rollups and the tracked time match the entries
+        self.assertEqual(connection.execute("SELECT SUM(minutes) FROM time_rollup_weekly").fetchone(),
+                         connection.execute("SELECT SUM(minutes) FROM time_entries").fetchone())
+        self.assertEqual(connection.execute('''
+            SELECT COUNT(*) FROM projects
+            WHERE time_tracked != (SELECT COALESCE(SUM(minutes), 0) FROM time_entries WHERE project_id = projects.id)
+        ''').fetchone()[0], 0)
+        self.assertLessEqual(connection.execute("SELECT MAX(date(recorded_at)) FROM time_entries").fetchone()[0],
+                             END_DATE.isoformat())
+        # new entries are still rolled up
+        connection.execute("INSERT INTO time_entries (project_id, minutes, recorded_at) VALUES (1, 5, '2024-07-01')")
+        self.assertEqual(connection.execute("SELECT minutes FROM time_rollup_daily WHERE day = '2024-07-01'")
+                         .fetchone()[0], 5)
+        points = PointsSystem(connection).get_points()
+        self.assertEqual(points, connection.execute(
+            "SELECT SUM(total_delta), SUM(available_delta) FROM points_events").fetchone())
+        self.assertGreaterEqual(points[1], 0)
+        self.assertEqual(connection.execute("SELECT COUNT(*) FROM points_snapshots").fetchone()[0], 2)
+        connection.close()
+        with open(profile.map_folder + "city_park_0001.map") as file:
+            lines = file.read().splitlines()
+        self.assertEqual((len(lines), len(lines[0])), (ROWS, COLS))
+
+    def test_same_seed_same_data(self):
+        profile_a, _ = self.generate("a", 7)
+        profile_b, _ = self.generate("b", 7)
+        profile_c, _ = self.generate("c", 8)
+        self.assertEqual(self.dump(profile_a), self.dump(profile_b))
+        self.assertNotEqual(self.dump(profile_a), self.dump(profile_c))
+        with open(profile_a.mapdata_file) as file_a, open(profile_b.mapdata_file) as file_b:
+            self.assertEqual(file_a.read(), file_b.read())
+
+    def test_cli_refuses_default_profile(self):
+        db_file = os.path.join(self.tmp_dir.name, "projects.db")
+        self.assertEqual(cli.main(["--db", db_file, "generate", "--profile", "default"]), 1)
+        self.assertFalse(os.path.exists(db_file))  # generate only opens the database of its target profile
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,10 +2,21 @@ import json
 import os
 import pygame
 import subprocess
-from src.gardenobjects import GardenObject
+from src.gardenobjects import GardenObject, VEGETATION_DATA
 from src.garden import Garden
-from src.constants import GAME_WIDTH, GAME_HEIGHT, SQUARE_SIZE, \
-                             JSON_FILE, ASSETS_PATH, MAP_FOLDER_PATH, MAPDATA_FILE_PATH
+from src.pointssystem import PointsSystem
+from src.database import connect, migrate
+from src.profiles import get_active_profile
+from src.ipc import IpcClient, get_server_name
+from src.profiling import get_profiler
+from src.constants import GAME_WIDTH, GAME_HEIGHT, SQUARE_SIZE
+
+# the gardens, points and settings of the profile that was active in the app
+PROFILE = get_active_profile()
+JSON_FILE = PROFILE.json_file
+DB_FILE = PROFILE.db_file
+MAP_FOLDER_PATH = PROFILE.map_folder
+MAPDATA_FILE_PATH = PROFILE.mapdata_file
 
 # initialize pygame
 pygame.init()
@@ -15,96 +26,6 @@ WIN = pygame.display.set_mode((GAME_WIDTH, GAME_HEIGHT))
 pygame.display.set_caption("Virtual Garden")
 
 
-# vegetation data with all relevant paths
-VEGETATION_DATA = {
-    "City Park": {
-        "ground": os.path.join(ASSETS_PATH, "park_grass.png"),
-        "objects": [
-            {
-                "name": "path",
-                "image": os.path.join(ASSETS_PATH, "park_path.png"),
-                "cost": 2
-            },
-            {
-                "name": "path_horizontal",
-                "image": os.path.join(ASSETS_PATH, "park_path_horizontal.png"),
-                "cost": 2
-            },
-            {
-                "name": "path_cross",
-                "image": os.path.join(ASSETS_PATH, "park_path_cross.png"),
-                "cost": 2
-            },
-            {
-                "name": "flowers",
-                "image": os.path.join(ASSETS_PATH, "park_flowers.png"),
-                "cost": 2
-            },
-            {
-                "name": "bench",
-                "image": os.path.join(ASSETS_PATH, "park_bench.png"),
-                "cost": 4
-            },
-            {
-                "name": "tree",
-                "image": os.path.join(ASSETS_PATH, "park_tree.png"),
-                "cost": 8
-            },
-        ]
-    },
-    "Desert": {
-        "ground": os.path.join(ASSETS_PATH, "desert_sand.png"),
-        "objects": [
-            {
-                "name": "bush",
-                "image": os.path.join(ASSETS_PATH, "desert_bush.png"),
-                "cost": 2
-            },
-            {
-                "name": "bush2",
-                "image": os.path.join(ASSETS_PATH, "desert_bush2.png"),
-                "cost": 2
-            },
-            {
-                "name": "cactus",
-                "image": os.path.join(ASSETS_PATH, "desert_cactus.png"),
-                "cost": 4
-            },
-            {
-                "name": "cactus2",
-                "image": os.path.join(ASSETS_PATH, "desert_cactus2.png"),
-                "cost": 4
-            },
-            {
-                "name": "skeleton",
-                "image": os.path.join(ASSETS_PATH, "desert_skeleton.png"),
-                "cost": 8
-            },
-        ]
-    },
-    "Rainforest": {
-        "ground": os.path.join(ASSETS_PATH, "rainforest_ground.png"),
-        "objects": [
-            {
-                "name": "flowers",
-                "image": os.path.join(ASSETS_PATH, "rainforest_flowers.png"),
-                "cost": 2
-            },
-            {
-                "name": "tree",
-                "image": os.path.join(ASSETS_PATH, "rainforest_tree.png"),
-                "cost": 8
-            },
-            {
-                "name": "trees",
-                "image": os.path.join(ASSETS_PATH, "rainforest_trees.png"),
-                "cost": 10
-            },
-        ]
-    }
-}
-
-
 class ResourceManager:
     def __init__(self):
         self._images = {}
@@ -477,41 +398,38 @@ def load_existing_garden(resource_manager):
     return garden
 
 
-def save_json_data(available_points : int):
+def load_point_system(connection) -> PointsSystem:
     """
-    Write "available_points" back into the json file
-    Returns True if successful
+    Return the points system on the projects database.
+    Points of older versions (only stored in the json file) are taken over once.
     """
-    if not os.path.exists(JSON_FILE):
-        return False
-    else:
+    point_system = PointsSystem(connection)
+    if not point_system.has_history() and os.path.exists(JSON_FILE):
         with open(JSON_FILE, "r") as file:
             data = json.load(file)
-            data["available_points"] = available_points
-            with open(JSON_FILE, "w") as file:
-                json.dump(data, file, indent=4)
-                return True
-    return False
+        if "total_points" in data:
+            point_system.set_points(data["total_points"], data["available_points"])
+    return point_system
 
 
-def load_json_data() -> int:
+def handle_ipc_messages(ipc_client: IpcClient, point_system: PointsSystem, timer_state):
     """
-    Read "available_points" from the json file
-    Returns the currently available points
+    Apply the messages the main window published since the last frame
+    Returns the latest timer state (or the previous one)
     """
-    if not os.path.exists(JSON_FILE):
-        return 0
-    else:
-        with open(JSON_FILE, "r") as file:
-            data = json.load(file)
-            return data["available_points"]
-        return 0
+    for message in ipc_client.poll():
+        if message.get("type") == "points":
+            point_system.apply_points_changed(int(message.get("total_delta", 0)),
+                                              int(message.get("available_delta", 0)))
+        elif message.get("type") == "timer":
+            timer_state = message
+    return timer_state
 
 
 def draw_garden_map_with_ui(win: pygame.Surface, garden: Garden,
-                            available_points, garden_objects, selected_object_index):
+                            available_points, garden_objects, selected_object_index, timer_state=None):
     """
-    Draw the garden with point score and inventory
+    Draw the garden with point score, timer state (if the main window is open) and inventory
     """
     # First draw garden
     garden.draw_garden_map(win)
@@ -520,6 +438,12 @@ def draw_garden_map_with_ui(win: pygame.Surface, garden: Garden,
     points_text = FONT.render(f"Points: {available_points}", True, (255, 255, 255))
     win.blit(points_text, (10, 10))
     
+    # Draw the state of the timer of the main window below
+    if timer_state is not None:
+        timer_text = FONT.render(f"{timer_state.get('selected_timer', '')}: {timer_state.get('mode', '')}",
+                                 True, (255, 255, 255))
+        win.blit(timer_text, (10, 50))
+    
     # Draw inventory
     icon_rects = draw_inventory(win, garden_objects, selected_object_index)
     
@@ -528,13 +452,28 @@ def draw_garden_map_with_ui(win: pygame.Surface, garden: Garden,
 
 
 def main():
+    # opt-in profiling of the startup, the menus and the frame loop until the garden is closed
+    # (--profiling or PRODUCTIVITYGARDEN_PROFILING=1), None if disabled
+    profiler = get_profiler("garden")
+    if profiler is not None:
+        profiler.start()
+        profiler.enable()
+    
     # Cleanup metadata right at the start
     cleanup_garden_metadata()
     
     # create variables and instances
     resource_manager = ResourceManager()
     clock = pygame.time.Clock()
-    available_points = load_json_data()
+    connection = connect(DB_FILE)
+    migrate(connection)
+    point_system = load_point_system(connection)
+    # live updates from the main window, if it is open (points earned, timer state)
+    ipc_client = IpcClient()
+    ipc_client.connect_to_server(get_server_name(PROFILE.name))
+    point_system.on_points_changed = lambda total_delta, available_delta: ipc_client.publish(
+        {"type": "points", "total_delta": total_delta, "available_delta": available_delta})
+    timer_state = None
     garden = None
     user_closed_window = False  # flag to see if user closed the window by hitting "x"
     
@@ -546,7 +485,8 @@ def main():
         if action == "closed":
             break
         elif action == "quit":
-            subprocess.Popen(["python", "main.py"])  # open gui
+            if not ipc_client.is_connected():
+                subprocess.Popen(["python", "main.py"])  # open gui (if it's not open anyway)
             break  # close game
         elif action == "new":
             garden = create_new_garden(resource_manager)
@@ -565,9 +505,12 @@ def main():
 
         while running:
             clock.tick(FPS)
+            if profiler is not None:
+                profiler.maybe_snapshot()
+            timer_state = handle_ipc_messages(ipc_client, point_system, timer_state)
 
-            icon_rects = draw_garden_map_with_ui(WIN, garden, available_points,
-                                                 garden.garden_objects, selected_object_index)
+            icon_rects = draw_garden_map_with_ui(WIN, garden, point_system.available_points,
+                                                 garden.garden_objects, selected_object_index, timer_state)
 
             # Events
             for event in pygame.event.get():
@@ -594,8 +537,10 @@ def main():
                                 # Calculate costs and validate
                                 selected_obj = garden.garden_objects[selected_object_index]
                                 cost = selected_obj.cost
-                                if available_points >= cost:
-                                    available_points -= cost
+                                if point_system.available_points >= cost:
+                                    # every purchase is recorded in the points history
+                                    point_system.remove_points(cost, object_name=selected_obj.name,
+                                                               garden=os.path.basename(garden.map_file))
                                     garden.place_object(selected_object_index)
                                     garden.update_garden_map()
                                 else:
@@ -603,12 +548,15 @@ def main():
                                 # save garden data
                                 garden.save_garden_map()
 
-    # save data before closing the window
-    save_json_data(available_points)
+    # save data before closing the window (the points are already stored)
+    ipc_client.close()
+    connection.close()
     try:
         garden.save_garden_map()  # type: ignore
     except AttributeError:
         pass
+    if profiler is not None:
+        profiler.stop()  # last snapshot
     pygame.quit()
     return
 